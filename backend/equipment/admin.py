@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Dataset
+from .models import AlertRule, Dataset
 
 
 @admin.register(Dataset)
@@ -16,3 +16,27 @@ class DatasetAdmin(admin.ModelAdmin):
     list_filter = (
         'uploaded_at',
     )
+
+
+@admin.register(AlertRule)
+class AlertRuleAdmin(admin.ModelAdmin):
+    list_display = (
+        'parameter',
+        'equipment_type',
+        'severity',
+        'min_value',
+        'max_value',
+        'enabled',
+    )
+
+    list_editable = (
+        'min_value',
+        'max_value',
+        'enabled',
+    )
+
+    list_filter = (
+        'parameter',
+        'severity',
+        'enabled',
+    )
@@ -0,0 +1,203 @@
+from collections import Counter, defaultdict
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import AlertRule, EquipmentAlert
+from .rollups import PARAMETERS
+
+# Most severe first: a reading raises at most one alert per parameter
+SEVERITIES = ['CRITICAL', 'WARNING', 'INFO']
+SEVERITY_RANK = {severity: rank for rank, severity in enumerate(SEVERITIES)}
+
+BULK_BATCH_SIZE = 2000
+
+# equipment_name of the per-parameter alert summarizing suppressed faults
+STORM_EQUIPMENT = '(alert storm)'
+
+SEVERITY_WORDS = {'CRITICAL': 'critically ', 'WARNING': '', 'INFO': 'slightly '}
+
+UNITS = {'Flowrate': 'L/min', 'Pressure': 'bar', 'Temperature': '°C'}
+
+
+class RuleSet:
+    """Enabled alert rules indexed by (parameter, severity).
+
+    Each entry holds the all-types band and the per-type overrides as
+    ``(min_value, max_value, recommendation)`` tuples.
+    """
+
+    def __init__(self, rules):
+        self.bands = {}
+        for rule in rules:
+            entry = self.bands.setdefault((rule.parameter, rule.severity), [None, {}])
+            band = (rule.min_value, rule.max_value, rule.recommendation)
+            if rule.equipment_type:
+                entry[1][rule.equipment_type] = band
+            else:
+                entry[0] = band
+
+
+def load_rules():
+    return RuleSet(AlertRule.objects.filter(enabled=True))
+
+
+def band_arrays(type_names, default, by_type):
+    """Per-distinct-type (low, high, recommendation) arrays; NaN bounds never trip."""
+    bands = [by_type.get(name, default) or (None, None, '') for name in type_names]
+    low = np.array([np.nan if band[0] is None else band[0] for band in bands], dtype=float)
+    high = np.array([np.nan if band[1] is None else band[1] for band in bands], dtype=float)
+    recommendations = np.array([band[2] for band in bands], dtype=object)
+    return low, high, recommendations
+
+
+def evaluate(scored, rules):
+    """Evaluate every rule against a scored frame in one vectorized pass per band.
+
+    Returns a frame with one row per alert: the row position in ``scored``,
+    parameter, alert_type, value, threshold and recommendation. Cost is
+    O(rows) per (parameter, severity) pair, independent of how many
+    equipment types have their own rules.
+    """
+    codes, type_names = pd.factorize(scored['equipment_type'])
+    found = []
+    for parameter, column in PARAMETERS.items():
+        values = scored[column].to_numpy(dtype=float)
+        pending = np.ones(len(values), dtype=bool)
+        for severity in SEVERITIES:
+            band = rules.bands.get((parameter, severity))
+            if band is None:
+                continue
+            low, high, recommendations = band_arrays(type_names, *band)
+            row_low, row_high = low[codes], high[codes]
+            below = pending & (values < row_low)
+            above = pending & (values > row_high)
+            hit = np.flatnonzero(below | above)
+            if len(hit):
+                found.append(pd.DataFrame({
+                    'row': hit,
+                    'parameter': parameter,
+                    'alert_type': severity,
+                    'value': values[hit],
+                    'threshold': np.where(above[hit], row_high[hit], row_low[hit]),
+                    'recommendation': recommendations[codes[hit]],
+                }))
+            pending[hit] = False
+
+    if not found:
+        return pd.DataFrame(columns=['row', 'parameter', 'alert_type', 'value', 'threshold', 'recommendation'])
+    return pd.concat(found, ignore_index=True)
+
+
+def alert_message(parameter, alert_type, value, threshold):
+    direction = 'high' if value > threshold else 'low'
+    return f"{parameter} {SEVERITY_WORDS[alert_type]}{direction}: {value:.2f} {UNITS[parameter]}"
+
+
+class AlertSink:
+    """Folds evaluated alerts into the open alert for each (equipment_name, parameter).
+
+    A repeat fault bumps the open alert's occurrence_count and last_seen_at
+    instead of adding a row, and escalates it if the new reading is more
+    severe. At most ``storm_limit`` new alerts are opened per sink; faults
+    past the limit are summarized in one storm alert per parameter on
+    ``flush()``.
+    """
+
+    def __init__(self, rules, storm_limit=None):
+        self.rules = rules
+        self.storm_limit = settings.EQUIPMENT_ALERT_STORM_LIMIT if storm_limit is None else storm_limit
+        self.opened = 0
+        self.suppressed = Counter()
+        self.suppressed_equipment = defaultdict(set)
+        self.reload()
+
+    def reload(self):
+        """Re-read open alerts, e.g. after a savepoint rollback discarded some of ours."""
+        rows = (
+            EquipmentAlert.objects.filter(resolved=False).exclude(alert_type='PREDICTIVE')
+            .values_list('id', 'equipment_name', 'parameter', 'alert_type')
+            .iterator(chunk_size=BULK_BATCH_SIZE)
+        )
+        self.open = {(name, parameter): (pk, alert_type) for pk, name, parameter, alert_type in rows}
+
+    def add(self, scored):
+        """Evaluate the rules against a scored frame and record the resulting faults."""
+        alerts = evaluate(scored, self.rules)
+        if alerts.empty:
+            return
+        alerts['equipment_name'] = scored['equipment_name'].to_numpy()[alerts['row'].to_numpy(dtype=int)]
+        alerts['rank'] = alerts['alert_type'].map(SEVERITY_RANK)
+        keys = ['equipment_name', 'parameter']
+        occurrences = alerts.groupby(keys, sort=False).size().rename('occurrences')
+
+        # One representative reading per fault: the most severe, latest first
+        worst = (
+            alerts.sort_values(['rank', 'row'], ascending=[True, False])
+            .drop_duplicates(keys)
+            .join(occurrences, on=keys)
+        )
+        self._fold(
+            (name, parameter, alert_type, value, threshold, recommendation,
+             alert_message(parameter, alert_type, value, threshold), count)
+            for name, parameter, alert_type, value, threshold, recommendation, count in worst[
+                ['equipment_name', 'parameter', 'alert_type', 'value', 'threshold', 'recommendation', 'occurrences']
+            ].itertuples(index=False, name=None)
+        )
+
+    def flush(self):
+        """Write one storm alert per parameter for faults suppressed since the last flush."""
+        self._fold(
+            (STORM_EQUIPMENT, parameter, 'WARNING', count, self.storm_limit,
+             "Review recent readings and alert rules for a plant-wide fault",
+             f"Alert storm: {count} {parameter} faults on {len(self.suppressed_equipment[parameter])} "
+             f"equipment were not opened individually (limit {self.storm_limit} new alerts per upload)",
+             count)
+            for parameter, count in self.suppressed.items()
+        )
+        self.suppressed.clear()
+        self.suppressed_equipment.clear()
+
+    def _fold(self, readings):
+        now = timezone.now()
+        escalated, repeated, created = [], [], []
+        for name, parameter, alert_type, value, threshold, recommendation, message, count in readings:
+            fields = {
+                'alert_type': alert_type,
+                'value': float(value),
+                'threshold': float(threshold),
+                'message': message,
+                'recommendation': recommendation or None,
+                'last_seen_at': now,
+            }
+            key = (name, parameter)
+            if key in self.open:
+                pk, current = self.open[key]
+                bump = F('occurrence_count') + int(count)
+                if SEVERITY_RANK[alert_type] <= SEVERITY_RANK.get(current, len(SEVERITIES)):
+                    escalated.append(EquipmentAlert(id=pk, occurrence_count=bump, **fields))
+                    self.open[key] = (pk, alert_type)
+                else:
+                    repeated.append(EquipmentAlert(id=pk, occurrence_count=bump, last_seen_at=now))
+            elif self.opened < self.storm_limit or name == STORM_EQUIPMENT:
+                created.append(EquipmentAlert(equipment_name=name, parameter=parameter, occurrence_count=int(count), **fields))
+                self.opened += name != STORM_EQUIPMENT
+            else:
+                self.suppressed[parameter] += int(count)
+                self.suppressed_equipment[parameter].add(name)
+
+        EquipmentAlert.objects.bulk_update(
+            escalated,
+            ['alert_type', 'value', 'threshold', 'message', 'recommendation', 'last_seen_at', 'occurrence_count'],
+            batch_size=BULK_BATCH_SIZE
+        )
+        EquipmentAlert.objects.bulk_update(repeated, ['occurrence_count', 'last_seen_at'], batch_size=BULK_BATCH_SIZE)
+        EquipmentAlert.objects.bulk_create(created, batch_size=BULK_BATCH_SIZE)
+        if any(alert.pk is None for alert in created):
+            # Backends that cannot return ids from a bulk insert
+            self.reload()
+        else:
+            self.open.update(((alert.equipment_name, alert.parameter), (alert.pk, alert.alert_type)) for alert in created)
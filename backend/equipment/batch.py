@@ -0,0 +1,207 @@
+import gzip
+import logging
+import tarfile
+import zipfile
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from itertools import islice
+from pathlib import PurePosixPath
+
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .alerts import AlertSink, load_rules
+from .cache import bump_generation
+from .ingest import (
+    CHUNK_SIZE, IngestError, RunningSummary, latest_scores, read_chunks, save_dataset, score_readings,
+    update_rankings,
+)
+from .process_pool import get_executor, reset_executor
+from .rollups import RollupAccumulator, merge_rollups
+
+logger = logging.getLogger(__name__)
+
+# Members submitted to the process pool ahead of the one being saved, per worker
+IN_FLIGHT_PER_WORKER = 2
+
+
+def _is_csv(name):
+    path = PurePosixPath(name)
+    return path.suffix.lower() == '.csv' and not path.name.startswith('._') and '__MACOSX' not in path.parts
+
+
+def _read_limited(stream, budget):
+    data = stream.read(budget + 1)
+    if len(data) > budget:
+        raise IngestError(
+            f"Upload exceeds the {settings.EQUIPMENT_BATCH_MAX_BYTES} byte limit once decompressed"
+        )
+    return data
+
+
+def extract_members(uploads):
+    """Expand uploaded CSVs, .zip, .tar.gz and .gz files into (file name, CSV bytes) pairs.
+
+    The decompressed total is capped by EQUIPMENT_BATCH_MAX_BYTES.
+    """
+    members = []
+    budget = settings.EQUIPMENT_BATCH_MAX_BYTES
+
+    def add(name, stream):
+        nonlocal budget
+        data = _read_limited(stream, budget)
+        budget -= len(data)
+        members.append((name, data))
+
+    for upload in uploads:
+        lower = upload.name.lower()
+        try:
+            if lower.endswith('.zip'):
+                with zipfile.ZipFile(upload) as archive:
+                    for info in archive.infolist():
+                        if not info.is_dir() and _is_csv(info.filename):
+                            with archive.open(info) as member:
+                                add(info.filename, member)
+            elif lower.endswith(('.tar.gz', '.tgz')):
+                with tarfile.open(fileobj=upload, mode='r:gz') as archive:
+                    for info in archive:
+                        if info.isfile() and _is_csv(info.name):
+                            add(info.name, archive.extractfile(info))
+            elif lower.endswith('.gz'):
+                with gzip.GzipFile(fileobj=upload) as member:
+                    add(upload.name[:-3], member)
+            else:
+                add(upload.name, upload)
+        except (zipfile.BadZipFile, tarfile.TarError, gzip.BadGzipFile, EOFError) as e:
+            raise IngestError(f"Could not read archive {upload.name}: {e}")
+
+    return members
+
+
+def parse_member(data, chunk_size=CHUNK_SIZE):
+    """Parse and score one CSV; runs in a worker process and never touches the database."""
+    summary = RunningSummary()
+    rollup = RollupAccumulator()
+    frames = []
+    for chunk in read_chunks(BytesIO(data), chunk_size):
+        summary.add(chunk)
+        rollup.add(chunk)
+        frames.append(score_readings(chunk))
+    if not summary.total_records:
+        raise IngestError("No data rows found")
+    return summary, rollup, pd.concat(frames, ignore_index=True)
+
+
+def _parsed_members(members):
+    """Yield (name, parsed, error) for each member in upload order."""
+    if settings.EQUIPMENT_BATCH_WORKERS <= 0:
+        for name, data in members:
+            try:
+                yield name, parse_member(data), None
+            except Exception as e:
+                yield name, None, e
+        return
+
+    # Only a window of members is in the pool at once, so pickled inputs and
+    # parsed frames waiting to be saved stay bounded however large the archive
+    members = iter(members)
+    window = IN_FLIGHT_PER_WORKER * settings.EQUIPMENT_BATCH_WORKERS
+    in_flight = deque()
+
+    def refill():
+        for name, data in islice(members, window - len(in_flight)):
+            in_flight.append((name, get_executor().submit(parse_member, data)))
+
+    refill()
+    while in_flight:
+        name, future = in_flight.popleft()
+        try:
+            outcome = name, future.result(), None
+        except BrokenProcessPool as e:
+            reset_executor()
+            outcome = name, None, e
+        except Exception as e:
+            outcome = name, None, e
+        # Top up before handing the result over, so workers keep parsing while it is saved
+        refill()
+        yield outcome
+
+
+def _save_batch(batch, results, combined, alerts):
+    rollup = RollupAccumulator()
+    latest = {}
+    # Columnar copies only move into place on commit; a rollback leaves them to be discarded here
+    stores = []
+    try:
+        with transaction.atomic():
+            for name, parsed, error in batch:
+                if error is None:
+                    summary, member_rollup, scored = parsed
+                    opened = alerts.opened
+                    store = None
+                    try:
+                        # A savepoint per file, so one bad file does not roll back the rest of the batch
+                        with transaction.atomic():
+                            dataset, store = save_dataset(name, summary, scored, alerts)
+                    except Exception as e:
+                        error = e
+                        alerts.reload()
+                        alerts.opened = opened
+                        if store:
+                            store.discard()
+                    else:
+                        if store:
+                            stores.append(store)
+
+                if error is not None:
+                    logger.warning("Batch member %s failed: %s", name, error)
+                    results.append({'file_name': name, 'status': 'FAILED', 'error': str(error)})
+                    continue
+
+                rollup.merge(member_rollup)
+                latest.update(latest_scores(scored))
+                combined.merge(summary)
+                results.append({
+                    'file_name': name,
+                    'status': 'COMPLETED',
+                    'dataset_id': dataset.id,
+                    'summary': summary.as_dict()
+                })
+
+            alerts.flush()
+            if latest:
+                update_rankings(latest)
+                merge_rollups(rollup, timezone.now())
+                bump_generation()
+    except BaseException:
+        for store in stores:
+            store.discard()
+        raise
+
+
+def ingest_batch(members):
+    """Parse members in the process pool and save each as its own Dataset.
+
+    Parsed files are committed EQUIPMENT_BATCH_TRANSACTION_SIZE at a time, with
+    rankings, rollups and the cache generation updated once per transaction.
+    One alert sink spans the whole upload, so the alert storm limit applies
+    to the request rather than to each transaction.
+    """
+    results = []
+    combined = RunningSummary()
+    alerts = AlertSink(load_rules())
+    parsed = _parsed_members(members)
+    while batch := list(islice(parsed, settings.EQUIPMENT_BATCH_TRANSACTION_SIZE)):
+        _save_batch(batch, results, combined, alerts)
+
+    succeeded = sum(1 for result in results if result['status'] == 'COMPLETED')
+    return {
+        'files': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'summary': combined.as_dict() if succeeded else None,
+        'results': results
+    }
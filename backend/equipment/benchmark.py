@@ -0,0 +1,154 @@
+import os
+import platform
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import django
+import numpy as np
+import pandas as pd
+from django.core.cache import caches
+from django.db import connection
+
+from .instrumentation import QueryCounter
+
+EQUIPMENT_TYPES = ['Pump', 'Compressor', 'Valve', 'HeatExchanger', 'Reactor', 'Condenser']
+
+# Normal operating ranges and the out-of-range values used to trip alerts
+NORMAL_RANGES = {'Flowrate': (80, 150), 'Pressure': (4, 8), 'Temperature': (100, 135)}
+FAULT_RANGES = {'Flowrate': ((20, 50), (150, 200)), 'Pressure': ((1, 3.5), (8.5, 11))}
+
+
+def generate_csv(path, rows, out_of_range_rate=0.05, equipment=1000, seed=42):
+    """Write a synthetic CSV shaped like sample_data/sample_equipment_data.csv."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(rows) % equipment
+    types = np.array(EQUIPMENT_TYPES)[ids % len(EQUIPMENT_TYPES)]
+    frame = pd.DataFrame({
+        'Equipment Name': [f"{eq_type}-{i + 1}" for eq_type, i in zip(types, ids)],
+        'Type': types,
+    })
+    for column, (low, high) in NORMAL_RANGES.items():
+        frame[column] = rng.uniform(low, high, rows).round(2)
+
+    for column, (low_band, high_band) in FAULT_RANGES.items():
+        faulty = rng.random(rows) < out_of_range_rate / len(FAULT_RANGES)
+        high_side = rng.random(rows) < 0.5
+        faults = np.where(
+            high_side,
+            rng.uniform(*high_band, rows),
+            rng.uniform(*low_band, rows)
+        ).round(2)
+        frame.loc[faulty, column] = faults[faulty]
+
+    frame.to_csv(path, index=False)
+    return path
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux but bytes on macOS
+    return peak // 1024 if platform.system() == 'Darwin' else peak
+
+
+def measure(scenario, rows, request):
+    counter = QueryCounter()
+    rss_before = peak_rss_kb()
+    start = time.perf_counter()
+    with connection.execute_wrapper(counter):
+        response = request()
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+    wall = time.perf_counter() - start
+    rss_after = peak_rss_kb()
+
+    return {
+        'scenario': scenario,
+        'rows': rows,
+        'status_code': response.status_code,
+        'wall_seconds': round(wall, 4),
+        'rows_per_second': round(rows / wall, 1) if rows and wall else None,
+        'queries': counter.queries,
+        'sql_seconds': round(counter.seconds, 4),
+        'response_bytes': size,
+        'peak_rss_kb': rss_after,
+        'peak_rss_growth_kb': rss_after - rss_before if rss_after is not None else None,
+    }
+
+
+def run_size(client, csv_path, rows, equipment, compare_count=10):
+    names = [f"{EQUIPMENT_TYPES[i % len(EQUIPMENT_TYPES)]}-{i + 1}" for i in range(min(equipment, compare_count))]
+    responses = caches['responses']
+
+    def upload():
+        with open(csv_path, 'rb') as f:
+            return client.post('/api/upload/', {'file': f})
+
+    results = [measure('upload_csv', rows, upload)]
+
+    reads = [
+        ('get_trends', lambda: client.get('/api/trends/', {'days': 30})),
+        ('get_alerts', lambda: client.get('/api/alerts/')),
+        ('compare_equipment', lambda: client.post(
+            '/api/compare-equipment/', {'equipment_names': names}, content_type='application/json'
+        )),
+        ('generate_pdf', lambda: client.get('/api/report/')),
+        ('export_to_excel', lambda: client.get('/api/export/excel/')),
+    ]
+    for scenario, request in reads:
+        responses.clear()
+        results.append(measure(scenario, rows, request))
+        results.append(measure(f'{scenario}:cached', rows, request))
+
+    return results
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare_results(current, baseline, threshold=0.2, min_seconds=0.05):
+    """List scenarios that got slower than ``threshold`` or issue more queries than the baseline.
+
+    Timings below ``min_seconds`` in both runs are ignored as noise.
+    """
+    previous = {(result['scenario'], result['rows']): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        before = previous.get((result['scenario'], result['rows']))
+        if before is None:
+            continue
+
+        old, new = before['wall_seconds'], result['wall_seconds']
+        if max(old, new) >= min_seconds and new > old * (1 + threshold):
+            regressions.append({
+                'scenario': result['scenario'],
+                'rows': result['rows'],
+                'metric': 'wall_seconds',
+                'baseline': old,
+                'current': new,
+                'change': round(new / old - 1, 3) if old else None,
+            })
+        if result['queries'] > before['queries']:
+            regressions.append({
+                'scenario': result['scenario'],
+                'rows': result['rows'],
+                'metric': 'queries',
+                'baseline': before['queries'],
+                'current': result['queries'],
+                'change': result['queries'] - before['queries'],
+            })
+    return regressions
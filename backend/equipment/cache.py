@@ -0,0 +1,128 @@
+import hashlib
+import time
+from calendar import timegm
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+
+from django.core.cache import caches
+from django.db.models import F
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .instrumentation import count_rows
+from .models import DataGeneration
+
+CACHED_HEADERS = ('Content-Type', 'Content-Disposition', 'Link', 'X-Next-Cursor')
+
+# Bumped whenever the layout of a cached entry changes, so a file cache never serves an old one
+ENTRY_VERSION = 2
+
+
+def bump_generation():
+    """Invalidate every cached response; call from any write the read endpoints depend on."""
+    updated = DataGeneration.objects.filter(pk=1).update(
+        generation=F('generation') + 1,
+        updated_at=timezone.now()
+    )
+    if not updated:
+        DataGeneration.objects.get_or_create(pk=1, defaults={'generation': 1})
+
+
+def get_generation():
+    return DataGeneration.objects.get_or_create(pk=1)[0]
+
+
+def current_generation(request):
+    # Memoized per request so the ETag, Last-Modified and cache key share one lookup
+    if not hasattr(request, '_data_generation'):
+        request._data_generation = get_generation()
+    return request._data_generation
+
+
+def current_time_bucket(request, seconds):
+    # Memoized per request for the same reason as the generation
+    if not hasattr(request, '_time_bucket'):
+        request._time_bucket = int(time.time() // seconds)
+    return request._time_bucket
+
+
+def _variant_digest(request, kwargs):
+    params = sorted((key, sorted(values)) for key, values in request.GET.lists())
+    variant = (sorted(kwargs.items()), params, request.META.get('HTTP_ACCEPT', ''))
+    return hashlib.md5(repr(variant).encode()).hexdigest()[:16]
+
+
+def cached_endpoint(name, time_bucket=None):
+    """Cache a read view's rendered response until the data generation changes.
+
+    200 responses carry an ETag and Last-Modified so clients can revalidate
+    and receive a 304 without the view running at all. Errors and pending
+    (202) responses get neither, so a client never revalidates one of them
+    into a 304.
+
+    Views whose window is relative to now pass ``time_bucket`` (seconds):
+    their responses also expire each time the clock enters a new bucket.
+    """
+    def etag(request, *args, **kwargs):
+        tag = f"{name}-{current_generation(request).generation}-{_variant_digest(request, kwargs)}"
+        if time_bucket:
+            tag += f"-{current_time_bucket(request, time_bucket)}"
+        return tag
+
+    def last_modified(request, *args, **kwargs):
+        updated_at = current_generation(request).updated_at
+        if time_bucket:
+            bucket_start = current_time_bucket(request, time_bucket) * time_bucket
+            updated_at = max(updated_at, datetime.fromtimestamp(bucket_start, dt_timezone.utc))
+        return updated_at
+
+    def decorator(view):
+        def cached_view(request, *args, **kwargs):
+            cache = caches['responses']
+            key = f"equipment:{etag(request, *args, **kwargs)}"
+            entry = cache.get(key, version=ENTRY_VERSION)
+
+            if entry is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200 or response.streaming:
+                    return response
+                if hasattr(response, 'render'):
+                    response.render()
+                headers = [(header, value) for header, value in response.items() if header in CACHED_HEADERS]
+                # Kept with the entry: a hit skips the renderer that reports rows to the instrumentation
+                rows = count_rows(response.data) if hasattr(response, 'data') else 0
+                entry = (response.content, headers, rows)
+                cache.set(key, entry, version=ENTRY_VERSION)
+            elif hasattr(request, '_instrumentation_rows'):
+                request._instrumentation_rows += entry[2]
+
+            content, headers, _ = entry
+            response = HttpResponse(content)
+            for header, value in headers:
+                response[header] = value
+            patch_cache_control(response, no_cache=True)
+            patch_vary_headers(response, ['Accept'])
+            return response
+
+        @wraps(view)
+        def conditional_view(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return cached_view(request, *args, **kwargs)
+
+            res_etag = quote_etag(etag(request, *args, **kwargs))
+            res_last_modified = timegm(last_modified(request, *args, **kwargs).utctimetuple())
+            not_modified = get_conditional_response(request, etag=res_etag, last_modified=res_last_modified)
+            if not_modified is not None:
+                return not_modified
+
+            response = cached_view(request, *args, **kwargs)
+            if response.status_code == 200:
+                response.headers.setdefault('ETag', res_etag)
+                response.headers.setdefault('Last-Modified', http_date(res_last_modified))
+            return response
+
+        return conditional_view
+
+    return decorator
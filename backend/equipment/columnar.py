@@ -0,0 +1,93 @@
+import os
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # the columnar store is optional
+    pa = pq = None
+
+COLUMNS = [
+    'equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature',
+    'health_score', 'efficiency_index', 'recorded_at',
+]
+
+# Rows per record batch when streaming a dataset back out
+BATCH_SIZE = 64 * 1024
+
+
+def enabled():
+    return settings.EQUIPMENT_COLUMNAR_STORE and pq is not None
+
+
+def dataset_path(dataset_id):
+    return Path(settings.EQUIPMENT_COLUMNAR_DIR) / f"dataset_{dataset_id}.parquet"
+
+
+def _schema():
+    return pa.schema([
+        ('equipment_name', pa.string()),
+        ('equipment_type', pa.string()),
+        ('flowrate', pa.float64()),
+        ('pressure', pa.float64()),
+        ('temperature', pa.float64()),
+        ('health_score', pa.float64()),
+        ('efficiency_index', pa.float64()),
+        ('recorded_at', pa.timestamp('us', tz='UTC')),
+    ])
+
+
+class ColumnarWriter:
+    """Append a dataset's readings to its Parquet file, one row group per chunk.
+
+    The file is written under a temporary name and only moved into place by
+    ``commit()``, so an upload that fails part way never leaves a partial copy.
+    """
+
+    def __init__(self, dataset_id):
+        self.path = dataset_path(dataset_id)
+        self.partial = self.path.with_suffix('.tmp')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.writer = pq.ParquetWriter(
+            self.partial, _schema(), compression=settings.EQUIPMENT_COLUMNAR_COMPRESSION
+        )
+
+    def write(self, frame):
+        self.writer.write_table(pa.Table.from_pandas(frame[COLUMNS], schema=_schema(), preserve_index=False))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def commit(self):
+        self.close()
+        os.replace(self.partial, self.path)
+
+    def discard(self):
+        self.close()
+        self.partial.unlink(missing_ok=True)
+
+
+def has_dataset(dataset_id):
+    return pq is not None and dataset_path(dataset_id).exists()
+
+
+def read_columns(dataset_id, columns, filters=None):
+    """Load only ``columns`` of a dataset into a DataFrame via a memory-mapped read.
+
+    Returns None when the dataset has no columnar copy; callers fall back to the ORM.
+    """
+    if not has_dataset(dataset_id):
+        return None
+    table = pq.read_table(dataset_path(dataset_id), columns=columns, filters=filters, memory_map=True)
+    return table.to_pandas()
+
+
+def iter_rows(dataset_id, columns, batch_size=BATCH_SIZE):
+    """Yield a dataset's rows as tuples of ``columns``, one record batch in memory at a time."""
+    parquet = pq.ParquetFile(dataset_path(dataset_id), memory_map=True)
+    for batch in parquet.iter_batches(batch_size=batch_size, columns=columns):
+        yield from zip(*(batch.column(name).to_pylist() for name in columns))
@@ -0,0 +1,127 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.utils import timezone
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+from . import columnar
+from .models import EquipmentAlert, EquipmentParameter, EquipmentRanking
+
+ITERATOR_CHUNK_SIZE = 2000
+
+HEADER_FILL = PatternFill(start_color="667EEA", end_color="667EEA", fill_type="solid")
+HEADER_FONT = Font(bold=True, color="FFFFFF", size=12)
+
+PARAMETER_COLUMNS = [
+    ('Equipment Name', 'equipment_name', 25),
+    ('Type', 'equipment_type', 18),
+    ('Flowrate (L/min)', 'flowrate', 16),
+    ('Pressure (bar)', 'pressure', 16),
+    ('Temperature (°C)', 'temperature', 18),
+    ('Health Score', 'health_score', 14),
+    ('Efficiency Index', 'efficiency_index', 16),
+    ('Recorded At', 'recorded_at', 22),
+]
+
+RANKING_COLUMNS = [
+    ('Rank', 'efficiency_rank', 8),
+    ('Equipment Name', 'equipment_name', 25),
+    ('Type', 'equipment_type', 18),
+    ('Overall Score', 'overall_score', 14),
+    ('Reliability Rank', 'reliability_rank', 16),
+    ('Performance Rank', 'performance_rank', 18),
+    ('Calculated At', 'calculated_at', 22),
+]
+
+ALERT_COLUMNS = [
+    ('Created At', 'created_at', 22),
+    ('Equipment Name', 'equipment_name', 25),
+    ('Alert Type', 'alert_type', 12),
+    ('Parameter', 'parameter', 14),
+    ('Value', 'value', 10),
+    ('Threshold', 'threshold', 10),
+    ('Message', 'message', 50),
+    ('Recommendation', 'recommendation', 40),
+    ('Occurrences', 'occurrence_count', 12),
+    ('Last Seen', 'last_seen_at', 22),
+    ('Resolved', 'resolved', 10),
+    ('Resolved At', 'resolved_at', 22),
+]
+
+
+def _header_row(ws, labels):
+    cells = []
+    for label in labels:
+        cell = WriteOnlyCell(ws, value=label)
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cells.append(cell)
+    return cells
+
+
+def _excel_value(value):
+    # Excel has no timezone support; write timestamps as naive UTC
+    if isinstance(value, datetime) and timezone.is_aware(value):
+        return timezone.make_naive(value, dt_timezone.utc)
+    return value
+
+
+def _query_rows(queryset, columns):
+    return queryset.values_list(*[field for _, field, _ in columns]).iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+
+
+def _parameter_rows(dataset):
+    # The columnar copy streams record batches straight off disk, skipping the ORM
+    if columnar.has_dataset(dataset.id):
+        return columnar.iter_rows(dataset.id, [field for _, field, _ in PARAMETER_COLUMNS])
+    return _query_rows(EquipmentParameter.objects.filter(dataset=dataset).order_by('id'), PARAMETER_COLUMNS)
+
+
+def _write_table(wb, title, columns, rows):
+    ws = wb.create_sheet(title)
+    for index, (_, _, width) in enumerate(columns, start=1):
+        ws.column_dimensions[get_column_letter(index)].width = width
+    ws.freeze_panes = 'A2'
+    ws.append(_header_row(ws, [label for label, _, _ in columns]))
+
+    for row in rows:
+        ws.append([_excel_value(value) for value in row])
+
+
+def write_workbook(dataset, output):
+    """Write the full multi-sheet report for a dataset to a binary file object.
+
+    The workbook is write-only, so rows are flushed to disk as they are
+    appended and the ORM rows are never materialized all at once.
+    """
+    wb = Workbook(write_only=True)
+
+    ws_summary = wb.create_sheet("Summary")
+    ws_summary.column_dimensions['A'].width = 30
+    ws_summary.column_dimensions['B'].width = 20
+
+    title = WriteOnlyCell(ws_summary, value="Equipment Analysis Report")
+    title.font = Font(bold=True, size=16, color="667EEA")
+    ws_summary.append([title])
+    ws_summary.append([])
+    ws_summary.append(["Generated", datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
+    ws_summary.append([])
+    ws_summary.append(_header_row(ws_summary, ["Metric", "Value"]))
+    ws_summary.append(["Total Records", dataset.total_records])
+    ws_summary.append(["Average Flowrate (L/min)", round(dataset.avg_flowrate, 2)])
+    ws_summary.append(["Average Pressure (bar)", round(dataset.avg_pressure, 2)])
+    ws_summary.append(["Average Temperature (°C)", round(dataset.avg_temperature, 2)])
+
+    _write_table(wb, "Parameters", PARAMETER_COLUMNS, _parameter_rows(dataset))
+    _write_table(
+        wb, "Rankings", RANKING_COLUMNS,
+        _query_rows(EquipmentRanking.objects.order_by('efficiency_rank'), RANKING_COLUMNS)
+    )
+    _write_table(
+        wb, "Alerts", ALERT_COLUMNS,
+        _query_rows(EquipmentAlert.objects.order_by('-created_at'), ALERT_COLUMNS)
+    )
+
+    wb.save(output)
@@ -0,0 +1,212 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Func, OuterRef, Subquery, Sum, Value
+from django.utils import timezone
+
+from .alerts import UNITS, band_arrays, load_rules
+from .cache import bump_generation
+from .models import EquipmentAlert, EquipmentParameter
+from .rollups import PARAMETERS
+
+BULK_BATCH_SIZE = 2000
+
+# Fewer readings than this, or readings at a single instant, give no usable trend
+MIN_POINTS = 5
+
+SECONDS_PER_DAY = 86400.0
+
+# Per-group sums a least-squares line is fitted from, in fit_trends argument order
+TREND_SUMS = ('n', 'sum_t', 'sum_x', 'sum_tt', 'sum_tx', 'sum_xx')
+
+
+class Epoch(Func):
+    """Seconds since the Unix epoch of a datetime expression."""
+
+    template = 'CAST(EXTRACT(EPOCH FROM %(expressions)s) AS DOUBLE PRECISION)'
+    output_field = FloatField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, template='((julianday(%(expressions)s) - 2440587.5) * 86400.0)', **extra_context
+        )
+
+
+def load_trend_sums(since):
+    """Per-equipment trend sums of each parameter, computed by the database.
+
+    Returns a DataFrame indexed by equipment name with the latest
+    ``equipment_type``, the number of ``readings`` and, per parameter
+    column, the ``TREND_SUMS`` of its non-null readings against time in
+    days since ``since``.
+    """
+    readings = EquipmentParameter.objects.filter(recorded_at__gte=since).order_by()
+    latest_type = (
+        readings.filter(equipment_name=OuterRef('equipment_name'))
+        .order_by('-recorded_at', '-id').values('equipment_type')[:1]
+    )
+    equipment = pd.DataFrame.from_records(
+        readings.values('equipment_name')
+        .annotate(equipment_type=Subquery(latest_type), readings=Count('id')),
+        columns=['equipment_name', 'equipment_type', 'readings']
+    ).set_index('equipment_name')
+
+    t = (Epoch('recorded_at') - Value(since.timestamp())) / Value(SECONDS_PER_DAY)
+    for column in PARAMETERS.values():
+        # A missing reading only drops out of its own parameter's fit
+        sums = pd.DataFrame.from_records(
+            readings.filter(**{f'{column}__isnull': False}).alias(t=t)
+            .values('equipment_name')
+            .annotate(
+                n=Count(column),
+                sum_t=Sum('t'),
+                sum_x=Sum(column),
+                sum_tt=Sum(F('t') * F('t')),
+                sum_tx=Sum(F('t') * F(column)),
+                sum_xx=Sum(F(column) * F(column)),
+            ),
+            columns=['equipment_name', *TREND_SUMS]
+        ).set_index('equipment_name')
+        equipment = equipment.join(sums.astype(float).add_prefix(f'{column}_'))
+    return equipment.fillna({f'{column}_{stat}': 0.0 for column in PARAMETERS.values() for stat in TREND_SUMS})
+
+
+def fit_trends(n, sum_t, sum_x, sum_tt, sum_tx, sum_xx):
+    """Least-squares line per group from its grouped sums.
+
+    Returns (slope, intercept, r2) arrays; groups without enough points or
+    spread in time get NaN slopes.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s_tt = sum_tt - sum_t ** 2 / n
+        s_tx = sum_tx - sum_t * sum_x / n
+        s_xx = sum_xx - sum_x ** 2 / n
+        usable = (n >= MIN_POINTS) & (s_tt > 1e-9)
+        slope = np.where(usable, s_tx / s_tt, np.nan)
+        intercept = (sum_x - slope * sum_t) / n
+        r2 = np.where(usable & (s_xx > 1e-12), slope * s_tx / s_xx, 0.0)
+    return slope, intercept, np.clip(r2, 0.0, 1.0)
+
+
+def forecast(sums, rules, now, since, horizon_days, min_confidence):
+    """Project each equipment's trend onto its CRITICAL band and return the crossings within the horizon."""
+    if sums.empty:
+        return []
+
+    names = sums.index
+    # Each instrument is checked against the band for its most recent type
+    type_codes, type_names = pd.factorize(sums['equipment_type'])
+    now_t = (now - since).total_seconds() / SECONDS_PER_DAY
+
+    predictions = []
+    for parameter, column in PARAMETERS.items():
+        band = rules.bands.get((parameter, 'CRITICAL'))
+        if band is None:
+            continue
+        low, high, _ = band_arrays(type_names, *band)
+        low, high = low[type_codes], high[type_codes]
+
+        slope, intercept, r2 = fit_trends(*(sums[f'{column}_{stat}'].to_numpy(dtype=float) for stat in TREND_SUMS))
+        current = intercept + slope * now_t
+        with np.errstate(divide='ignore', invalid='ignore'):
+            threshold = np.where(slope > 0, high, low)
+            days_ahead = (threshold - intercept) / slope - now_t
+        inside = ~((current > high) | (current < low))
+        hit = np.flatnonzero(
+            inside & (r2 >= min_confidence) & (days_ahead > 0) & (days_ahead <= horizon_days)
+        )
+        for i in hit:
+            predictions.append({
+                'equipment_name': names[i],
+                'parameter': parameter,
+                'value': float(current[i]),
+                'threshold': float(threshold[i]),
+                'slope': float(slope[i]),
+                'predicted_failure_date': (now + timedelta(days=float(days_ahead[i]))).date(),
+                'confidence_score': round(float(r2[i]), 3),
+            })
+    return predictions
+
+
+def _alert_fields(prediction):
+    parameter, slope = prediction['parameter'], prediction['slope']
+    failure_date = prediction['predicted_failure_date']
+    return {
+        'value': prediction['value'],
+        'threshold': prediction['threshold'],
+        'message': (
+            f"{parameter} trending {'up' if slope > 0 else 'down'} {abs(slope):.2f} {UNITS[parameter]}/day; "
+            f"projected to reach {prediction['threshold']:g} {UNITS[parameter]} around {failure_date.isoformat()}"
+        ),
+        'recommendation': f"Schedule preventive maintenance before {failure_date.isoformat()}",
+        'predicted_failure_date': failure_date,
+        'confidence_score': prediction['confidence_score'],
+        'last_seen_at': timezone.now(),
+    }
+
+
+def sync_predictive_alerts(predictions):
+    """Make the open PREDICTIVE alerts match ``predictions``: update, create, and auto-resolve stale ones.
+
+    Returns a dict of counts per action.
+    """
+    with transaction.atomic():
+        open_alerts = dict(
+            ((name, parameter), pk) for pk, name, parameter in
+            EquipmentAlert.objects.filter(resolved=False, alert_type='PREDICTIVE')
+            .values_list('id', 'equipment_name', 'parameter')
+        )
+        updated, created = [], []
+        for prediction in predictions:
+            key = (prediction['equipment_name'], prediction['parameter'])
+            fields = _alert_fields(prediction)
+            if key in open_alerts:
+                updated.append(EquipmentAlert(id=open_alerts.pop(key), **fields))
+            else:
+                created.append(EquipmentAlert(
+                    equipment_name=prediction['equipment_name'],
+                    parameter=prediction['parameter'],
+                    alert_type='PREDICTIVE',
+                    **fields
+                ))
+
+        EquipmentAlert.objects.bulk_update(
+            updated,
+            ['value', 'threshold', 'message', 'recommendation', 'predicted_failure_date',
+             'confidence_score', 'last_seen_at'],
+            batch_size=BULK_BATCH_SIZE
+        )
+        EquipmentAlert.objects.bulk_create(created, batch_size=BULK_BATCH_SIZE)
+
+        # Trends that no longer project a crossing retire their forecast
+        stale = list(open_alerts.values())
+        cleared = 0
+        for start in range(0, len(stale), BULK_BATCH_SIZE):
+            cleared += EquipmentAlert.objects.filter(id__in=stale[start:start + BULK_BATCH_SIZE]).update(
+                resolved=True, resolved_at=timezone.now()
+            )
+        if updated or created or cleared:
+            bump_generation()
+
+    return {'updated': len(updated), 'created': len(created), 'cleared': cleared}
+
+
+def run_forecast(horizon_days=None, lookback_days=None, min_confidence=None):
+    """Fit every instrument's recent readings and refresh the PREDICTIVE alerts."""
+    horizon_days = settings.EQUIPMENT_FORECAST_HORIZON_DAYS if horizon_days is None else horizon_days
+    lookback_days = settings.EQUIPMENT_FORECAST_LOOKBACK_DAYS if lookback_days is None else lookback_days
+    min_confidence = settings.EQUIPMENT_FORECAST_MIN_CONFIDENCE if min_confidence is None else min_confidence
+
+    now = timezone.now()
+    since = now - timedelta(days=lookback_days)
+    sums = load_trend_sums(since)
+    predictions = forecast(sums, load_rules(), now, since, horizon_days, min_confidence)
+    return {
+        'readings': int(sums['readings'].sum()),
+        'equipment': len(sums),
+        'predictions': len(predictions),
+        **sync_predictive_alerts(predictions),
+    }
@@ -0,0 +1,305 @@
+from collections import Counter
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import columnar
+from .alerts import AlertSink, load_rules
+from .cache import bump_generation
+from .models import Dataset, EquipmentParameter, EquipmentRanking
+from .rollups import RollupAccumulator, merge_rollups
+
+REQUIRED_COLUMNS = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
+
+BULK_BATCH_SIZE = 2000
+
+# Rows parsed per pandas chunk; bounds peak memory regardless of file size
+CHUNK_SIZE = getattr(settings, 'EQUIPMENT_INGEST_CHUNK_SIZE', 50000)
+
+# (ideal band, acceptable band) per parameter; readings outside both score 60
+SCORE_BANDS = {
+    'Flowrate': ((100, 130), (80, 150)),
+    'Pressure': ((4, 8), (3, 9)),
+    'Temperature': ((100, 135), (90, 150)),
+}
+
+
+class IngestError(ValueError):
+    pass
+
+
+class RunningSummary:
+    """Accumulates the upload summary one chunk at a time."""
+
+    AVERAGED = {'Flowrate': 'avg_flowrate', 'Pressure': 'avg_pressure', 'Temperature': 'avg_temperature'}
+
+    def __init__(self):
+        self.total_records = 0
+        self.sums = dict.fromkeys(self.AVERAGED, 0.0)
+        self.counts = dict.fromkeys(self.AVERAGED, 0)
+        self.types = Counter()
+
+    def add(self, chunk):
+        self.total_records += len(chunk)
+        for column in self.AVERAGED:
+            values = chunk[column]
+            self.sums[column] += float(values.sum())
+            self.counts[column] += int(values.count())
+        for eq_type, count in chunk['Type'].value_counts().items():
+            self.types[eq_type] += int(count)
+
+    def merge(self, other):
+        self.total_records += other.total_records
+        for column in self.AVERAGED:
+            self.sums[column] += other.sums[column]
+            self.counts[column] += other.counts[column]
+        self.types.update(other.types)
+
+    def averages(self):
+        return {
+            field: self.sums[column] / self.counts[column] if self.counts[column] else float('nan')
+            for column, field in self.AVERAGED.items()
+        }
+
+    def as_dict(self):
+        return {
+            "total_records": self.total_records,
+            **self.averages(),
+            "type_distribution": dict(self.types.most_common())
+        }
+
+
+def band_score(values, ideal, acceptable):
+    values = np.asarray(values, dtype=float)
+    in_ideal = (values >= ideal[0]) & (values <= ideal[1])
+    in_acceptable = (values >= acceptable[0]) & (values <= acceptable[1])
+    return np.where(in_ideal, 100.0, np.where(in_acceptable, 80.0, 60.0))
+
+
+def score_readings(df):
+    """Return a frame of typed readings with the health score of every row."""
+    scored = pd.DataFrame({
+        'equipment_name': df['Equipment Name'].to_numpy(),
+        'equipment_type': df['Type'].to_numpy(),
+        'flowrate': df['Flowrate'].astype(float).to_numpy(),
+        'pressure': df['Pressure'].astype(float).to_numpy(),
+        'temperature': df['Temperature'].astype(float).to_numpy(),
+    })
+    total = sum(
+        band_score(df[column].astype(float), ideal, acceptable)
+        for column, (ideal, acceptable) in SCORE_BANDS.items()
+    )
+    scored['health_score'] = total / len(SCORE_BANDS)
+    return scored
+
+
+def bulk_insert(model, objects, batch_size=BULK_BATCH_SIZE):
+    """Insert objects from an iterable without materializing them all at once."""
+    objects = iter(objects)
+    inserted = 0
+    while True:
+        batch = list(islice(objects, batch_size))
+        if not batch:
+            return inserted
+        model.objects.bulk_create(batch, batch_size=batch_size)
+        inserted += len(batch)
+
+
+def persist_readings(dataset, scored, alerts):
+    parameters = (
+        EquipmentParameter(
+            dataset=dataset,
+            equipment_name=name,
+            equipment_type=eq_type,
+            flowrate=flowrate,
+            pressure=pressure,
+            temperature=temperature,
+            health_score=health_score,
+            efficiency_index=health_score
+        )
+        for name, eq_type, flowrate, pressure, temperature, health_score in scored.itertuples(index=False, name=None)
+    )
+    bulk_insert(EquipmentParameter, parameters)
+    alerts.add(scored)
+
+
+def columnar_frame(scored):
+    return scored.assign(efficiency_index=scored['health_score'], recorded_at=timezone.now())
+
+
+def save_dataset(file_name, summary, scored, alerts):
+    """Persist one fully parsed file as a Dataset with its readings and alerts.
+
+    Returns the dataset and its uncommitted columnar copy, or None when the
+    store is off. The copy is moved into place when the transaction commits;
+    a caller that rolls back must ``discard()`` it.
+    """
+    dataset = Dataset.objects.create(
+        total_records=summary.total_records,
+        file_name=file_name,
+        **summary.averages()
+    )
+    persist_readings(dataset, scored, alerts)
+    store = None
+    if columnar.enabled():
+        store = columnar.ColumnarWriter(dataset.id)
+        try:
+            store.write(columnar_frame(scored))
+            store.close()
+        except BaseException:
+            store.discard()
+            raise
+        transaction.on_commit(store.commit)
+    return dataset, store
+
+
+def latest_scores(scored):
+    """Map each equipment name in a scored frame to its last (type, health score)."""
+    last = scored.drop_duplicates('equipment_name', keep='last')
+    return dict(zip(last['equipment_name'], zip(last['equipment_type'], last['health_score'])))
+
+
+def update_rankings(latest):
+    """Upsert rankings for equipment whose score changed and re-rank around them.
+
+    Returns the number of equipment rows inserted or updated.
+    """
+    names = list(latest)
+    existing = {}
+    for start in range(0, len(names), BULK_BATCH_SIZE):
+        rows = EquipmentRanking.objects.filter(
+            equipment_name__in=names[start:start + BULK_BATCH_SIZE]
+        ).values_list('equipment_name', 'equipment_type', 'overall_score')
+        existing.update((name, (eq_type, score)) for name, eq_type, score in rows)
+
+    changed = [
+        EquipmentRanking(
+            equipment_name=name,
+            equipment_type=eq_type,
+            overall_score=score,
+            efficiency_rank=0,
+            reliability_rank=0,
+            performance_rank=0
+        )
+        for name, (eq_type, score) in latest.items()
+        if existing.get(name) != (eq_type, score)
+    ]
+    if not changed:
+        return 0
+
+    EquipmentRanking.objects.bulk_create(
+        changed,
+        batch_size=BULK_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['equipment_name'],
+        update_fields=['equipment_type', 'overall_score', 'calculated_at']
+    )
+
+    scores = [ranking.overall_score for ranking in changed]
+    scores += [existing[ranking.equipment_name][1] for ranking in changed if ranking.equipment_name in existing]
+    inserted = sum(ranking.equipment_name not in existing for ranking in changed)
+    rerank_band(min(scores), max(scores), inserted)
+    return len(changed)
+
+
+RANK_FIELDS = ['efficiency_rank', 'reliability_rank', 'performance_rank']
+
+
+def rerank_band(low, high, inserted=0):
+    """Re-rank after every changed row moved from and to scores within [low, high].
+
+    Positions follow (overall_score desc, id asc). Rows scoring above the
+    band keep their positions and rows below it only shift down by the
+    ``inserted`` new rows, so just the band itself is re-read and written:
+    the cost follows the spread of the changed scores, not the fleet size.
+    """
+    if inserted:
+        EquipmentRanking.objects.filter(overall_score__lt=low).update(
+            **{field: F(field) + inserted for field in RANK_FIELDS}
+        )
+
+    start = EquipmentRanking.objects.filter(overall_score__gt=high).count() + 1
+    band = EquipmentRanking.objects.filter(overall_score__gte=low, overall_score__lte=high).order_by(
+        '-overall_score', 'id'
+    ).values_list('id', 'efficiency_rank')
+    moved = [
+        EquipmentRanking(id=pk, efficiency_rank=position, reliability_rank=position, performance_rank=position)
+        for position, (pk, current) in enumerate(band.iterator(), start=start)
+        if position != current
+    ]
+    EquipmentRanking.objects.bulk_update(moved, RANK_FIELDS, batch_size=BULK_BATCH_SIZE)
+
+
+def read_chunks(file, chunk_size=CHUNK_SIZE):
+    """Yield the CSV in fixed-size frames, validating the header on the first one."""
+    try:
+        reader = pd.read_csv(file, chunksize=chunk_size)
+    except pd.errors.EmptyDataError:
+        raise IngestError("File is empty")
+    for index, chunk in enumerate(reader):
+        if index == 0:
+            missing = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+            if missing:
+                raise IngestError(f"Missing columns: {', '.join(missing)}")
+        yield chunk
+
+
+def ingest_csv(file, file_name, chunk_size=CHUNK_SIZE, progress=None):
+    """Stream a CSV into a new Dataset, persisting each chunk before reading the next.
+
+    ``progress`` is called with the running row count after every chunk.
+    """
+    summary = RunningSummary()
+    rollup = RollupAccumulator()
+    latest = {}
+    store = None
+    try:
+        with transaction.atomic():
+            alerts = AlertSink(load_rules())
+            dataset = None
+            for chunk in read_chunks(file, chunk_size):
+                if dataset is None:
+                    dataset = Dataset.objects.create(
+                        total_records=0,
+                        avg_flowrate=0,
+                        avg_pressure=0,
+                        avg_temperature=0,
+                        file_name=file_name
+                    )
+                    if columnar.enabled():
+                        store = columnar.ColumnarWriter(dataset.id)
+                summary.add(chunk)
+                rollup.add(chunk)
+                scored = score_readings(chunk)
+                persist_readings(dataset, scored, alerts)
+                if store:
+                    store.write(columnar_frame(scored))
+                latest.update(latest_scores(scored))
+                if progress:
+                    progress(summary.total_records)
+
+            if not summary.total_records:
+                raise IngestError("No data rows found")
+
+            dataset.total_records = summary.total_records
+            for field, value in summary.averages().items():
+                setattr(dataset, field, value)
+            dataset.save(update_fields=['total_records', *summary.averages()])
+            alerts.flush()
+            update_rankings(latest)
+            merge_rollups(rollup, dataset.uploaded_at)
+            bump_generation()
+            if store:
+                store.close()
+                transaction.on_commit(store.commit)
+    except BaseException:
+        if store:
+            store.discard()
+        raise
+
+    return dataset, summary.as_dict()
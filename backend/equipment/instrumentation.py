@@ -0,0 +1,256 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import Http404, HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_lock = threading.Lock()
+
+
+class QueryCounter:
+    """Database execute wrapper that counts statements and time spent in SQL."""
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.seconds += time.perf_counter() - start
+
+
+class ViewMetrics:
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.seconds = 0.0
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.rows = 0
+        self.response_bytes = 0
+        self.statuses = defaultdict(int)
+
+    def observe(self, sample):
+        duration = sample['duration_ms'] / 1000
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if duration <= bound:
+                self.buckets[index] += 1
+        self.count += 1
+        self.seconds += duration
+        self.queries += sample['queries']
+        self.sql_seconds += sample['sql_ms'] / 1000
+        self.rows += sample['rows']
+        self.response_bytes += sample['response_bytes']
+        self.statuses[sample['status']] += 1
+
+
+# Keyed by (view, method); metrics are per process
+_metrics = defaultdict(ViewMetrics)
+
+
+def count_rows(data):
+    """Number of records in a serialized payload: list length, or the longest list in a dict."""
+    if isinstance(data, (list, tuple)):
+        return len(data)
+    if isinstance(data, dict):
+        return max((len(value) for value in data.values() if isinstance(value, (list, tuple))), default=1)
+    return 0
+
+
+class InstrumentedJSONRenderer(JSONRenderer):
+    """JSON renderer that reports how many rows a view serialized to the middleware."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        request = (renderer_context or {}).get('request')
+        http_request = getattr(request, '_request', None)
+        if http_request is not None and hasattr(http_request, '_instrumentation_rows'):
+            http_request._instrumentation_rows += count_rows(data)
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.route or match.view_name
+
+
+def _response_size(response):
+    if response.streaming:
+        return int(response.get('Content-Length') or 0)
+    return len(response.content)
+
+
+def _server_timing(sample):
+    return ', '.join([
+        f'db;dur={sample["sql_ms"]};desc="{sample["queries"]} queries"',
+        f'app;dur={round(sample["duration_ms"] - sample["sql_ms"], 2)}',
+        f'total;dur={sample["duration_ms"]}',
+    ])
+
+
+def slow_request_logs(path):
+    """The slow-request log and its rotated copies, oldest first."""
+    backups = [path.with_name(f"{path.name}.{index}") for index in range(settings.EQUIPMENT_SLOW_REQUEST_LOG_BACKUPS, 0, -1)]
+    return [backup for backup in backups if backup.exists()] + [path]
+
+
+def _rotate(path):
+    """Shift slow.jsonl -> slow.jsonl.1 -> slow.jsonl.2 ..., dropping the oldest copy."""
+    backups = settings.EQUIPMENT_SLOW_REQUEST_LOG_BACKUPS
+    if not backups:
+        path.unlink(missing_ok=True)
+        return
+    for index in range(backups - 1, 0, -1):
+        source = path.with_name(f"{path.name}.{index}")
+        if source.exists():
+            os.replace(source, path.with_name(f"{path.name}.{index + 1}"))
+    os.replace(path, path.with_name(f"{path.name}.1"))
+
+
+def _log_slow_request(sample):
+    path = settings.EQUIPMENT_SLOW_REQUEST_LOG
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(sample) + '\n'
+    max_bytes = settings.EQUIPMENT_SLOW_REQUEST_LOG_MAX_BYTES
+    with _lock:
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if max_bytes and size and size + len(line) > max_bytes:
+            _rotate(path)
+        with open(path, 'a') as log:
+            log.write(line)
+
+
+class InstrumentationMiddleware:
+    """Time every API request and count the SQL it issues.
+
+    Enabled with EQUIPMENT_INSTRUMENTATION. Totals are exposed at
+    /api/metrics/, each response gets a Server-Timing header, and requests
+    slower than EQUIPMENT_SLOW_REQUEST_MS are appended to a JSON-lines log
+    read by ``manage.py slowest_requests``. The log is rotated once it
+    reaches EQUIPMENT_SLOW_REQUEST_LOG_MAX_BYTES, keeping
+    EQUIPMENT_SLOW_REQUEST_LOG_BACKUPS older copies.
+    """
+
+    def __init__(self, get_response):
+        if not settings.EQUIPMENT_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not request.path.startswith('/api/') or request.path == '/api/metrics/':
+            return self.get_response(request)
+
+        request._instrumentation_rows = 0
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        sample = {
+            'timestamp': round(time.time(), 3),
+            'method': request.method,
+            'path': request.get_full_path(),
+            'view': _view_name(request),
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+            'queries': counter.queries,
+            'sql_ms': round(counter.seconds * 1000, 2),
+            'rows': request._instrumentation_rows,
+            'response_bytes': _response_size(response),
+        }
+        with _lock:
+            _metrics[(sample['view'], sample['method'])].observe(sample)
+        if sample['duration_ms'] >= settings.EQUIPMENT_SLOW_REQUEST_MS:
+            _log_slow_request(sample)
+
+        response['Server-Timing'] = _server_timing(sample)
+        return response
+
+
+def _labels(**labels):
+    pairs = ','.join(
+        '{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+        for key, value in labels.items()
+    )
+    return '{' + pairs + '}'
+
+
+def render_metrics():
+    """Render the per-view totals in the Prometheus text exposition format."""
+    with _lock:
+        snapshot = sorted(_metrics.items())
+
+    lines = [
+        '# HELP equipment_request_duration_seconds API request latency by view.',
+        '# TYPE equipment_request_duration_seconds histogram',
+    ]
+    for (view, method), metrics in snapshot:
+        for bound, count in zip(LATENCY_BUCKETS, metrics.buckets):
+            lines.append(f'equipment_request_duration_seconds_bucket{_labels(view=view, method=method, le=bound)} {count}')
+        lines.append(f'equipment_request_duration_seconds_bucket{_labels(view=view, method=method, le="+Inf")} {metrics.count}')
+        lines.append(f'equipment_request_duration_seconds_sum{_labels(view=view, method=method)} {metrics.seconds:.6f}')
+        lines.append(f'equipment_request_duration_seconds_count{_labels(view=view, method=method)} {metrics.count}')
+
+    lines += [
+        '# HELP equipment_requests_total API requests by view and status code.',
+        '# TYPE equipment_requests_total counter',
+    ]
+    for (view, method), metrics in snapshot:
+        for status, count in sorted(metrics.statuses.items()):
+            lines.append(f'equipment_requests_total{_labels(view=view, method=method, status=status)} {count}')
+
+    counters = [
+        ('equipment_sql_queries_total', 'SQL statements issued while serving API requests.', 'queries', '{}'),
+        ('equipment_sql_seconds_total', 'Time spent in SQL while serving API requests.', 'sql_seconds', '{:.6f}'),
+        ('equipment_rows_serialized_total', 'Records serialized into API responses.', 'rows', '{}'),
+        ('equipment_response_bytes_total', 'Bytes sent in API response bodies.', 'response_bytes', '{}'),
+    ]
+    for name, help_text, field, number_format in counters:
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+        for (view, method), metrics in snapshot:
+            lines.append(f'{name}{_labels(view=view, method=method)} {number_format.format(getattr(metrics, field))}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    if not settings.EQUIPMENT_INSTRUMENTATION:
+        raise Http404
+    if request.META.get('REMOTE_ADDR') not in settings.EQUIPMENT_METRICS_ALLOWED_IPS:
+        return HttpResponse('Forbidden\n', status=403, content_type='text/plain')
+    return HttpResponse(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def read_slow_requests(path):
+    samples = []
+    for log_path in slow_request_logs(path):
+        try:
+            with open(log_path) as log:
+                for line in log:
+                    try:
+                        samples.append(json.loads(line))
+                    except ValueError:
+                        continue  # a line cut short by a crash mid-write
+        except FileNotFoundError:
+            pass
+    return samples
@@ -0,0 +1,296 @@
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connection, connections
+from django.utils import timezone
+
+from .ingest import ingest_csv
+from .models import IngestJob
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Live (rows, bytes) progress of jobs running in this process. The ingest
+# transaction keeps its own writes invisible to other connections, so other
+# processes see progress through ProgressWriter's separate connection.
+_progress = {}
+_progress_lock = threading.Lock()
+# Ids of jobs running in this process that were asked to stop
+_cancel_requests = set()
+
+CANCELLED_MESSAGE = "Cancelled by user"
+
+
+class JobCancelled(Exception):
+    """Raised from a job's progress callback to abort and roll back its ingest."""
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def heartbeats_enabled():
+    # SQLite has a single writer: the ingest transaction holds it until the
+    # job ends, so progress can only be kept in this process. Deployments
+    # running several processes use a server database.
+    return connection.vendor != 'sqlite'
+
+
+class ProgressWriter:
+    """Publishes a running job's progress and heartbeat after every chunk.
+
+    Row writes go through a second autocommit connection, so they are
+    visible to status polls served by any process while the ingest
+    transaction is still open. The same connection reads the job's cancel
+    flag; a requested cancel raises JobCancelled.
+    """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.connection = connections.create_connection(DEFAULT_DB_ALIAS) if heartbeats_enabled() else None
+        with _progress_lock:
+            _progress[job_id] = (0, 0)
+
+    def __call__(self, rows, position):
+        with _progress_lock:
+            _progress[self.job_id] = (rows, position)
+            cancelled = self.job_id in _cancel_requests
+        if self.connection is not None:
+            ops = self.connection.ops
+            table, pk = ops.quote_name(IngestJob._meta.db_table), ops.quote_name('id')
+            columns = ', '.join(
+                f'{ops.quote_name(column)} = %s' for column in ('rows_processed', 'bytes_processed', 'heartbeat_at')
+            )
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    f'UPDATE {table} SET {columns} WHERE {pk} = %s',
+                    [rows, position, ops.adapt_datetimefield_value(timezone.now()), self.job_id]
+                )
+                cursor.execute(f'SELECT {ops.quote_name("cancel_requested")} FROM {table} WHERE {pk} = %s', [self.job_id])
+                row = cursor.fetchone()
+                cancelled = cancelled or bool(row and row[0])
+        if cancelled:
+            raise JobCancelled()
+
+    def close(self):
+        with _progress_lock:
+            _progress.pop(self.job_id, None)
+            _cancel_requests.discard(self.job_id)
+        if self.connection is not None:
+            self.connection.close()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.EQUIPMENT_INGEST_WORKERS,
+                thread_name_prefix='ingest'
+            )
+        return _executor
+
+
+def submit_upload(upload):
+    """Store an uploaded file and queue it for background ingestion."""
+    storage = FileSystemStorage(location=settings.EQUIPMENT_INGEST_UPLOAD_DIR)
+    stored_name = storage.save(upload.name, upload)
+    job = IngestJob.objects.create(
+        file_name=upload.name,
+        file_path=storage.path(stored_name),
+        file_size=upload.size or 0
+    )
+    enqueue(job.id)
+    return job
+
+
+def enqueue(job_id):
+    if settings.EQUIPMENT_INGEST_WORKERS > 0:
+        get_executor().submit(_run_in_worker, job_id)
+    else:
+        run_job(job_id)
+
+
+def _run_in_worker(job_id):
+    close_old_connections()
+    try:
+        run_job(job_id)
+    finally:
+        close_old_connections()
+
+
+def run_job(job_id):
+    now = timezone.now()
+    claimed = IngestJob.objects.filter(id=job_id, status='PENDING').update(
+        status='RUNNING',
+        started_at=now,
+        worker=worker_name(),
+        heartbeat_at=now
+    )
+    if not claimed:
+        return
+
+    job = IngestJob.objects.get(id=job_id)
+    progress = ProgressWriter(job_id)
+    try:
+        with open(job.file_path, 'rb') as f:
+            dataset, summary = ingest_csv(f, job.file_name, progress=lambda rows: progress(rows, f.tell()))
+
+        IngestJob.objects.filter(id=job_id).update(
+            status='COMPLETED',
+            dataset=dataset,
+            result=summary,
+            rows_processed=summary['total_records'],
+            bytes_processed=job.file_size,
+            finished_at=timezone.now()
+        )
+    except JobCancelled:
+        logger.info("Ingest job %s cancelled", job_id)
+        rows, position = live_progress(job_id)
+        IngestJob.objects.filter(id=job_id).update(
+            status='CANCELLED',
+            error=CANCELLED_MESSAGE,
+            rows_processed=rows,
+            bytes_processed=position,
+            finished_at=timezone.now()
+        )
+    except Exception as e:
+        logger.exception("Ingest job %s failed", job_id)
+        rows, position = live_progress(job_id)
+        IngestJob.objects.filter(id=job_id).update(
+            status='FAILED',
+            error=str(e),
+            rows_processed=rows,
+            bytes_processed=position,
+            finished_at=timezone.now()
+        )
+    finally:
+        progress.close()
+        _remove_upload(job.file_path)
+
+
+def _remove_upload(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def cancel_job(job):
+    """Cancel a PENDING or RUNNING job and return it refreshed.
+
+    A queued job is cancelled at once. A running one is flagged and stops at
+    its next chunk, rolling back everything it wrote; until then its status
+    stays RUNNING with ``cancel_requested`` set.
+    """
+    cancelled = IngestJob.objects.filter(id=job.id, status='PENDING').update(
+        status='CANCELLED',
+        error=CANCELLED_MESSAGE,
+        finished_at=timezone.now()
+    )
+    if cancelled:
+        _remove_upload(job.file_path)
+    else:
+        with _progress_lock:
+            if job.id in _progress:
+                _cancel_requests.add(job.id)
+        # On SQLite the running ingest holds the only write lock, so the
+        # flag above is all a same-process worker needs
+        if heartbeats_enabled():
+            IngestJob.objects.filter(id=job.id, status='RUNNING').update(cancel_requested=True)
+    job.refresh_from_db()
+    return job
+
+
+def live_progress(job):
+    job_id = getattr(job, 'id', job)
+    with _progress_lock:
+        if job_id in _progress:
+            return _progress[job_id]
+    if isinstance(job, IngestJob):
+        return job.rows_processed, job.bytes_processed
+    return 0, 0
+
+
+def _worker_alive(worker):
+    """Whether the process named by ``worker`` still exists, or None when that cannot be told from here."""
+    host, _, pid = worker.rpartition(':')
+    # os.kill(pid, 0) sends CTRL_C_EVENT on Windows rather than probing
+    if host != socket.gethostname() or not pid.isdigit() or os.name == 'nt':
+        return None
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def is_stale(job):
+    """A RUNNING job whose worker process has died, or has not reported within EQUIPMENT_INGEST_STALE_SECONDS."""
+    if job.status != 'RUNNING':
+        return False
+    if _worker_alive(job.worker) is False:
+        return True
+    if not heartbeats_enabled():
+        return False
+    last_seen = job.heartbeat_at or job.started_at
+    return last_seen is None or timezone.now() - last_seen > timedelta(seconds=settings.EQUIPMENT_INGEST_STALE_SECONDS)
+
+
+def requeue_stale_jobs():
+    """Return stale RUNNING jobs to PENDING so they can be run again; returns how many were requeued."""
+    stale = [job.id for job in IngestJob.objects.filter(status='RUNNING') if is_stale(job)]
+    return IngestJob.objects.filter(id__in=stale, status='RUNNING').update(
+        status='PENDING', started_at=None, worker='', heartbeat_at=None
+    )
+
+
+def job_status(job):
+    """Serialize a job's progress without writing to the database.
+
+    Stale jobs are only flagged; ``process_ingest_jobs --requeue-running``
+    retries them.
+    """
+    rows, position = live_progress(job)
+
+    elapsed = None
+    if job.started_at:
+        elapsed = ((job.finished_at or timezone.now()) - job.started_at).total_seconds()
+
+    rows_per_second = rows / elapsed if elapsed else None
+    eta_seconds = None
+    if job.status == 'RUNNING' and elapsed and position and job.file_size:
+        eta_seconds = elapsed * (job.file_size - position) / position
+    elif job.status == 'COMPLETED':
+        eta_seconds = 0
+
+    return {
+        'job_id': job.id,
+        'status': job.status,
+        'file_name': job.file_name,
+        'rows_processed': rows,
+        'bytes_processed': position,
+        'total_bytes': job.file_size,
+        'progress': min(position / job.file_size, 1.0) if job.file_size else None,
+        'rows_per_second': rows_per_second,
+        'eta_seconds': eta_seconds,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+        'dataset_id': job.dataset_id,
+        'result': job.result,
+        'error': job.error,
+        'cancel_requested': job.cancel_requested or job.id in _cancel_requests,
+        # The worker died or stopped reporting; nothing it wrote was committed
+        'stale': is_stale(job)
+    }
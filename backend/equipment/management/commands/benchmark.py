@@ -0,0 +1,104 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from equipment.benchmark import compare_results, environment, generate_csv, run_size
+
+SIZE_SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+
+
+def parse_size(value):
+    value = value.strip().lower()
+    if value[-1:] in SIZE_SUFFIXES:
+        return int(float(value[:-1]) * SIZE_SUFFIXES[value[-1]])
+    return int(value)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark ingest and read endpoints on synthetic CSVs against a throwaway "
+        "SQLite test database, optionally comparing with a stored baseline"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1k,100k,1m', help="Comma-separated row counts, e.g. 1k,100k,1m")
+        parser.add_argument('--out-of-range-rate', type=float, default=0.05,
+                            help="Fraction of rows with flowrate or pressure outside alert thresholds")
+        parser.add_argument('--equipment', type=int, default=1000, help="Distinct equipment names per CSV")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', default='benchmark_results.json', help="Where to write the JSON report")
+        parser.add_argument('--compare', help="Baseline JSON report to check for regressions")
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help="Allowed relative slowdown before a scenario is flagged")
+
+    def handle(self, *args, **options):
+        sizes = [parse_size(size) for size in options['sizes'].split(',') if size.strip()]
+        baseline = None
+        if options['compare']:
+            baseline = json.loads(Path(options['compare']).read_text())
+
+        with tempfile.TemporaryDirectory(prefix='equipment-bench-') as workdir:
+            workdir = Path(workdir)
+            report = {
+                'created_at': timezone.now().isoformat(),
+                'config': {
+                    'sizes': sizes,
+                    'out_of_range_rate': options['out_of_range_rate'],
+                    'equipment': options['equipment'],
+                    'seed': options['seed'],
+                },
+                'results': [],
+            }
+
+            setup_test_environment()
+            if connection.vendor == 'sqlite':
+                # File-backed so timings reflect disk writes, unlike the default in-memory test DB
+                connection.settings_dict['TEST']['NAME'] = str(workdir / 'benchmark.sqlite3')
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+            try:
+                with override_settings(
+                    EQUIPMENT_REPORT_WORKERS=0,
+                    EQUIPMENT_REPORT_DIR=workdir / 'reports',
+                ):
+                    report['environment'] = environment()
+                    client = Client()
+                    for rows in sizes:
+                        self.stdout.write(f"Generating {rows:,} rows...")
+                        csv_path = generate_csv(
+                            workdir / f'equipment_{rows}.csv', rows,
+                            out_of_range_rate=options['out_of_range_rate'],
+                            equipment=options['equipment'],
+                            seed=options['seed'],
+                        )
+                        for result in run_size(client, csv_path, rows, options['equipment']):
+                            report['results'].append(result)
+                            self.stdout.write(
+                                f"  {result['scenario']:<28} {result['wall_seconds']:>9.3f}s "
+                                f"{result['queries']:>7} queries  status {result['status_code']}"
+                            )
+                        csv_path.unlink()
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                teardown_test_environment()
+
+        if baseline is not None:
+            report['regressions'] = compare_results(report, baseline, options['threshold'])
+
+        Path(options['output']).write_text(json.dumps(report, indent=2))
+        self.stdout.write(f"Wrote {options['output']}")
+
+        if baseline is not None:
+            if report['regressions']:
+                for regression in report['regressions']:
+                    self.stdout.write(self.style.ERROR(
+                        f"REGRESSION {regression['scenario']} @ {regression['rows']:,} rows: "
+                        f"{regression['metric']} {regression['baseline']} -> {regression['current']}"
+                    ))
+                raise CommandError(f"{len(report['regressions'])} regression(s) against {options['compare']}")
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline"))
@@ -0,0 +1,44 @@
+from itertools import islice
+
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from equipment import columnar
+from equipment.models import Dataset, EquipmentParameter
+
+
+class Command(BaseCommand):
+    help = "Write the Parquet copy of datasets uploaded before the columnar store was enabled"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dataset', type=int, action='append', help="Only this dataset id (repeatable)")
+        parser.add_argument('--force', action='store_true', help="Rewrite datasets that already have a copy")
+
+    def handle(self, *args, **options):
+        if columnar.pq is None:
+            raise CommandError("pyarrow is not installed")
+
+        datasets = Dataset.objects.order_by('id')
+        if options['dataset']:
+            datasets = datasets.filter(id__in=options['dataset'])
+
+        written = 0
+        for dataset in datasets:
+            if columnar.has_dataset(dataset.id) and not options['force']:
+                continue
+            rows = (
+                EquipmentParameter.objects.filter(dataset=dataset).order_by('id')
+                .values_list(*columnar.COLUMNS).iterator(chunk_size=columnar.BATCH_SIZE)
+            )
+            store = columnar.ColumnarWriter(dataset.id)
+            try:
+                while batch := list(islice(rows, columnar.BATCH_SIZE)):
+                    store.write(pd.DataFrame(batch, columns=columnar.COLUMNS))
+                store.commit()
+            except BaseException:
+                store.discard()
+                raise
+            written += 1
+            self.stdout.write(f"Dataset {dataset.id}: {dataset.total_records} rows")
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} columnar dataset(s)"))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from equipment.jobs import requeue_stale_jobs, run_job
+from equipment.models import IngestJob
+
+
+class Command(BaseCommand):
+    help = "Run queued CSV ingest jobs, e.g. ones left pending by a restarted server"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requeue-running',
+            action='store_true',
+            help="Also retry RUNNING jobs whose worker has died or stopped reporting"
+        )
+
+    def handle(self, *args, **options):
+        if options['requeue_running']:
+            self.stdout.write(f"Requeued {requeue_stale_jobs()} stale job(s)")
+
+        job_ids = list(IngestJob.objects.filter(status='PENDING').order_by('created_at').values_list('id', flat=True))
+        for job_id in job_ids:
+            run_job(job_id)
+            job = IngestJob.objects.get(id=job_id)
+            self.stdout.write(f"Job {job.id} ({job.file_name}): {job.status}")
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {len(job_ids)} job(s)"))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from equipment.models import ParameterRollup
+from equipment.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the hourly, daily and weekly trend rollups from stored readings"
+
+    def handle(self, *args, **options):
+        rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {ParameterRollup.objects.count()} rollup rows"))
@@ -0,0 +1,48 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from equipment.instrumentation import read_slow_requests, slow_request_logs
+
+
+class Command(BaseCommand):
+    help = "List the slowest API requests recorded by the instrumentation middleware"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--view', help="Only requests to this route, e.g. api/trends/")
+        parser.add_argument('--since', type=float, help="Only requests from the last N minutes")
+        parser.add_argument('--sort', choices=['duration_ms', 'queries', 'sql_ms', 'rows', 'response_bytes'],
+                            default='duration_ms')
+        parser.add_argument('--json', action='store_true', help="Print the samples as JSON")
+        parser.add_argument('--clear', action='store_true', help="Truncate the log after printing")
+
+    def handle(self, *args, **options):
+        path = settings.EQUIPMENT_SLOW_REQUEST_LOG
+        samples = read_slow_requests(path)
+        if options['view']:
+            samples = [s for s in samples if s['view'] == options['view']]
+        if options['since']:
+            cutoff = time.time() - options['since'] * 60
+            samples = [s for s in samples if s['timestamp'] >= cutoff]
+        samples = sorted(samples, key=lambda s: s[options['sort']], reverse=True)[:options['limit']]
+
+        if options['json']:
+            self.stdout.write(json.dumps(samples, indent=2))
+        elif not samples:
+            self.stdout.write(f"No slow requests recorded in {path}")
+        else:
+            self.stdout.write(f"{'ms':>10} {'sql ms':>9} {'queries':>8} {'rows':>8} {'bytes':>10} {'status':>6}  request")
+            for s in samples:
+                self.stdout.write(
+                    f"{s['duration_ms']:>10.1f} {s['sql_ms']:>9.1f} {s['queries']:>8} {s['rows']:>8} "
+                    f"{s['response_bytes']:>10} {s['status']:>6}  {s['method']} {s['path']}"
+                )
+
+        if options['clear'] and path.exists():
+            for log_path in slow_request_logs(path)[:-1]:
+                log_path.unlink()
+            path.write_text('')
+            self.stdout.write(self.style.SUCCESS(f"Cleared {path}"))
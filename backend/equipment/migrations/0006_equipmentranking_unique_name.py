@@ -0,0 +1,43 @@
+# Generated by Django 5.0.1 on 2026-10-17 05:55
+
+from django.db import migrations, models
+
+
+def dedupe_rankings(apps, schema_editor):
+    # Rankings used to hold one row per reading; keep the newest row per
+    # equipment and renumber so the unique constraint can be applied.
+    EquipmentRanking = apps.get_model('equipment', 'EquipmentRanking')
+    seen = set()
+    stale = []
+    for pk, name in EquipmentRanking.objects.order_by('-id').values_list('id', 'equipment_name'):
+        if name in seen:
+            stale.append(pk)
+        else:
+            seen.add(name)
+    for start in range(0, len(stale), 500):
+        EquipmentRanking.objects.filter(id__in=stale[start:start + 500]).delete()
+
+    rankings = list(EquipmentRanking.objects.order_by('-overall_score', 'id'))
+    for rank, ranking in enumerate(rankings, start=1):
+        ranking.efficiency_rank = ranking.reliability_rank = ranking.performance_rank = rank
+    EquipmentRanking.objects.bulk_update(
+        rankings,
+        ['efficiency_rank', 'reliability_rank', 'performance_rank'],
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0005_ingestjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_rankings, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='equipmentranking',
+            name='equipment_name',
+            field=models.CharField(max_length=100, unique=True),
+        ),
+    ]
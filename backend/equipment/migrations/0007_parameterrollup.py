@@ -0,0 +1,39 @@
+# Generated by Django 5.0.1 on 2026-10-17 05:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0006_equipmentranking_unique_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParameterRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('HOUR', 'Hourly'), ('DAY', 'Daily'), ('WEEK', 'Weekly')], max_length=10)),
+                ('bucket_start', models.DateTimeField()),
+                ('equipment_type', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+                ('flowrate_count', models.IntegerField(default=0)),
+                ('flowrate_sum', models.FloatField(default=0)),
+                ('flowrate_min', models.FloatField(blank=True, null=True)),
+                ('flowrate_max', models.FloatField(blank=True, null=True)),
+                ('pressure_count', models.IntegerField(default=0)),
+                ('pressure_sum', models.FloatField(default=0)),
+                ('pressure_min', models.FloatField(blank=True, null=True)),
+                ('pressure_max', models.FloatField(blank=True, null=True)),
+                ('temperature_count', models.IntegerField(default=0)),
+                ('temperature_sum', models.FloatField(default=0)),
+                ('temperature_min', models.FloatField(blank=True, null=True)),
+                ('temperature_max', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['bucket_start'],
+                'unique_together': {('granularity', 'bucket_start', 'equipment_type')},
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import Coalesce, TruncDay, TruncHour, TruncWeek
+
+# Frozen copy of the rollup rebuild as of this migration, so later changes
+# to equipment.rollups cannot change what it does
+FIELDS = ['flowrate', 'pressure', 'temperature']
+
+GRANULARITY_TRUNC = {'HOUR': TruncHour, 'DAY': TruncDay, 'WEEK': TruncWeek}
+
+
+def backfill(apps, schema_editor):
+    EquipmentParameter = apps.get_model('equipment', 'EquipmentParameter')
+    ParameterRollup = apps.get_model('equipment', 'ParameterRollup')
+
+    ParameterRollup.objects.all().delete()
+    for granularity, trunc in GRANULARITY_TRUNC.items():
+        aggregates = {'count': Count('id')}
+        for field in FIELDS:
+            aggregates.update({
+                f'{field}_count': Count(field),
+                f'{field}_sum': Coalesce(Sum(field), 0.0),
+                f'{field}_min': Min(field),
+                f'{field}_max': Max(field),
+            })
+        buckets = (
+            EquipmentParameter.objects
+            .annotate(bucket=trunc('recorded_at'))
+            .values('bucket', 'equipment_type')
+            .annotate(**aggregates)
+            .order_by()
+        )
+        ParameterRollup.objects.bulk_create(
+            (ParameterRollup(granularity=granularity, bucket_start=row.pop('bucket'), **row) for row in buckets),
+            batch_size=500
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0007_parameterrollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
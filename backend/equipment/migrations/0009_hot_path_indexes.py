@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-17 05:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0008_backfill_parameter_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dataset',
+            index=models.Index(fields=['-uploaded_at'], name='dataset_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentalert',
+            index=models.Index(condition=models.Q(('resolved', False)), fields=['-created_at'], name='alert_open_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentalert',
+            index=models.Index(condition=models.Q(('resolved', True)), fields=['-created_at'], name='alert_resolved_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentparameter',
+            index=models.Index(fields=['dataset', 'equipment_name'], name='param_dataset_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenanceschedule',
+            index=models.Index(fields=['status', 'scheduled_date'], name='maint_status_date_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.1 on 2026-10-17 06:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0010_datageneration'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('equipment_type', models.CharField(blank=True, default='', max_length=50)),
+                ('parameter', models.CharField(choices=[('Flowrate', 'Flowrate'), ('Pressure', 'Pressure'), ('Temperature', 'Temperature')], max_length=50)),
+                ('severity', models.CharField(choices=[('CRITICAL', 'Critical'), ('WARNING', 'Warning'), ('INFO', 'Info')], max_length=20)),
+                ('min_value', models.FloatField(blank=True, null=True)),
+                ('max_value', models.FloatField(blank=True, null=True)),
+                ('recommendation', models.TextField(blank=True, default='')),
+                ('enabled', models.BooleanField(default=True)),
+            ],
+            options={
+                'ordering': ['parameter', 'equipment_type', 'severity'],
+                'unique_together': {('equipment_type', 'parameter', 'severity')},
+            },
+        ),
+    ]
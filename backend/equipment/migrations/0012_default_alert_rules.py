@@ -0,0 +1,29 @@
+from django.db import migrations
+
+# The flowrate and pressure limits that used to be hard-coded in ingest,
+# plus temperature bands around the health-score acceptable range
+DEFAULT_RULES = [
+    ('Flowrate', 'CRITICAL', 50, 150, "Immediate inspection required"),
+    ('Pressure', 'CRITICAL', 3.5, 8.5, "Check pressure regulators immediately"),
+    ('Temperature', 'CRITICAL', 80, 160, "Shut down and inspect cooling immediately"),
+    ('Temperature', 'WARNING', 90, 150, "Check cooling and heat exchange performance"),
+]
+
+
+def seed_rules(apps, schema_editor):
+    AlertRule = apps.get_model('equipment', 'AlertRule')
+    AlertRule.objects.bulk_create([
+        AlertRule(parameter=parameter, severity=severity, min_value=low, max_value=high, recommendation=recommendation)
+        for parameter, severity, low, high, recommendation in DEFAULT_RULES
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0011_alertrule'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_rules, migrations.RunPython.noop),
+    ]
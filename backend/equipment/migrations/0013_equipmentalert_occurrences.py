@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-17 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0012_default_alert_rules'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipmentalert',
+            name='last_seen_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='equipmentalert',
+            name='occurrence_count',
+            field=models.IntegerField(default=1),
+        ),
+    ]
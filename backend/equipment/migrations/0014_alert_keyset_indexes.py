@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-17 06:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0013_equipmentalert_occurrences'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='equipmentalert',
+            name='alert_open_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='equipmentalert',
+            name='alert_resolved_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='equipmentalert',
+            index=models.Index(condition=models.Q(('resolved', False)), fields=['-created_at', '-id'], name='alert_open_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentalert',
+            index=models.Index(condition=models.Q(('resolved', True)), fields=['-created_at', '-id'], name='alert_resolved_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentalert',
+            index=models.Index(fields=['equipment_name', '-created_at', '-id'], name='alert_equipment_created_idx'),
+        ),
+    ]
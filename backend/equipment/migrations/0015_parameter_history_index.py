@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-17 06:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0014_alert_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipmentparameter',
+            index=models.Index(fields=['equipment_name', 'recorded_at'], name='param_name_recorded_idx'),
+        ),
+    ]
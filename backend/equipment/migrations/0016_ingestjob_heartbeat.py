@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-17 06:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0015_parameter_history_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingestjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='ingestjob',
+            name='worker',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-17 06:47
+
+from django.db import migrations, models
+
+
+def rank_fleet(apps, schema_editor):
+    """Write every rank position once; ingest then only re-ranks the score band it changes."""
+    EquipmentRanking = apps.get_model('equipment', 'EquipmentRanking')
+    rankings = list(EquipmentRanking.objects.order_by('-overall_score', 'id'))
+    for position, ranking in enumerate(rankings, start=1):
+        ranking.efficiency_rank = ranking.reliability_rank = ranking.performance_rank = position
+    EquipmentRanking.objects.bulk_update(
+        rankings, ['efficiency_rank', 'reliability_rank', 'performance_rank'], batch_size=2000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0016_ingestjob_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipmentranking',
+            index=models.Index(fields=['-overall_score', 'id'], name='ranking_score_idx'),
+        ),
+        migrations.RunPython(rank_fleet, migrations.RunPython.noop),
+    ]
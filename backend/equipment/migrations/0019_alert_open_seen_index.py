@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-17 06:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0018_ingestjob_cancel'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipmentalert',
+            index=models.Index(condition=models.Q(('resolved', False)), fields=['-last_seen_at'], name='alert_open_seen_idx'),
+        ),
+    ]
@@ -17,6 +17,9 @@ class Dataset(models.Model):
     
     class Meta:
         ordering = ['-uploaded_at']
+        indexes = [
+            models.Index(fields=['-uploaded_at'], name='dataset_uploaded_idx'),
+        ]
 
 
 class EquipmentAlert(models.Model):
@@ -40,12 +43,24 @@ class EquipmentAlert(models.Model):
     resolved_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     predicted_failure_date = models.DateField(null=True, blank=True)
     confidence_score = models.FloatField(null=True, blank=True)
+    occurrence_count = models.IntegerField(default=1)
+    last_seen_at = models.DateTimeField(null=True, blank=True)
     
     def __str__(self):
         return f"{self.alert_type} - {self.equipment_name} - {self.parameter}"
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Partial pair rather than (resolved, created_at): SQLite renders boolean
+            # filters as bare `WHERE resolved`, which only a matching partial index serves
+            # id is included so keyset pages on (created_at, id) seek straight to the cursor
+            models.Index(fields=['-created_at', '-id'], name='alert_open_created_idx', condition=models.Q(resolved=False)),
+            models.Index(fields=['-created_at', '-id'], name='alert_resolved_created_idx', condition=models.Q(resolved=True)),
+            models.Index(fields=['equipment_name', '-created_at', '-id'], name='alert_equipment_created_idx'),
+            # Live polls for open alerts raised, repeated or escalated since the last poll
+            models.Index(fields=['-last_seen_at'], name='alert_open_seen_idx', condition=models.Q(resolved=False)),
+        ]
 
 
 class MaintenanceSchedule(models.Model):
@@ -82,6 +97,9 @@ class MaintenanceSchedule(models.Model):
     
     class Meta:
         ordering = ['scheduled_date', '-priority']
+        indexes = [
+            models.Index(fields=['status', 'scheduled_date'], name='maint_status_date_idx'),
+        ]
 
 
 class EquipmentParameter(models.Model):
@@ -100,6 +118,10 @@ class EquipmentParameter(models.Model):
     
     class Meta:
         ordering = ['-recorded_at']
+        indexes = [
+            models.Index(fields=['dataset', 'equipment_name'], name='param_dataset_name_idx'),
+            models.Index(fields=['equipment_name', 'recorded_at'], name='param_name_recorded_idx'),
+        ]
 
 
 class SystemNotification(models.Model):
@@ -170,7 +192,7 @@ class EmailReportSchedule(models.Model):
 
 
 class EquipmentRanking(models.Model):
-    equipment_name = models.CharField(max_length=100)
+    equipment_name = models.CharField(max_length=100, unique=True)
     equipment_type = models.CharField(max_length=50)
     overall_score = models.FloatField()
     efficiency_rank = models.IntegerField()
@@ -182,4 +204,117 @@ class EquipmentRanking(models.Model):
         return f"{self.equipment_name} - Score: {self.overall_score}"
     
     class Meta:
-        ordering = ['-overall_score']
\ No newline at end of file
+        ordering = ['-overall_score']
+        indexes = [
+            # Rank order; incremental re-ranks count and read score bands through it
+            models.Index(fields=['-overall_score', 'id'], name='ranking_score_idx'),
+        ]
+
+
+class IngestJob(models.Model):
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+        ('CANCELLED', 'Cancelled'),
+    ]
+
+    file_name = models.CharField(max_length=255)
+    file_path = models.CharField(max_length=500)
+    file_size = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    rows_processed = models.IntegerField(default=0)
+    bytes_processed = models.BigIntegerField(default=0)
+    dataset = models.ForeignKey(Dataset, on_delete=models.SET_NULL, null=True, blank=True, related_name='ingest_jobs')
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # host:pid of the process running the job, and when it last reported progress
+    worker = models.CharField(max_length=255, blank=True, default='')
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    # Set on a RUNNING job by the cancel endpoint; the worker rolls back at its next chunk
+    cancel_requested = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f"Ingest {self.id} - {self.file_name} ({self.status})"
+
+    class Meta:
+        ordering = ['-created_at']
+
+
+class ParameterRollup(models.Model):
+    GRANULARITIES = [
+        ('HOUR', 'Hourly'),
+        ('DAY', 'Daily'),
+        ('WEEK', 'Weekly'),
+    ]
+
+    granularity = models.CharField(max_length=10, choices=GRANULARITIES)
+    bucket_start = models.DateTimeField()
+    equipment_type = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+    flowrate_count = models.IntegerField(default=0)
+    flowrate_sum = models.FloatField(default=0)
+    flowrate_min = models.FloatField(null=True, blank=True)
+    flowrate_max = models.FloatField(null=True, blank=True)
+    pressure_count = models.IntegerField(default=0)
+    pressure_sum = models.FloatField(default=0)
+    pressure_min = models.FloatField(null=True, blank=True)
+    pressure_max = models.FloatField(null=True, blank=True)
+    temperature_count = models.IntegerField(default=0)
+    temperature_sum = models.FloatField(default=0)
+    temperature_min = models.FloatField(null=True, blank=True)
+    temperature_max = models.FloatField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.granularity} {self.bucket_start} - {self.equipment_type}"
+
+    class Meta:
+        ordering = ['bucket_start']
+        unique_together = ['granularity', 'bucket_start', 'equipment_type']
+
+
+class DataGeneration(models.Model):
+    """Single-row counter bumped whenever data behind the cached read endpoints changes."""
+    generation = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Generation {self.generation} - {self.updated_at}"
+
+
+class AlertRule(models.Model):
+    """Threshold band raising an alert when a reading falls below min_value or above max_value.
+
+    A blank equipment_type applies to every type that has no rule of its own
+    for the same parameter and severity.
+    """
+    PARAMETERS = [
+        ('Flowrate', 'Flowrate'),
+        ('Pressure', 'Pressure'),
+        ('Temperature', 'Temperature'),
+    ]
+
+    SEVERITIES = [
+        ('CRITICAL', 'Critical'),
+        ('WARNING', 'Warning'),
+        ('INFO', 'Info'),
+    ]
+
+    equipment_type = models.CharField(max_length=50, blank=True, default='')
+    parameter = models.CharField(max_length=50, choices=PARAMETERS)
+    severity = models.CharField(max_length=20, choices=SEVERITIES)
+    min_value = models.FloatField(null=True, blank=True)
+    max_value = models.FloatField(null=True, blank=True)
+    recommendation = models.TextField(blank=True, default='')
+    enabled = models.BooleanField(default=True)
+
+    def __str__(self):
+        return f"{self.severity} {self.parameter} ({self.equipment_type or 'all types'})"
+
+    class Meta:
+        ordering = ['parameter', 'equipment_type', 'severity']
+        unique_together = ['equipment_type', 'parameter', 'severity']
@@ -0,0 +1,50 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(moment, pk):
+    return base64.urlsafe_b64encode(f"{moment.isoformat()}|{pk}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        moment, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(moment), int(pk)
+    except ValueError as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def after_cursor(queryset, field, cursor=None):
+    """Order ``queryset`` newest first by (``field``, id) and skip past ``cursor``.
+
+    The cursor condition is written as ``field <= c AND (field < c OR id < i)``
+    so the leading term is a plain range seek on a (field, id) index, making
+    deep pages as cheap as the first.
+    """
+    queryset = queryset.order_by(f'-{field}', '-id')
+    if cursor:
+        moment, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(**{f'{field}__lte': moment}) & (Q(**{f'{field}__lt': moment}) | Q(id__lt=pk))
+        )
+    return queryset
+
+
+def keyset_page(queryset, field, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """Return one page of a ``.values()`` queryset and the cursor of the next page, if any."""
+    rows = list(after_cursor(queryset, field, cursor)[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last[field], last['id'])
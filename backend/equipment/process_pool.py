@@ -0,0 +1,37 @@
+# Kept free of model imports: spawned workers unpickle _init_worker from this
+# module before Django is set up.
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _init_worker():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
+    django.setup()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawned rather than forked: the server process has live threads and DB connections
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.EQUIPMENT_BATCH_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker
+            )
+        return _executor
+
+
+def reset_executor():
+    """Drop a broken pool so the next call starts fresh workers."""
+    global _executor
+    with _executor_lock:
+        _executor = None
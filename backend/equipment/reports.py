@@ -0,0 +1,282 @@
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Avg, Count
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import Image, PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from .cache import get_generation
+from .models import EquipmentAlert, EquipmentParameter, MaintenanceSchedule
+from .rollups import get_rollup_trends
+
+HEALTH_TABLE_SIZE = 10
+ALERT_TABLE_SIZE = 25
+MAINTENANCE_TABLE_SIZE = 20
+TREND_DAYS = 30
+
+_executor = None
+_lock = threading.Lock()
+_pending = {}
+
+
+def _styled_table(data, col_widths):
+    table = Table(data, colWidths=col_widths, repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    return table
+
+
+def _trend_chart(trends):
+    figure = Figure(figsize=(7.5, 6), facecolor='white')
+    FigureCanvasAgg(figure)
+    series = [
+        ('flowrate', 'Flowrate (L/min)', '#4facfe'),
+        ('pressure', 'Pressure (bar)', '#f5a623'),
+        ('temperature', 'Temperature (°C)', '#fa709a'),
+    ]
+    positions = list(range(len(trends['dates'])))
+    axes = figure.subplots(len(series), 1, sharex=True)
+    for ax, (field, label, color) in zip(axes, series):
+        means = [value if value is not None else float('nan') for value in trends[field]]
+        lows = [value if value is not None else float('nan') for value in trends[f'{field}_min']]
+        highs = [value if value is not None else float('nan') for value in trends[f'{field}_max']]
+        ax.fill_between(positions, lows, highs, color=color, alpha=0.2, linewidth=0)
+        ax.plot(positions, means, marker='o', color=color, linewidth=2)
+        ax.set_ylabel(label, fontsize=8)
+        ax.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.tick_params(labelsize=7)
+    axes[-1].set_xticks(positions)
+    axes[-1].set_xticklabels(trends['dates'], rotation=45, ha='right')
+    figure.suptitle(f'Daily mean with min/max band (last {TREND_DAYS} days)', fontsize=10, fontweight='bold')
+    figure.tight_layout()
+
+    image = BytesIO()
+    figure.savefig(image, format='png', dpi=120)
+    image.seek(0)
+    return Image(image, width=7 * inch, height=5.6 * inch)
+
+
+def build_report(dataset):
+    """Render the multi-page PDF report for a dataset and return its bytes."""
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    story = []
+    styles = getSampleStyleSheet()
+    cell_style = ParagraphStyle('Cell', parent=styles['Normal'], fontSize=8, leading=10)
+
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#667eea'),
+        spaceAfter=30,
+        alignment=1
+    )
+
+    story.append(Paragraph("Chemical Equipment Analysis Report", title_style))
+    story.append(Paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
+    story.append(Paragraph(
+        f"Dataset {dataset.id}: {escape(dataset.file_name or 'unnamed upload')}, "
+        f"uploaded {dataset.uploaded_at.strftime('%Y-%m-%d %H:%M')}",
+        styles['Normal']
+    ))
+    story.append(Spacer(1, 0.3*inch))
+
+    story.append(_styled_table([
+        ['Metric', 'Value'],
+        ['Total Records', str(dataset.total_records)],
+        ['Average Flowrate', f'{dataset.avg_flowrate:.2f} L/min'],
+        ['Average Pressure', f'{dataset.avg_pressure:.2f} bar'],
+        ['Average Temperature', f'{dataset.avg_temperature:.2f}°C'],
+    ], [3*inch, 3*inch]))
+
+    parameters = EquipmentParameter.objects.filter(dataset=dataset)
+
+    by_type = (
+        parameters.values('equipment_type')
+        .annotate(
+            count=Count('id'),
+            flowrate=Avg('flowrate'),
+            pressure=Avg('pressure'),
+            temperature=Avg('temperature'),
+            health=Avg('health_score')
+        )
+        .order_by('equipment_type')
+    )
+    story.append(Spacer(1, 0.3*inch))
+    story.append(Paragraph("Statistics by Equipment Type", styles['Heading2']))
+    story.append(_styled_table(
+        [['Type', 'Count', 'Flowrate', 'Pressure', 'Temperature', 'Health']] + [
+            [
+                row['equipment_type'], str(row['count']), f"{row['flowrate']:.2f}",
+                f"{row['pressure']:.2f}", f"{row['temperature']:.2f}", f"{row['health'] or 0:.1f}"
+            ]
+            for row in by_type
+        ],
+        [1.6*inch, 0.8*inch, 1*inch, 1*inch, 1.1*inch, 0.9*inch]
+    ))
+
+    trends = get_rollup_trends('DAY', TREND_DAYS)
+    if trends['dates']:
+        story.append(PageBreak())
+        story.append(Paragraph("Parameter Trends", styles['Heading2']))
+        story.append(_trend_chart(trends))
+
+    story.append(PageBreak())
+    health_columns = ('equipment_name', 'equipment_type', 'health_score', 'flowrate', 'pressure', 'temperature')
+    for heading, ordering in (('Top Equipment by Health Score', '-health_score'),
+                              ('Bottom Equipment by Health Score', 'health_score')):
+        rows = parameters.order_by(ordering, 'id').values_list(*health_columns)[:HEALTH_TABLE_SIZE]
+        story.append(Paragraph(heading, styles['Heading2']))
+        story.append(_styled_table(
+            [['Equipment', 'Type', 'Health', 'Flowrate', 'Pressure', 'Temperature']] + [
+                [name, eq_type, f"{health or 0:.1f}", f"{flowrate:.2f}", f"{pressure:.2f}", f"{temperature:.2f}"]
+                for name, eq_type, health, flowrate, pressure, temperature in rows
+            ],
+            [1.6*inch, 1.2*inch, 0.8*inch, 1*inch, 1*inch, 1.1*inch]
+        ))
+        story.append(Spacer(1, 0.3*inch))
+
+    alerts = EquipmentAlert.objects.filter(resolved=False).order_by('-created_at').values_list(
+        'created_at', 'equipment_name', 'alert_type', 'parameter', 'message'
+    )[:ALERT_TABLE_SIZE]
+    story.append(Paragraph("Open Alerts", styles['Heading2']))
+    story.append(_styled_table(
+        [['Created', 'Equipment', 'Type', 'Parameter', 'Message']] + [
+            [created.strftime('%Y-%m-%d %H:%M'), name, alert_type, parameter, Paragraph(escape(message), cell_style)]
+            for created, name, alert_type, parameter, message in alerts
+        ],
+        [1.2*inch, 1.3*inch, 0.9*inch, 0.9*inch, 2.6*inch]
+    ))
+    story.append(Spacer(1, 0.3*inch))
+
+    schedules = MaintenanceSchedule.objects.filter(
+        status__in=['SCHEDULED', 'IN_PROGRESS']
+    ).order_by('scheduled_date').values_list(
+        'scheduled_date', 'equipment_name', 'priority', 'status', 'description'
+    )[:MAINTENANCE_TABLE_SIZE]
+    story.append(Paragraph("Upcoming Maintenance", styles['Heading2']))
+    story.append(_styled_table(
+        [['Date', 'Equipment', 'Priority', 'Status', 'Description']] + [
+            [str(scheduled), name, priority, status, Paragraph(escape(description), cell_style)]
+            for scheduled, name, priority, status, description in schedules
+        ],
+        [0.9*inch, 1.3*inch, 0.8*inch, 1*inch, 2.9*inch]
+    ))
+
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def report_path(dataset_id, generation):
+    return Path(settings.EQUIPMENT_REPORT_DIR) / f"report_{dataset_id}_{generation}.pdf"
+
+
+def _write_report(dataset, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    content = build_report(dataset)
+    # A unique temporary name per render, so concurrent builds never share a partial file
+    partial = tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.stem}.", suffix='.tmp', delete=False)
+    try:
+        with partial:
+            partial.write(content)
+        os.replace(partial.name, path)
+    except BaseException:
+        os.unlink(partial.name)
+        raise
+
+    # Reports for older generations of this dataset can never be served again
+    for stale in path.parent.glob(f"report_{dataset.id}_*.pdf"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+
+
+def _build_in_worker(dataset, path):
+    close_old_connections()
+    try:
+        _write_report(dataset, path)
+    finally:
+        close_old_connections()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(settings.EQUIPMENT_REPORT_WORKERS, 1),
+            thread_name_prefix='report'
+        )
+    return _executor
+
+
+def _completed(path):
+    future = Future()
+    future.set_result(path)
+    return future
+
+
+def schedule_report(dataset):
+    """Start rendering the current report for a dataset unless it exists or is underway."""
+    path = report_path(dataset.id, get_generation().generation)
+    with _lock:
+        if path.exists():
+            return path, _completed(path)
+        future = _pending.get(path)
+        if future is not None:
+            return path, future
+        if settings.EQUIPMENT_REPORT_WORKERS > 0:
+            future = _get_executor().submit(_build_in_worker, dataset, path)
+            _pending[path] = future
+
+    if future is None:
+        _write_report(dataset, path)
+        return path, _completed(path)
+
+    future.add_done_callback(lambda _: _forget(path))
+    return path, future
+
+
+def _forget(path):
+    with _lock:
+        _pending.pop(path, None)
+
+
+def get_report(dataset, timeout):
+    """Return the cached report path, waiting up to ``timeout`` seconds for a build.
+
+    Returns None if the report is still rendering in the background. A
+    ``timeout`` of None waits for the build to finish.
+    """
+    path, future = schedule_report(dataset)
+    if path.exists():
+        return path
+    try:
+        future.result(timeout=timeout)
+    except TimeoutError:
+        return None
+    return path
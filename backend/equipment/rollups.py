@@ -0,0 +1,167 @@
+from datetime import timedelta
+
+from django.db.models import Count, F, FloatField, Max, Min, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least, TruncDay, TruncHour, TruncWeek
+from django.utils import timezone
+
+from .models import EquipmentParameter, ParameterRollup
+
+PARAMETERS = {'Flowrate': 'flowrate', 'Pressure': 'pressure', 'Temperature': 'temperature'}
+
+GRANULARITY_TRUNC = {'HOUR': TruncHour, 'DAY': TruncDay, 'WEEK': TruncWeek}
+
+GRANULARITY_FORMAT = {'HOUR': '%Y-%m-%d %H:00', 'DAY': '%Y-%m-%d', 'WEEK': '%Y-%m-%d'}
+
+
+def bucket_start(moment, granularity):
+    start = moment.replace(minute=0, second=0, microsecond=0)
+    if granularity in ('DAY', 'WEEK'):
+        start = start.replace(hour=0)
+    if granularity == 'WEEK':
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+class RollupAccumulator:
+    """Per-type count/sum/min/max of each parameter, merged chunk by chunk."""
+
+    def __init__(self):
+        self.types = {}
+
+    def add(self, chunk):
+        grouped = chunk.groupby('Type')
+        for column, field in PARAMETERS.items():
+            stats = grouped[column].agg(['count', 'sum', 'min', 'max'])
+            for eq_type, (count, total, low, high) in stats.iterrows():
+                self.types.setdefault(eq_type, {'count': 0})
+                if count:
+                    self._fold(eq_type, field, int(count), float(total), float(low), float(high))
+        for eq_type, count in grouped.size().items():
+            self.types[eq_type]['count'] += int(count)
+
+    def merge(self, other):
+        for eq_type, other_entry in other.types.items():
+            entry = self.types.setdefault(eq_type, {'count': 0})
+            entry['count'] += other_entry['count']
+            for field in PARAMETERS.values():
+                if f'{field}_count' in other_entry:
+                    self._fold(
+                        eq_type, field,
+                        other_entry[f'{field}_count'], other_entry[f'{field}_sum'],
+                        other_entry[f'{field}_min'], other_entry[f'{field}_max']
+                    )
+
+    def _fold(self, eq_type, field, count, total, low, high):
+        entry = self.types[eq_type]
+        if f'{field}_count' in entry:
+            entry[f'{field}_count'] += count
+            entry[f'{field}_sum'] += total
+            entry[f'{field}_min'] = min(entry[f'{field}_min'], low)
+            entry[f'{field}_max'] = max(entry[f'{field}_max'], high)
+        else:
+            entry.update({
+                f'{field}_count': count,
+                f'{field}_sum': total,
+                f'{field}_min': low,
+                f'{field}_max': high,
+            })
+
+
+def merge_rollups(accumulator, moment=None):
+    """Fold an upload's per-type statistics into every granularity's bucket.
+
+    Costs one insert-if-missing plus one UPDATE per (granularity, type),
+    independent of how many rows the upload had.
+    """
+    moment = moment or timezone.now()
+    for granularity in GRANULARITY_TRUNC:
+        start = bucket_start(moment, granularity)
+        ParameterRollup.objects.bulk_create(
+            [
+                ParameterRollup(granularity=granularity, bucket_start=start, equipment_type=eq_type)
+                for eq_type in accumulator.types
+            ],
+            ignore_conflicts=True
+        )
+        for eq_type, entry in accumulator.types.items():
+            changes = {'count': F('count') + entry['count']}
+            for field in PARAMETERS.values():
+                if f'{field}_count' not in entry:
+                    continue
+                low, high = entry[f'{field}_min'], entry[f'{field}_max']
+                changes.update({
+                    f'{field}_count': F(f'{field}_count') + entry[f'{field}_count'],
+                    f'{field}_sum': F(f'{field}_sum') + entry[f'{field}_sum'],
+                    f'{field}_min': Least(Coalesce(F(f'{field}_min'), Value(low)), Value(low), output_field=FloatField()),
+                    f'{field}_max': Greatest(Coalesce(F(f'{field}_max'), Value(high)), Value(high), output_field=FloatField()),
+                })
+            ParameterRollup.objects.filter(
+                granularity=granularity,
+                bucket_start=start,
+                equipment_type=eq_type
+            ).update(**changes)
+
+
+def rebuild_rollups():
+    """Recompute every rollup bucket from the stored readings."""
+    ParameterRollup.objects.all().delete()
+    for granularity, trunc in GRANULARITY_TRUNC.items():
+        aggregates = {'count': Count('id')}
+        for field in PARAMETERS.values():
+            aggregates.update({
+                f'{field}_count': Count(field),
+                f'{field}_sum': Coalesce(Sum(field), 0.0),
+                f'{field}_min': Min(field),
+                f'{field}_max': Max(field),
+            })
+        buckets = (
+            EquipmentParameter.objects
+            .annotate(bucket=trunc('recorded_at'))
+            .values('bucket', 'equipment_type')
+            .annotate(**aggregates)
+            .order_by()
+        )
+        ParameterRollup.objects.bulk_create(
+            (
+                ParameterRollup(
+                    granularity=granularity,
+                    bucket_start=row.pop('bucket'),
+                    **row
+                )
+                for row in buckets
+            ),
+            batch_size=500
+        )
+
+
+def get_rollup_trends(granularity='DAY', days=30, equipment_type=None):
+    since = bucket_start(timezone.now() - timedelta(days=days), granularity)
+    rollups = ParameterRollup.objects.filter(granularity=granularity, bucket_start__gte=since)
+    if equipment_type:
+        rollups = rollups.filter(equipment_type=equipment_type)
+
+    aggregates = {'total': Sum('count')}
+    for field in PARAMETERS.values():
+        aggregates.update({
+            f'{field}_total': Sum(f'{field}_sum'),
+            f'{field}_n': Sum(f'{field}_count'),
+            f'{field}_low': Min(f'{field}_min'),
+            f'{field}_high': Max(f'{field}_max'),
+        })
+    buckets = rollups.values('bucket_start').annotate(**aggregates).order_by('bucket_start')
+
+    trends = {'granularity': granularity.lower(), 'dates': [], 'count': []}
+    for field in PARAMETERS.values():
+        trends.update({field: [], f'{field}_min': [], f'{field}_max': []})
+
+    date_format = GRANULARITY_FORMAT[granularity]
+    for bucket in buckets:
+        trends['dates'].append(timezone.localtime(bucket['bucket_start']).strftime(date_format))
+        trends['count'].append(bucket['total'])
+        for field in PARAMETERS.values():
+            n = bucket[f'{field}_n']
+            trends[field].append(bucket[f'{field}_total'] / n if n else None)
+            trends[f'{field}_min'].append(bucket[f'{field}_low'])
+            trends[f'{field}_max'].append(bucket[f'{field}_high'])
+
+    return trends
@@ -1,3 +1,1247 @@
-from django.test import TestCase
+import gzip
+import json
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import Future
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock, skipIf
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from . import batch, columnar, jobs, reports
+from .alerts import STORM_EQUIPMENT, AlertSink, load_rules
+from .benchmark import compare_results
+from .cache import bump_generation, get_generation
+from .downsampling import lttb, minmax
+from .forecasting import TREND_SUMS, fit_trends, load_trend_sums, run_forecast
+from .exports import ALERT_COLUMNS, PARAMETER_COLUMNS, RANKING_COLUMNS
+from .ingest import IngestError, band_score, ingest_csv, score_readings, update_rankings
+from .instrumentation import read_slow_requests
+from .pagination import after_cursor, encode_cursor
+from .rollups import RollupAccumulator, bucket_start, get_rollup_trends, merge_rollups, rebuild_rollups
+from .models import (
+    AlertRule, Dataset, EquipmentAlert, EquipmentParameter, EquipmentRanking, IngestJob, MaintenanceSchedule,
+    ParameterRollup,
+)
+
+
+class ScoringTests(TestCase):
+    """The vectorized scores must match the original per-row scoring."""
+
+    @staticmethod
+    def row_score(flowrate, pressure, temperature):
+        flowrate_score = 100 if 100 <= flowrate <= 130 else 80 if 80 <= flowrate <= 150 else 60
+        pressure_score = 100 if 4 <= pressure <= 8 else 80 if 3 <= pressure <= 9 else 60
+        temp_score = 100 if 100 <= temperature <= 135 else 80 if 90 <= temperature <= 150 else 60
+        return (flowrate_score + pressure_score + temp_score) / 3
+
+    def test_band_boundaries(self):
+        values = [79.9, 80, 99.9, 100, 130, 130.1, 150, 150.1, float('nan')]
+        self.assertEqual(
+            list(band_score(values, (100, 130), (80, 150))),
+            [60, 80, 80, 100, 100, 80, 80, 60, 60]
+        )
+
+    def test_matches_row_scoring(self):
+        readings = pd.DataFrame({
+            'Equipment Name': ['Pump-1', 'Pump-2', 'Pump-3', 'Pump-4', 'Pump-5', 'Pump-6'],
+            'Type': ['Pump'] * 6,
+            'Flowrate': [100, 150, 79, 130, None, 'n/a'],
+            'Pressure': [4, 9, 2.9, 8.5, 5, 5],
+            'Temperature': [135, 90, 151, 89.9, 120, None],
+        })
+        readings['Flowrate'] = pd.to_numeric(readings['Flowrate'], errors='coerce')
+        scored = score_readings(readings)
+
+        self.assertEqual(
+            list(scored['health_score']),
+            [100.0, 80.0, 60.0, (100 + 80 + 60) / 3, (60 + 100 + 100) / 3, (60 + 100 + 60) / 3]
+        )
+        self.assertEqual(
+            list(scored['health_score']),
+            [self.row_score(*row) for row in readings[['Flowrate', 'Pressure', 'Temperature']].to_numpy(float)]
+        )
+
+    def test_missing_column_is_rejected(self):
+        with self.assertRaisesMessage(IngestError, 'Missing columns: Temperature'):
+            ingest_csv(BytesIO(b"Equipment Name,Type,Flowrate,Pressure\nPump-1,Pump,100,5\n"), 'readings.csv')
+
+
+class ChunkedIngestTests(TestCase):
+    HEADER = b"Equipment Name,Type,Flowrate,Pressure,Temperature\n"
+
+    def setUp(self):
+        caches['responses'].clear()
+
+    def test_file_larger_than_one_chunk(self):
+        rows = b"".join(f"Pump-{i % 4},Pump,{100 + i},5,110\n".encode() for i in range(7))
+        dataset, summary = ingest_csv(BytesIO(self.HEADER + rows), 'readings.csv', chunk_size=2)
+
+        self.assertEqual(summary['total_records'], 7)
+        self.assertEqual(summary['avg_flowrate'], 103)
+        self.assertEqual(summary['type_distribution'], {'Pump': 7})
+        self.assertEqual(dataset.total_records, 7)
+        self.assertEqual(EquipmentParameter.objects.filter(dataset=dataset).count(), 7)
+        # Rankings keep each unit's last reading, even when it arrives in a later chunk
+        self.assertEqual(
+            dict(EquipmentRanking.objects.values_list('equipment_name', 'overall_score')),
+            {'Pump-0': 100, 'Pump-1': 100, 'Pump-2': 100, 'Pump-3': 100}
+        )
+
+    def test_rejects_bad_files(self):
+        cases = [
+            (b"", "File is empty"),
+            (self.HEADER, "No data rows found"),
+            (b"Equipment Name,Type,Flowrate,Pressure,Temp\nPump-1,Pump,100,5,110\n", "Missing columns: Temperature"),
+        ]
+        for content, error in cases:
+            with self.subTest(error=error), self.assertRaisesMessage(IngestError, error):
+                ingest_csv(BytesIO(content), 'readings.csv', chunk_size=2)
+        self.assertFalse(Dataset.objects.exists())
+
+    def test_failed_later_chunk_rolls_back(self):
+        content = self.HEADER + b"Pump-1,Pump,100,5,110\nPump-2,Pump,160,5,110\nPump-3,Pump,broken,5,110\n"
+        with self.assertRaises(ValueError):
+            ingest_csv(BytesIO(content), 'readings.csv', chunk_size=2)
+        self.assertFalse(Dataset.objects.exists())
+        self.assertFalse(EquipmentParameter.objects.exists())
+        self.assertFalse(EquipmentAlert.objects.exists())
+        self.assertFalse(EquipmentRanking.objects.exists())
+
+    def test_upload_endpoint_reports_empty_file(self):
+        response = self.client.post('/api/upload/', {'file': SimpleUploadedFile('empty.csv', b'')})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'File is empty'})
+
+
+@override_settings(EQUIPMENT_INGEST_WORKERS=0)
+class IngestJobTests(TestCase):
+    CSV = (
+        b"Equipment Name,Type,Flowrate,Pressure,Temperature\n"
+        b"Pump-1,Pump,120,5,110\nPump-2,Pump,160,6,120\nPump-3,Pump,90,2,100\n"
+        b"Pump-4,Pump,110,5,115\nPump-5,Pump,100,4,105\n"
+    )
+
+    def setUp(self):
+        upload_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(upload_dir.cleanup)
+        self.upload_dir = Path(upload_dir.name)
+        caches['responses'].clear()
+
+    def queue(self, content=CSV, **fields):
+        path = self.upload_dir / 'readings.csv'
+        path.write_bytes(content)
+        return IngestJob.objects.create(file_name='readings.csv', file_path=str(path), file_size=len(content), **fields)
+
+    def status(self, job):
+        return self.client.get(f'/api/upload/jobs/{job.id}/').json()
+
+    def test_lifecycle(self):
+        job = self.queue()
+        self.assertEqual(self.status(job)['status'], 'PENDING')
+
+        seen = []
+        ingest_csv_ = jobs.ingest_csv
+
+        def observed(f, file_name, progress):
+            def report(rows):
+                progress(rows)
+                seen.append(self.status(job))
+            return ingest_csv_(f, file_name, chunk_size=2, progress=report)
+
+        with mock.patch.object(jobs, 'ingest_csv', observed):
+            jobs.run_job(job.id)
+
+        self.assertEqual([s['status'] for s in seen], ['RUNNING'] * 3)
+        self.assertEqual([s['rows_processed'] for s in seen], [2, 4, 5])
+        self.assertTrue(all(0 < s['bytes_processed'] <= len(self.CSV) for s in seen))
+        self.assertIsNotNone(seen[0]['eta_seconds'])
+
+        status = self.status(job)
+        self.assertEqual((status['status'], status['rows_processed'], status['progress']), ('COMPLETED', 5, 1.0))
+        self.assertEqual(status['result']['total_records'], 5)
+        self.assertEqual(status['dataset_id'], Dataset.objects.get().id)
+        self.assertEqual(status['eta_seconds'], 0)
+        self.assertFalse(Path(job.file_path).exists())
+
+    def test_failed_job(self):
+        job = self.queue(b"Equipment Name,Type\nPump-1,Pump\n")
+        jobs.run_job(job.id)
+        status = self.status(job)
+        self.assertEqual(status['status'], 'FAILED')
+        self.assertIn('Missing columns', status['error'])
+        self.assertFalse(Dataset.objects.exists())
+
+        # A finished job is never claimed again
+        jobs.run_job(job.id)
+        self.assertEqual(self.status(job)['status'], 'FAILED')
+
+    def test_async_upload_endpoint(self):
+        with override_settings(EQUIPMENT_INGEST_UPLOAD_DIR=self.upload_dir):
+            response = self.client.post('/api/upload/async/', {'file': SimpleUploadedFile('readings.csv', self.CSV)})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], 'COMPLETED')
+        self.assertEqual(self.client.get('/api/upload/jobs/999999/').status_code, 404)
+
+    def cancel(self, job):
+        return self.client.post(f'/api/upload/jobs/{job.id}/cancel/')
+
+    def test_cancel_pending_job(self):
+        job = self.queue()
+        response = self.cancel(job)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], 'CANCELLED')
+        self.assertFalse(Path(job.file_path).exists())
+
+        jobs.run_job(job.id)
+        self.assertEqual(self.status(job)['status'], 'CANCELLED')
+        self.assertFalse(Dataset.objects.exists())
+        self.assertEqual(self.cancel(job).status_code, 409)
+        self.assertEqual(self.client.post('/api/upload/jobs/999999/cancel/').status_code, 404)
+
+    def test_cancel_running_job_rolls_back(self):
+        job = self.queue()
+        cancelled = []
+        ingest_csv_ = jobs.ingest_csv
+
+        def observed(f, file_name, progress):
+            def report(rows):
+                progress(rows)
+                if not cancelled:
+                    cancelled.append(self.cancel(job))
+            return ingest_csv_(f, file_name, chunk_size=2, progress=report)
+
+        with mock.patch.object(jobs, 'ingest_csv', observed):
+            jobs.run_job(job.id)
+
+        self.assertEqual(cancelled[0].status_code, 202)
+        self.assertEqual(
+            (cancelled[0].json()['status'], cancelled[0].json()['cancel_requested']), ('RUNNING', True)
+        )
+        status = self.status(job)
+        self.assertEqual((status['status'], status['rows_processed']), ('CANCELLED', 4))
+        self.assertFalse(status['cancel_requested'])
+        self.assertFalse(Dataset.objects.exists())
+        self.assertFalse(EquipmentParameter.objects.exists())
+        self.assertFalse(EquipmentRanking.objects.exists())
+        self.assertFalse(Path(job.file_path).exists())
+
+    def dead_worker(self):
+        process = subprocess.Popen([sys.executable, '-c', 'pass'])
+        process.wait()
+        return f'{socket.gethostname()}:{process.pid}'
+
+    def test_dead_worker_flagged_stale(self):
+        job = self.queue(
+            status='RUNNING', started_at=timezone.now(), heartbeat_at=timezone.now(), worker=self.dead_worker()
+        )
+        with self.assertNumQueries(0):
+            status = jobs.job_status(job)
+        self.assertEqual((status['status'], status['stale']), ('RUNNING', True))
+        # Polling never writes; the job is left for process_ingest_jobs --requeue-running
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'RUNNING')
+
+    def test_silent_worker_flagged_stale(self):
+        job = self.queue(
+            status='RUNNING', started_at=timezone.now() - timedelta(hours=1),
+            heartbeat_at=timezone.now() - timedelta(hours=1), worker='other-host:1'
+        )
+        with mock.patch.object(jobs, 'heartbeats_enabled', return_value=True):
+            self.assertTrue(self.status(job)['stale'])
+
+        job = self.queue(status='RUNNING', started_at=timezone.now(), heartbeat_at=timezone.now(), worker='other-host:1')
+        with mock.patch.object(jobs, 'heartbeats_enabled', return_value=True):
+            self.assertFalse(self.status(job)['stale'])
+        # Without heartbeats a worker on another host cannot be judged
+        self.assertFalse(self.status(job)['stale'])
+
+    def test_requeue_stale_jobs(self):
+        stale = self.queue(
+            status='RUNNING', started_at=timezone.now(), heartbeat_at=timezone.now(), worker=self.dead_worker()
+        )
+        call_command('process_ingest_jobs', '--requeue-running', stdout=StringIO())
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, 'COMPLETED')
+
+
+class RankingTests(TestCase):
+    def assertFullyRanked(self):
+        rankings = list(EquipmentRanking.objects.order_by('-overall_score', 'id'))
+        expected = list(range(1, len(rankings) + 1))
+        for field in ('efficiency_rank', 'reliability_rank', 'performance_rank'):
+            self.assertEqual([getattr(ranking, field) for ranking in rankings], expected)
+
+    def test_incremental_updates_match_full_recompute(self):
+        rng = np.random.default_rng(3)
+        # Health scores are means of 60/80/100 bands, so ties are common
+        scores = [60, 200 / 3, 220 / 3, 80, 260 / 3, 280 / 3, 100]
+        for step in range(30):
+            names = rng.choice(60, size=rng.integers(1, 8), replace=False)
+            update_rankings({f'Pump-{name}': ('Pump', float(rng.choice(scores))) for name in names})
+            self.assertFullyRanked()
+        self.assertGreater(EquipmentRanking.objects.count(), 40)
+
+    def test_upload_reranks_only_the_changed_band(self):
+        header = b"Equipment Name,Type,Flowrate,Pressure,Temperature\n"
+        ingest_csv(BytesIO(header + b"".join(
+            f"Pump-{i},Pump,{[120, 90, 60][i % 3]},5,110\n".encode() for i in range(30)
+        )), 'fleet.csv')
+        self.assertFullyRanked()
+
+        untouched = dict(EquipmentRanking.objects.filter(overall_score=100).values_list('id', 'efficiency_rank'))
+        ingest_csv(BytesIO(header + b"Pump-1,Pump,90,5,110\nPump-2,Pump,60,5,110\nPump-99,Pump,90,5,110\n"), 'update.csv')
+        self.assertFullyRanked()
+        # Units above the changed band keep their rows as they were
+        self.assertEqual(
+            dict(EquipmentRanking.objects.filter(id__in=untouched).values_list('id', 'efficiency_rank')), untouched
+        )
+
+    def test_endpoint_returns_stored_ranks_in_order(self):
+        caches['responses'].clear()
+        # Every score tied, inserted in an order unrelated to the names
+        update_rankings({f'Pump-{i}': ('Pump', 80.0) for i in (7, 3, 9, 1, 5)})
+        update_rankings({'Pump-2': ('Pump', 100.0)})
+
+        data = self.client.get('/api/rankings/').json()
+        stored = list(EquipmentRanking.objects.order_by('-overall_score', 'id').values_list('equipment_name', 'efficiency_rank'))
+        self.assertEqual([(row['equipment_name'], row['rank']) for row in data], stored)
+        self.assertEqual([row['rank'] for row in data], [1, 2, 3, 4, 5, 6])
+        self.assertTrue(all(row['rank'] == row['efficiency_rank'] for row in data))
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        caches['responses'].clear()
+        # Two uploads an hour apart; the second widens the pump ranges and has no valve pressure
+        self.first = timezone.now() - timedelta(hours=2)
+        self.second = self.first + timedelta(hours=1)
+        self.merge(self.first, [('Pump', 100, 5, 110), ('Pump', 120, 7, 130), ('Valve', 50, 2, 90)])
+        self.merge(self.second, [('Pump', 140, 4, 120), ('Valve', 60, None, 95)])
+
+    def merge(self, moment, rows):
+        chunk = pd.DataFrame(rows, columns=['Type', 'Flowrate', 'Pressure', 'Temperature'])
+        accumulator = RollupAccumulator()
+        accumulator.add(chunk)
+        merge_rollups(accumulator, moment)
+
+    def test_merge_folds_into_every_granularity(self):
+        for granularity in ('HOUR', 'DAY', 'WEEK'):
+            same_bucket = bucket_start(self.first, granularity) == bucket_start(self.second, granularity)
+            pumps = ParameterRollup.objects.filter(granularity=granularity, equipment_type='Pump').order_by('bucket_start')
+            self.assertEqual(len(pumps), 1 if same_bucket else 2)
+            pump = pumps.last()
+            self.assertEqual(pump.bucket_start, bucket_start(self.second, granularity))
+            if same_bucket:
+                self.assertEqual((pump.count, pump.flowrate_sum, pump.flowrate_min, pump.flowrate_max), (3, 360, 100, 140))
+                self.assertEqual((pump.pressure_min, pump.pressure_max), (4, 7))
+
+            valve = ParameterRollup.objects.filter(granularity=granularity, equipment_type='Valve').last()
+            self.assertEqual(valve.pressure_count, 1 if same_bucket else 0)
+            self.assertEqual(valve.pressure_min, 2 if same_bucket else None)
+
+    def test_trends_for_each_granularity(self):
+        for granularity in ('hour', 'day', 'week'):
+            trends = get_rollup_trends(granularity.upper(), days=7)
+            buckets = sorted({bucket_start(moment, granularity.upper()) for moment in (self.first, self.second)})
+            self.assertEqual(trends['granularity'], granularity)
+            self.assertEqual(len(trends['dates']), len(buckets))
+            self.assertEqual(sum(trends['count']), 5)
+            self.assertEqual(trends['flowrate_max'][-1], 140)
+            if len(buckets) == 1:
+                self.assertEqual(trends['flowrate'], [94])
+                self.assertEqual(trends['pressure'], [4.5])
+            else:
+                self.assertEqual(trends['flowrate'], [90, 100])
+                self.assertEqual(trends['pressure'], [14 / 3, 4])
+
+    def test_type_filter(self):
+        trends = get_rollup_trends('HOUR', days=7, equipment_type='Valve')
+        self.assertEqual(trends['count'], [1, 1])
+        self.assertEqual(trends['flowrate'], [50, 60])
+        self.assertEqual(trends['pressure'], [2, None])
+        self.assertEqual(get_rollup_trends('HOUR', days=7, equipment_type='Heater')['dates'], [])
+
+    def test_window_excludes_old_buckets(self):
+        self.merge(timezone.now() - timedelta(days=40), [('Pump', 100, 5, 110)])
+        self.assertEqual(sum(get_rollup_trends('DAY', days=30)['count']), 5)
+
+    def test_endpoint_validates_parameters(self):
+        response = self.client.get('/api/trends/', {'days': 7, 'granularity': 'hour'})
+        self.assertEqual(response.json()['count'], [3, 2])
+        for params in (
+            {'days': 'abc'}, {'days': -1}, {'days': 0}, {'days': 400, 'granularity': 'hour'}, {'granularity': 'month'}
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/trends/', params).status_code, 400)
+        self.assertEqual(self.client.get('/api/trends/', {'days': 400}).status_code, 200)
+
+    def test_rebuild_matches_readings(self):
+        ingest_csv(BytesIO(
+            b"Equipment Name,Type,Flowrate,Pressure,Temperature\nPump-1,Pump,100,5,110\nValve-1,Valve,50,2,90\n"
+        ), 'readings.csv')
+        rebuild_rollups()
+        valve = ParameterRollup.objects.get(granularity='DAY', equipment_type='Valve')
+        self.assertEqual((valve.count, valve.pressure_min, valve.flowrate_sum), (1, 2, 50))
+        self.assertEqual(ParameterRollup.objects.filter(granularity='WEEK').count(), 2)
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        caches['responses'].clear()
+        self.alert = EquipmentAlert.objects.create(
+            equipment_name='Pump-1', alert_type='CRITICAL', parameter='Flowrate',
+            value=160, threshold=150, message='Flowrate critically high'
+        )
+        EquipmentAlert.objects.create(
+            equipment_name='Pump-2', alert_type='WARNING', parameter='Pressure',
+            value=8.2, threshold=8, message='Pressure high'
+        )
+
+    def test_revalidation_returns_not_modified(self):
+        response = self.client.get('/api/alerts/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get('/api/alerts/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_writes_change_the_etag(self):
+        etag = self.client.get('/api/alerts/')['ETag']
+        self.client.post(f'/api/alerts/{self.alert.id}/resolve/')
+        response = self.client.get('/api/alerts/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([alert['equipment_name'] for alert in response.json()], ['Pump-2'])
+
+        etag = response['ETag']
+        self.client.post('/api/upload/', {'file': SimpleUploadedFile(
+            'readings.csv', b"Equipment Name,Type,Flowrate,Pressure,Temperature\nPump-3,Pump,100,5,110\n"
+        )})
+        response = self.client.get('/api/alerts/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_query_params_are_cached_separately(self):
+        first = self.client.get('/api/alerts/', {'equipment_name': 'Pump-1'})
+        second = self.client.get('/api/alerts/', {'equipment_name': 'Pump-2'})
+        self.assertNotEqual(first['ETag'], second['ETag'])
+        self.assertEqual([alert['equipment_name'] for alert in second.json()], ['Pump-2'])
+
+        # Served from the cache: the rows changed underneath, but the generation did not
+        EquipmentAlert.objects.all().delete()
+        again = self.client.get('/api/alerts/', {'equipment_name': 'Pump-1'})
+        self.assertEqual((again['ETag'], again.content), (first['ETag'], first.content))
+
+    def test_relative_windows_expire_hourly(self):
+        with mock.patch('equipment.cache.time.time', return_value=7200.0):
+            first = self.client.get('/api/trends/', {'days': 7})
+            again = self.client.get('/api/trends/', {'days': 7}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, 304)
+
+        with mock.patch('equipment.cache.time.time', return_value=10800.0):
+            later = self.client.get('/api/trends/', {'days': 7}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(later.status_code, 200)
+        self.assertNotEqual(later['ETag'], first['ETag'])
+
+    def test_errors_carry_no_etag(self):
+        response = self.client.get('/api/alerts/', {'cursor': 'bogus'})
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+
+class ExcelExportTests(TestCase):
+    def setUp(self):
+        caches['responses'].clear()
+
+    def test_workbook_contents(self):
+        ingest_csv(BytesIO(
+            b"Equipment Name,Type,Flowrate,Pressure,Temperature\n"
+            b"Pump-1,Pump,120,5,110\nPump-2,Pump,160,6,120\nValve-1,Valve,90,2,100\n"
+        ), 'readings.csv')
+
+        response = self.client.get('/api/export/excel/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment', response['Content-Disposition'])
+        workbook = load_workbook(BytesIO(b''.join(response.streaming_content)), read_only=True)
+
+        self.assertEqual(workbook.sheetnames, ['Summary', 'Parameters', 'Rankings', 'Alerts'])
+        summary = {row[0]: row[1] for row in workbook['Summary'].iter_rows(values_only=True) if len(row) > 1}
+        self.assertEqual(summary['Total Records'], 3)
+
+        parameters = list(workbook['Parameters'].iter_rows(values_only=True))
+        self.assertEqual(list(parameters[0]), [label for label, _, _ in PARAMETER_COLUMNS])
+        self.assertEqual([row[0] for row in parameters[1:]], ['Pump-1', 'Pump-2', 'Valve-1'])
+
+        rankings = list(workbook['Rankings'].iter_rows(values_only=True))
+        self.assertEqual(list(rankings[0]), [label for label, _, _ in RANKING_COLUMNS])
+        self.assertEqual([row[0] for row in rankings[1:]], [1, 2, 3])
+
+        alerts = list(workbook['Alerts'].iter_rows(values_only=True))
+        self.assertEqual(list(alerts[0]), [label for label, _, _ in ALERT_COLUMNS])
+        self.assertEqual(len(alerts) - 1, EquipmentAlert.objects.count())
+
+    def test_failure_is_logged_not_returned(self):
+        Dataset.objects.create(total_records=0, avg_flowrate=0, avg_pressure=0, avg_temperature=0)
+        with mock.patch('equipment.views.write_workbook', side_effect=RuntimeError('disk full')), \
+                self.assertLogs('equipment.views', 'ERROR') as logs:
+            response = self.client.get('/api/export/excel/')
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json(), {'error': 'Failed to generate Excel report: disk full'})
+        self.assertIn('Traceback', logs.output[0])
+
+    def test_no_dataset(self):
+        self.assertEqual(self.client.get('/api/export/excel/').status_code, 400)
+
+
+class ReportTests(TestCase):
+    PDF = b'%PDF-1.4 stub'
+
+    def setUp(self):
+        caches['responses'].clear()
+        report_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(report_dir.cleanup)
+        self.report_dir = Path(report_dir.name)
+        settings_override = override_settings(EQUIPMENT_REPORT_DIR=self.report_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.dataset = Dataset.objects.create(
+            total_records=0, avg_flowrate=0, avg_pressure=0, avg_temperature=0, file_name='readings.csv'
+        )
+
+    def get_report(self, **params):
+        return self.client.get('/api/report/', params)
+
+    def stored_files(self):
+        return sorted(path.name for path in self.report_dir.iterdir())
+
+    @override_settings(EQUIPMENT_REPORT_WORKERS=0)
+    def test_reuses_report_for_same_generation(self):
+        with mock.patch('equipment.reports.build_report', return_value=self.PDF) as build:
+            first = self.get_report()
+            second = self.get_report()
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(b''.join(second.streaming_content), self.PDF)
+        self.assertEqual(build.call_count, 1)
+        generation = get_generation().generation
+        self.assertEqual(self.stored_files(), [f'report_{self.dataset.id}_{generation}.pdf'])
+
+    @override_settings(EQUIPMENT_REPORT_WORKERS=0)
+    def test_rerenders_after_generation_changes(self):
+        with mock.patch('equipment.reports.build_report', return_value=self.PDF) as build:
+            self.get_report()
+            bump_generation()
+            response = self.get_report()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(build.call_count, 2)
+        # The previous generation's file is removed and no temporary file is left behind
+        generation = get_generation().generation
+        self.assertEqual(self.stored_files(), [f'report_{self.dataset.id}_{generation}.pdf'])
+
+    @override_settings(EQUIPMENT_REPORT_WORKERS=1, EQUIPMENT_REPORT_WAIT_SECONDS=0.01)
+    def test_pending_while_rendering(self):
+        release = threading.Event()
+
+        def slow_build(dataset):
+            release.wait(5)
+            return self.PDF
+
+        with mock.patch('equipment.reports.build_report', side_effect=slow_build):
+            pending = self.get_report(**{'async': '1'})
+            path, future = reports.schedule_report(self.dataset)
+            release.set()
+            future.result(timeout=5)
+            ready = self.get_report(**{'async': '1'})
+
+        self.assertEqual(pending.status_code, 202)
+        self.assertEqual(pending['Retry-After'], '5')
+        self.assertEqual(pending.json()['status'], 'PENDING')
+        self.assertNotIn('ETag', pending)
+        self.assertEqual(ready.status_code, 200)
+        self.assertEqual(b''.join(ready.streaming_content), self.PDF)
+
+    @override_settings(EQUIPMENT_REPORT_WORKERS=1, EQUIPMENT_REPORT_WAIT_SECONDS=0.01)
+    def test_waits_for_render_without_async(self):
+        release = threading.Event()
+
+        def slow_build(dataset):
+            release.wait(5)
+            return self.PDF
+
+        with mock.patch('equipment.reports.build_report', side_effect=slow_build):
+            timer = threading.Timer(0.2, release.set)
+            timer.start()
+            response = self.get_report()
+            timer.join()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.PDF)
+
+    def test_failed_render_leaves_no_partial_file(self):
+        path = reports.report_path(self.dataset.id, 1)
+        with mock.patch('equipment.reports.os.replace', side_effect=OSError('disk full')), \
+                mock.patch('equipment.reports.build_report', return_value=self.PDF):
+            with self.assertRaises(OSError):
+                reports._write_report(self.dataset, path)
+        self.assertEqual(self.stored_files(), [])
+
+
+class BenchmarkCommandTests(TestCase):
+    def test_smoke_run(self):
+        # Run out of process: the command creates and destroys its own test database
+        with tempfile.TemporaryDirectory() as workdir:
+            output = Path(workdir) / 'results.json'
+            finished = subprocess.run(
+                [sys.executable, str(settings.BASE_DIR / 'manage.py'), 'benchmark',
+                 '--sizes', '20', '--equipment', '5', '--output', str(output)],
+                cwd=workdir, capture_output=True, text=True, timeout=120
+            )
+            self.assertEqual(finished.returncode, 0, finished.stderr)
+            report = json.loads(output.read_text())
+
+        self.assertEqual(report['config']['sizes'], [20])
+        scenarios = [result['scenario'] for result in report['results']]
+        self.assertEqual(scenarios[0], 'upload_csv')
+        self.assertIn('export_to_excel:cached', scenarios)
+        self.assertTrue(all(result['status_code'] == 200 for result in report['results']))
+        self.assertTrue(all(result['rows'] == 20 for result in report['results']))
+
+        self.assertEqual(compare_results(report, report), [])
+        baseline = json.loads(json.dumps(report))
+        baseline['results'][0]['queries'] -= 1
+        regressions = compare_results(report, baseline)
+        self.assertEqual([(r['scenario'], r['metric']) for r in regressions], [('upload_csv', 'queries')])
+
+
+class QueryPlanTests(TestCase):
+    """The hot read paths in views.py must be served by an index, not a table scan."""
+
+    @classmethod
+    def setUpTestData(cls):
+        dataset = Dataset.objects.create(
+            total_records=2, avg_flowrate=100, avg_pressure=5, avg_temperature=110
+        )
+        EquipmentParameter.objects.create(
+            dataset=dataset, equipment_name='Pump-1', equipment_type='Pump',
+            flowrate=100, pressure=5, temperature=110, health_score=100
+        )
+        EquipmentAlert.objects.create(
+            equipment_name='Pump-1', alert_type='CRITICAL', parameter='Flowrate',
+            value=160, threshold=150, message='Flowrate critically high'
+        )
+        MaintenanceSchedule.objects.create(
+            equipment_name='Pump-1', equipment_type='Pump', scheduled_date=date.today(),
+            priority='HIGH', estimated_hours=2, description='Inspect seals'
+        )
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            # Tiny test tables are always cheaper to scan; make the planner show its index choice
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+
+    def assertUsesIndex(self, queryset, *index_names):
+        plan = queryset.explain()
+        self.assertTrue(
+            any(name in plan for name in index_names),
+            f"Expected one of {index_names} in plan:\n{plan}"
+        )
+
+    def test_latest_dataset(self):
+        self.assertUsesIndex(Dataset.objects.order_by('-uploaded_at')[:1], 'dataset_uploaded_idx')
+
+    def test_open_alerts(self):
+        self.assertUsesIndex(
+            EquipmentAlert.objects.filter(resolved=False).order_by('-created_at')[:50],
+            'alert_open_created_idx'
+        )
+
+    def test_resolved_alerts(self):
+        self.assertUsesIndex(
+            EquipmentAlert.objects.filter(resolved=True).order_by('-created_at')[:50],
+            'alert_resolved_created_idx'
+        )
+
+    def test_alert_cursor_page(self):
+        cursor = encode_cursor(timezone.now(), 10 ** 9)
+        self.assertUsesIndex(
+            after_cursor(EquipmentAlert.objects.filter(resolved=False), 'created_at', cursor)[:51],
+            'alert_open_created_idx'
+        )
+
+    def test_open_alerts_seen_since(self):
+        self.assertUsesIndex(
+            EquipmentAlert.objects.filter(resolved=False, last_seen_at__gte=timezone.now()).order_by('-created_at')[:50],
+            'alert_open_seen_idx', 'alert_open_created_idx'
+        )
+
+    def test_compare_equipment(self):
+        dataset = Dataset.objects.first()
+        self.assertUsesIndex(
+            EquipmentParameter.objects.filter(dataset=dataset, equipment_name__in=['Pump-1', 'Pump-2']),
+            'param_dataset_name_idx'
+        )
+
+    def test_equipment_history(self):
+        self.assertUsesIndex(
+            EquipmentParameter.objects.filter(equipment_name__in=['Pump-1'], recorded_at__gte=timezone.now())
+            .order_by('equipment_name', 'recorded_at'),
+            'param_name_recorded_idx'
+        )
+
+    def test_open_maintenance(self):
+        self.assertUsesIndex(
+            MaintenanceSchedule.objects.filter(status__in=['SCHEDULED', 'IN_PROGRESS']).order_by('scheduled_date'),
+            'maint_status_date_idx'
+        )
+
+
+class InstrumentationTests(TestCase):
+    def setUp(self):
+        self.log_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.log_dir.cleanup)
+        settings_override = override_settings(
+            EQUIPMENT_INSTRUMENTATION=True,
+            EQUIPMENT_SLOW_REQUEST_MS=0,
+            EQUIPMENT_SLOW_REQUEST_LOG=Path(self.log_dir.name) / 'slow.jsonl'
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        caches['responses'].clear()
+        EquipmentAlert.objects.create(
+            equipment_name='Pump-1', alert_type='CRITICAL', parameter='Flowrate',
+            value=160, threshold=150, message='Flowrate critically high'
+        )
+
+    def test_server_timing_and_metrics(self):
+        response = self.client.get('/api/alerts/')
+        self.assertIn('db;dur=', response['Server-Timing'])
+
+        metrics = self.client.get('/api/metrics/').content.decode()
+        self.assertIn('equipment_request_duration_seconds_count{view="api/alerts/",method="GET"}', metrics)
+        self.assertIn('equipment_rows_serialized_total{view="api/alerts/",method="GET"}', metrics)
+
+    def test_slow_requests_logged(self):
+        self.client.get('/api/alerts/')
+        samples = read_slow_requests(settings.EQUIPMENT_SLOW_REQUEST_LOG)
+        self.assertEqual(samples[-1]['view'], 'api/alerts/')
+        self.assertEqual(samples[-1]['rows'], 1)
+        self.assertGreater(samples[-1]['queries'], 0)
+
+    def test_cache_hits_count_rows(self):
+        self.client.get('/api/alerts/')
+        self.client.get('/api/alerts/')
+        samples = read_slow_requests(settings.EQUIPMENT_SLOW_REQUEST_LOG)
+        self.assertEqual([sample['rows'] for sample in samples], [1, 1])
+
+    @override_settings(EQUIPMENT_SLOW_REQUEST_LOG_MAX_BYTES=600, EQUIPMENT_SLOW_REQUEST_LOG_BACKUPS=1)
+    def test_slow_request_log_is_rotated(self):
+        for page in range(8):
+            self.client.get('/api/alerts/', {'limit': page + 1})
+
+        log = settings.EQUIPMENT_SLOW_REQUEST_LOG
+        self.assertEqual(sorted(path.name for path in log.parent.iterdir()), ['slow.jsonl', 'slow.jsonl.1'])
+        self.assertTrue(all(path.stat().st_size <= 600 for path in log.parent.iterdir()))
+        samples = read_slow_requests(log)
+        self.assertLess(len(samples), 8)
+        self.assertEqual(samples[-1]['path'], '/api/alerts/?limit=8')
+        self.assertEqual([s['timestamp'] for s in samples], sorted(s['timestamp'] for s in samples))
+
+        call_command('slowest_requests', '--clear', stdout=StringIO())
+        self.assertEqual(read_slow_requests(log), [])
+
+    def test_metrics_restricted_to_local_clients(self):
+        response = self.client.get('/api/metrics/', REMOTE_ADDR='203.0.113.5')
+        self.assertEqual(response.status_code, 403)
+
+
+@skipIf(columnar.pq is None, "pyarrow is not installed")
+class ColumnarStoreTests(TestCase):
+    CSV = (
+        b"Equipment Name,Type,Flowrate,Pressure,Temperature\n"
+        b"Pump-1,Pump,120,5,110\n"
+        b"Pump-2,Pump,160,6,120\n"
+        b"Valve-1,Valve,90,2,100\n"
+    )
+
+    def setUp(self):
+        store_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(store_dir.cleanup)
+        settings_override = override_settings(EQUIPMENT_COLUMNAR_STORE=True, EQUIPMENT_COLUMNAR_DIR=Path(store_dir.name))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        caches['responses'].clear()
+
+    def upload(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            dataset, _ = ingest_csv(BytesIO(self.CSV), 'readings.csv')
+        return dataset
+
+    def test_upload_writes_parquet_copy(self):
+        dataset = self.upload()
+        frame = columnar.read_columns(dataset.id, ['equipment_name', 'health_score'])
+        self.assertEqual(list(frame['equipment_name']), ['Pump-1', 'Pump-2', 'Valve-1'])
+        self.assertEqual(
+            list(frame['health_score']),
+            list(EquipmentParameter.objects.filter(dataset=dataset).order_by('id').values_list('health_score', flat=True))
+        )
+
+    def test_compare_reads_columnar_copy(self):
+        dataset = self.upload()
+        EquipmentParameter.objects.filter(dataset=dataset).delete()
+        response = self.client.post(
+            '/api/compare-equipment/', {'equipment_names': ['Pump-1', 'Valve-1']}, content_type='application/json'
+        )
+        self.assertEqual([row['name'] for row in response.json()], ['Pump-1', 'Valve-1'])
+
+    def test_failed_upload_leaves_no_file(self):
+        with self.assertRaises(IngestError):
+            ingest_csv(BytesIO(b"Equipment Name,Type,Flowrate,Pressure,Temperature\n"), 'empty.csv')
+        self.assertEqual(list(settings.EQUIPMENT_COLUMNAR_DIR.iterdir()), [])
+
+    @override_settings(EQUIPMENT_BATCH_WORKERS=0, EQUIPMENT_BATCH_TRANSACTION_SIZE=2)
+    def test_rolled_back_batch_leaves_no_file(self):
+        members = [('a.csv', self.CSV), ('b.csv', self.CSV)]
+        with mock.patch('equipment.batch.update_rankings', side_effect=RuntimeError("rankings failed")):
+            with self.captureOnCommitCallbacks(execute=True), self.assertRaises(RuntimeError):
+                batch.ingest_batch(members)
+        self.assertEqual(list(settings.EQUIPMENT_COLUMNAR_DIR.iterdir()), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            batch.ingest_batch(members)
+        self.assertEqual(len(list(settings.EQUIPMENT_COLUMNAR_DIR.glob('*.parquet'))), 2)
+
+
+class BatchUploadTests(TestCase):
+    HEADER = "Equipment Name,Type,Flowrate,Pressure,Temperature\n"
+
+    def setUp(self):
+        caches['responses'].clear()
+
+    def unit_file(self, unit, flowrate=120):
+        return (self.HEADER + f"{unit},Pump,{flowrate},5,110\n{unit},Pump,{flowrate + 10},6,115\n").encode()
+
+    def post(self, *files):
+        return self.client.post('/api/upload/batch/', {
+            'files': [SimpleUploadedFile(name, content) for name, content in files]
+        })
+
+    @override_settings(EQUIPMENT_BATCH_WORKERS=0, EQUIPMENT_BATCH_TRANSACTION_SIZE=2)
+    def test_zip_members_become_datasets(self):
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zf:
+            for unit in ('Pump-1', 'Pump-2', 'Pump-3'):
+                zf.writestr(f'units/{unit}.csv', self.unit_file(unit))
+            zf.writestr('units/README.txt', 'not a csv')
+            zf.writestr('units/broken.csv', 'Equipment Name,Type\nPump-9,Pump\n')
+
+        response = self.post(('units.zip', archive.getvalue()))
+        body = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((body['files'], body['succeeded'], body['failed']), (4, 3, 1))
+        self.assertEqual(body['summary']['total_records'], 6)
+        self.assertIn('Missing columns', body['results'][3]['error'])
+        self.assertEqual(Dataset.objects.count(), 3)
+        self.assertEqual(EquipmentRanking.objects.count(), 3)
+
+    @override_settings(EQUIPMENT_BATCH_WORKERS=1)
+    def test_csv_and_gzip_parsed_in_process_pool(self):
+        response = self.post(
+            ('Pump-1.csv', self.unit_file('Pump-1')),
+            ('Pump-2.csv.gz', gzip.compress(self.unit_file('Pump-2', flowrate=170))),
+        )
+        body = response.json()
+        self.assertEqual(body['succeeded'], 2)
+        self.assertEqual([r['file_name'] for r in body['results']], ['Pump-1.csv', 'Pump-2.csv'])
+        self.assertEqual(EquipmentAlert.objects.get(equipment_name='Pump-2').occurrence_count, 2)
+
+    @override_settings(EQUIPMENT_BATCH_WORKERS=0, EQUIPMENT_BATCH_TRANSACTION_SIZE=1, EQUIPMENT_ALERT_STORM_LIMIT=2)
+    def test_storm_limit_spans_the_upload(self):
+        response = self.post(*[(f'{unit}.csv', self.unit_file(unit, flowrate=170)) for unit in ('Pump-1', 'Pump-2', 'Pump-3')])
+        self.assertEqual(response.json()['succeeded'], 3)
+
+        opened = EquipmentAlert.objects.exclude(equipment_name=STORM_EQUIPMENT)
+        self.assertCountEqual(opened.values_list('equipment_name', flat=True), ['Pump-1', 'Pump-2'])
+        storm = EquipmentAlert.objects.get(equipment_name=STORM_EQUIPMENT, parameter='Flowrate')
+        self.assertEqual(storm.occurrence_count, 2)
+
+    @override_settings(EQUIPMENT_BATCH_WORKERS=2)
+    def test_process_pool_work_in_flight_is_bounded(self):
+        submitted = []
+        executor = mock.Mock()
+
+        def submit(fn, data):
+            submitted.append(data)
+            future = Future()
+            future.set_result(data)
+            return future
+
+        executor.submit.side_effect = submit
+        members = [(f'unit-{i}.csv', i) for i in range(10)]
+        with mock.patch('equipment.batch.get_executor', return_value=executor):
+            consumed = 0
+            for name, parsed, error in batch._parsed_members(members):
+                self.assertEqual((name, parsed, error), members[consumed] + (None,))
+                consumed += 1
+                # The member being handed over plus at most two per worker ahead of it
+                self.assertLessEqual(len(submitted) - consumed, 2 * 2)
+        self.assertEqual(len(submitted), 10)
+
+    def test_rejects_corrupt_archive(self):
+        response = self.post(('units.zip', b'not a zip'))
+        self.assertEqual(response.status_code, 400)
+
+
+class AlertRuleTests(TestCase):
+    def scored(self, *rows):
+        return pd.DataFrame(
+            rows, columns=['equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature', 'health_score']
+        )
+
+    def raise_alerts(self, scored, **kwargs):
+        sink = AlertSink(load_rules(), **kwargs)
+        sink.add(scored)
+        sink.flush()
+        return {(a.equipment_name, a.parameter): a for a in EquipmentAlert.objects.all()}
+
+    def test_default_rules_cover_temperature(self):
+        alerts = self.raise_alerts(self.scored(
+            ('Pump-1', 'Pump', 160, 5, 110, 80),
+            ('Pump-2', 'Pump', 100, 5, 155, 80),
+            ('Pump-3', 'Pump', 100, 5, 170, 80),
+        ))
+        self.assertCountEqual(
+            [(name, parameter, a.alert_type, a.threshold) for (name, parameter), a in alerts.items()],
+            [
+                ('Pump-1', 'Flowrate', 'CRITICAL', 150),
+                ('Pump-2', 'Temperature', 'WARNING', 150),
+                ('Pump-3', 'Temperature', 'CRITICAL', 160),
+            ]
+        )
+
+    def test_type_rule_overrides_default(self):
+        AlertRule.objects.create(equipment_type='Valve', parameter='Flowrate', severity='CRITICAL', min_value=10, max_value=40)
+        AlertRule.objects.create(parameter='Pressure', severity='INFO', max_value=7)
+        alerts = self.raise_alerts(self.scored(
+            ('Valve-1', 'Valve', 45, 7.5, 110, 80),
+            ('Pump-1', 'Pump', 45, 5, 110, 80),
+        ))
+        self.assertEqual(set(alerts), {('Valve-1', 'Flowrate'), ('Valve-1', 'Pressure'), ('Pump-1', 'Flowrate')})
+        self.assertEqual(alerts[('Valve-1', 'Flowrate')].message, 'Flowrate critically high: 45.00 L/min')
+        self.assertEqual(alerts[('Valve-1', 'Pressure')].alert_type, 'INFO')
+        self.assertEqual(alerts[('Pump-1', 'Flowrate')].threshold, 50)
+
+    def test_repeat_faults_update_open_alert(self):
+        self.raise_alerts(self.scored(('Pump-1', 'Pump', 100, 5, 155, 80), ('Pump-1', 'Pump', 100, 5, 152, 80)))
+        alerts = self.raise_alerts(self.scored(('Pump-1', 'Pump', 100, 5, 170, 80)))
+        alert = alerts[('Pump-1', 'Temperature')]
+        self.assertEqual(EquipmentAlert.objects.count(), 1)
+        self.assertEqual((alert.occurrence_count, alert.alert_type, alert.value), (3, 'CRITICAL', 170))
+
+        # A milder repeat is counted but does not downgrade the alert
+        alert = self.raise_alerts(self.scored(('Pump-1', 'Pump', 100, 5, 151, 80)))[('Pump-1', 'Temperature')]
+        self.assertEqual((alert.occurrence_count, alert.alert_type, alert.value), (4, 'CRITICAL', 170))
+
+    def test_resolved_alert_reopens(self):
+        self.raise_alerts(self.scored(('Pump-1', 'Pump', 160, 5, 110, 80)))
+        EquipmentAlert.objects.update(resolved=True)
+        self.raise_alerts(self.scored(('Pump-1', 'Pump', 160, 5, 110, 80)))
+        self.assertEqual(EquipmentAlert.objects.filter(resolved=False).count(), 1)
+
+    def test_storm_is_summarized(self):
+        alerts = self.raise_alerts(
+            self.scored(*[(f'Pump-{i}', 'Pump', 160, 5, 110, 80) for i in range(10)]),
+            storm_limit=3
+        )
+        self.assertEqual(len(alerts), 4)
+        storm = alerts[(STORM_EQUIPMENT, 'Flowrate')]
+        self.assertEqual((storm.value, storm.occurrence_count), (7, 7))
+
+
+class AlertPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        alerts = EquipmentAlert.objects.bulk_create([
+            EquipmentAlert(
+                equipment_name=f'Pump-{i % 3}', alert_type='CRITICAL' if i % 2 else 'WARNING',
+                parameter='Flowrate', value=160, threshold=150, message='Flowrate critically high'
+            )
+            for i in range(7)
+        ])
+        # Two alerts share a timestamp so the id tie-breaker is exercised
+        moments = [timezone.now() - timedelta(minutes=i // 2) for i in range(7)]
+        for alert, moment in zip(alerts, moments):
+            EquipmentAlert.objects.filter(id=alert.id).update(created_at=moment)
+
+    def setUp(self):
+        caches['responses'].clear()
+
+    def test_pages_cover_every_alert_once(self):
+        seen, cursor = [], None
+        while True:
+            params = {'limit': 3, **({'cursor': cursor} if cursor else {})}
+            response = self.client.get('/api/alerts/', params)
+            seen += [alert['id'] for alert in response.json()]
+            cursor = response.headers.get('X-Next-Cursor')
+            if not cursor:
+                break
+        expected = list(EquipmentAlert.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_filters(self):
+        response = self.client.get('/api/alerts/', {'equipment_name': 'Pump-1', 'alert_type': 'CRITICAL'})
+        self.assertEqual(
+            {(a['equipment_name'], a['alert_type']) for a in response.json()}, {('Pump-1', 'CRITICAL')}
+        )
+        response = self.client.get('/api/alerts/', {'since': (timezone.now() + timedelta(days=1)).date().isoformat()})
+        self.assertEqual(response.json(), [])
+
+    def test_seen_since_includes_repeated_alerts(self):
+        cutoff = timezone.now()
+        sink = AlertSink(load_rules())
+        sink.add(pd.DataFrame(
+            [('Pump-0', 'Pump', 170, 5, 110, 80)],
+            columns=['equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature', 'health_score']
+        ))
+        caches['responses'].clear()
+
+        self.assertEqual(self.client.get('/api/alerts/', {'since': cutoff.isoformat()}).json(), [])
+        repeated = self.client.get('/api/alerts/', {'seen_since': cutoff.isoformat()}).json()
+        self.assertEqual(
+            [(alert['equipment_name'], alert['occurrence_count']) for alert in repeated], [('Pump-0', 2)]
+        )
+        self.assertEqual(self.client.get('/api/alerts/', {'seen_since': 'soon'}).status_code, 400)
+
+    def test_ids_filter(self):
+        first, second = EquipmentAlert.objects.order_by('id').values_list('id', flat=True)[:2]
+        EquipmentAlert.objects.filter(id=first).update(resolved=True)
+        ids = f'{first},{second}'
+        self.assertEqual([a['id'] for a in self.client.get('/api/alerts/', {'ids': ids}).json()], [second])
+        self.assertEqual(
+            [a['id'] for a in self.client.get('/api/alerts/', {'ids': ids, 'resolved': 'true'}).json()], [first]
+        )
+        self.assertEqual(self.client.get('/api/alerts/', {'ids': '1,x'}).status_code, 400)
+
+    def test_rejects_bad_cursor(self):
+        self.assertEqual(self.client.get('/api/alerts/', {'cursor': 'bogus'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/alerts/', {'limit': 0}).status_code, 400)
+
+
+class BulkResolveTests(TestCase):
+    def setUp(self):
+        EquipmentAlert.objects.bulk_create([
+            EquipmentAlert(
+                equipment_name=f'Pump-{i % 2}', alert_type='CRITICAL', parameter='Flowrate' if i < 4 else 'Pressure',
+                value=160, threshold=150, message='Flowrate critically high'
+            )
+            for i in range(6)
+        ])
+
+    def resolve(self, body):
+        return self.client.post('/api/alerts/resolve/', body, content_type='application/json')
+
+    def test_resolve_by_ids_in_one_statement(self):
+        ids = list(EquipmentAlert.objects.values_list('id', flat=True)[:3])
+        update_statements = []
+
+        def record(execute, sql, params, many, context):
+            if sql.startswith('UPDATE "equipment_equipmentalert"'):
+                update_statements.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            response = self.resolve({'ids': ids + [10 ** 9]})
+        self.assertEqual(response.json(), {'success': True, 'resolved': 3, 'requested': 4, 'skipped': 1})
+        self.assertEqual(len(update_statements), 1)
+        self.assertEqual(
+            set(EquipmentAlert.objects.filter(resolved=True).values_list('id', flat=True)), set(ids)
+        )
+        self.assertFalse(EquipmentAlert.objects.filter(resolved=True, resolved_at__isnull=True).exists())
+
+    def test_resolve_by_filter(self):
+        response = self.resolve({'equipment_name': 'Pump-0', 'parameter': 'Flowrate'})
+        self.assertEqual(response.json()['resolved'], 2)
+        response = self.resolve({'older_than': (timezone.now() - timedelta(days=1)).isoformat()})
+        self.assertEqual(response.json()['resolved'], 0)
+
+    def test_requires_criteria(self):
+        self.assertEqual(self.resolve({}).status_code, 400)
+        self.assertEqual(EquipmentAlert.objects.filter(resolved=True).count(), 0)
+
+
+class ForecastTests(TestCase):
+    def add_readings(self, name, flowrates, days_apart=1):
+        dataset = Dataset.objects.create(total_records=0, avg_flowrate=0, avg_pressure=0, avg_temperature=0)
+        now = timezone.now()
+        for i, flowrate in enumerate(flowrates):
+            reading = EquipmentParameter.objects.create(
+                dataset=dataset, equipment_name=name, equipment_type='Pump',
+                flowrate=flowrate, pressure=5, temperature=110
+            )
+            recorded_at = now - timedelta(days=(len(flowrates) - 1 - i) * days_apart)
+            EquipmentParameter.objects.filter(id=reading.id).update(recorded_at=recorded_at)
+
+    def test_fit_trends_matches_polyfit(self):
+        rng = np.random.default_rng(1)
+        codes = np.repeat(np.arange(3), 20)
+        t = np.tile(np.arange(20, dtype=float), 3)
+        values = np.array([2.0, -1.0, 0.5])[codes] * t + 7 + rng.normal(0, 0.1, 60)
+        sums = [
+            np.bincount(codes, weights, minlength=3)
+            for weights in (None, t, values, t * t, t * values, values * values)
+        ]
+        slope, intercept, _ = fit_trends(*sums)
+        for code in range(3):
+            expected = np.polyfit(t[codes == code], values[codes == code], 1)
+            np.testing.assert_allclose([slope[code], intercept[code]], expected)
+
+    def test_trend_sums_computed_in_database(self):
+        self.add_readings('Pump-1', [120, 122, 125], days_apart=2)
+        self.add_readings('Pump-2', [118])
+        since = timezone.now() - timedelta(days=30)
+        sums = load_trend_sums(since)
+
+        self.assertEqual(sums.loc['Pump-2', 'readings'], 1)
+        readings = EquipmentParameter.objects.filter(equipment_name='Pump-1')
+        recorded = readings.values_list('recorded_at', flat=True)
+        t = np.array([(recorded_at - since).total_seconds() / 86400 for recorded_at in recorded])
+        x = np.array(readings.values_list('flowrate', flat=True), dtype=float)
+        np.testing.assert_allclose(
+            sums.loc['Pump-1', [f'flowrate_{stat}' for stat in TREND_SUMS]].to_numpy(dtype=float),
+            [len(x), t.sum(), x.sum(), (t * t).sum(), (t * x).sum(), (x * x).sum()]
+        )
+
+    def test_predicts_threshold_crossing(self):
+        # Flowrate rising 2 L/min per day from 120; crosses the 150 CRITICAL band ~10 days out
+        self.add_readings('Pump-1', [120 + 2 * day for day in range(11)])
+        self.add_readings('Pump-2', [120, 121, 119, 120, 121, 120])
+
+        self.assertEqual(run_forecast()['created'], 1)
+        alert = EquipmentAlert.objects.get(alert_type='PREDICTIVE')
+        self.assertEqual((alert.equipment_name, alert.parameter, alert.threshold), ('Pump-1', 'Flowrate', 150))
+        self.assertEqual(alert.predicted_failure_date, (timezone.now() + timedelta(days=5)).date())
+        self.assertGreater(alert.confidence_score, 0.99)
+
+        # Re-running refreshes the same alert; a flattened trend clears it
+        self.assertEqual(run_forecast()['updated'], 1)
+        EquipmentParameter.objects.filter(equipment_name='Pump-1').update(flowrate=120)
+        self.assertEqual(run_forecast()['cleared'], 1)
+        self.assertFalse(EquipmentAlert.objects.filter(alert_type='PREDICTIVE', resolved=False).exists())
+
+
+class HistoryTests(TestCase):
+    def setUp(self):
+        caches['responses'].clear()
+
+    def test_lttb_keeps_endpoints_and_spike(self):
+        x = np.arange(10000, dtype=float)
+        y = np.sin(x / 500)
+        y[4321] = 25
+        kept = lttb(x, y, 100)
+        self.assertEqual(len(kept), 100)
+        self.assertEqual((kept[0], kept[-1]), (0, 9999))
+        self.assertTrue(np.all(np.diff(kept) > 0))
+        self.assertIn(4321, kept)
+
+    def test_minmax_keeps_bucket_extremes(self):
+        y = np.random.default_rng(2).normal(size=1000)
+        kept = minmax(np.arange(1000, dtype=float), y, 50)
+        self.assertLessEqual(len(kept), 50)
+        self.assertIn(np.argmax(y), kept)
+        self.assertIn(np.argmin(y), kept)
+
+    def test_endpoint_downsamples_across_datasets(self):
+        start = timezone.now() - timedelta(days=10)
+        for upload in range(2):
+            dataset = Dataset.objects.create(total_records=0, avg_flowrate=0, avg_pressure=0, avg_temperature=0)
+            readings = EquipmentParameter.objects.bulk_create([
+                EquipmentParameter(
+                    dataset=dataset, equipment_name=name, equipment_type='Pump',
+                    flowrate=100 + i % 7, pressure=5, temperature=110, health_score=90
+                )
+                for name in ('Pump-1', 'Pump-2') for i in range(300)
+            ])
+            for i, reading in enumerate(readings):
+                EquipmentParameter.objects.filter(id=reading.id).update(
+                    recorded_at=start + timedelta(minutes=upload * 1000 + i % 300)
+                )
+
+        response = self.client.get('/api/equipment/history/', {'names': 'Pump-1,Pump-3', 'points': 50})
+        history = response.json()['equipment']
+        self.assertEqual(history['Pump-1']['total'], 600)
+        flowrate = history['Pump-1']['series']['flowrate']
+        self.assertEqual(len(flowrate['t']), 50)
+        self.assertEqual(flowrate['t'], sorted(flowrate['t']))
+        self.assertEqual(history['Pump-3']['total'], 0)
+
+        response = self.client.get('/api/equipment/history/', {
+            'names': 'Pump-1', 'method': 'minmax', 'points': 5000, 'since': (start + timedelta(minutes=1000)).isoformat()
+        })
+        self.assertEqual(len(response.json()['equipment']['Pump-1']['series']['pressure']['v']), 300)
+
+    def test_rejects_bad_parameters(self):
+        for params in ({}, {'names': 'Pump-1', 'method': 'stride'}, {'names': 'Pump-1', 'points': 1}):
+            self.assertEqual(self.client.get('/api/equipment/history/', params).status_code, 400)
+
+
+class CompareEquipmentTests(TestCase):
+    def setUp(self):
+        start = timezone.now() - timedelta(days=30)
+        for day in range(3):
+            dataset = Dataset.objects.create(total_records=0, avg_flowrate=0, avg_pressure=0, avg_temperature=0)
+            for name, flowrate in (('Pump-1', 100 + day * 10), ('Pump-2', 90), ('Pump-2', 95)):
+                reading = EquipmentParameter.objects.create(
+                    dataset=dataset, equipment_name=name, equipment_type='Pump',
+                    flowrate=flowrate, pressure=5, temperature=110, health_score=80 + day
+                )
+                EquipmentParameter.objects.filter(id=reading.id).update(
+                    recorded_at=start + timedelta(days=day * 10, minutes=flowrate)
+                )
+        self.start = start
+
+    def compare(self, **body):
+        return self.client.post('/api/compare-equipment/', body, content_type='application/json')
+
+    def test_latest_dataset_has_one_row_per_name(self):
+        response = self.compare(equipment_names=['Pump-1', 'Pump-2', 'Pump-2'])
+        self.assertEqual(sorted(row['name'] for row in response.json()), ['Pump-1', 'Pump-2'])
+
+    def test_range_statistics(self):
+        response = self.compare(
+            equipment_names=['Pump-1', 'Pump-2', 'Pump-9'], since=(self.start + timedelta(days=5)).isoformat()
+        )
+        result = response.json()
+        self.assertEqual(result['missing'], ['Pump-9'])
+        pump = {entry['name']: entry for entry in result['equipment']}['Pump-1']
+        self.assertEqual(pump['readings'], 2)
+        self.assertEqual(
+            pump['flowrate'],
+            {'mean': 115.0, 'min': 110.0, 'max': 120.0, 'p95': 119.5, 'stdev': np.std([110, 120], ddof=1), 'latest': 120.0}
+        )
+        self.assertEqual(pump['health_score']['latest'], 82)
+
+    def test_single_reading_has_no_stdev(self):
+        response = self.compare(
+            equipment_names=['Pump-1', 'Pump-2'], since=(self.start + timedelta(days=15)).isoformat()
+        )
+        pump = {entry['name']: entry for entry in response.json()['equipment']}['Pump-1']
+        self.assertIsNone(pump['pressure']['stdev'])
+        self.assertEqual(self.compare(equipment_names=['Pump-1', 'Pump-2'], until='soon').status_code, 400)
@@ -1,14 +1,21 @@
 from django.urls import path
 from . import views
+from .instrumentation import metrics_view
 
 urlpatterns = [
     # Main endpoints - NO AUTH
     path('upload/', views.upload_csv),
+    path('upload/async/', views.upload_csv_async),
+    path('upload/batch/', views.upload_batch),
+    path('upload/jobs/<int:job_id>/', views.get_upload_job),
+    path('upload/jobs/<int:job_id>/cancel/', views.cancel_upload_job),
     path('history/', views.get_trends),
     path('report/', views.generate_pdf),
     path('alerts/', views.get_alerts),
+    path('alerts/resolve/', views.resolve_alerts),
     path('alerts/<int:alert_id>/resolve/', views.resolve_alert),
     path('compare-equipment/', views.compare_equipment),
+    path('equipment/history/', views.get_equipment_history),
     path('trends/', views.get_trends),
     path('maintenance/', views.get_maintenance_schedule),
     path('maintenance/create/', views.create_maintenance_schedule),
@@ -19,4 +26,5 @@ urlpatterns = [
     path('email-reports/schedule/', views.schedule_email_report),
     path('email-reports/<int:schedule_id>/update/', views.update_email_schedule),
     path('email-reports/<int:schedule_id>/delete/', views.delete_email_schedule),
+    path('metrics/', metrics_view),
 ]
\ No newline at end of file
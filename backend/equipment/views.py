@@ -1,22 +1,27 @@
 import pandas as pd
-import numpy as np
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from .models import Dataset, EquipmentAlert, MaintenanceSchedule, EquipmentParameter, EmailReportSchedule, EquipmentRanking
-from reportlab.lib.pagesizes import A4, letter
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from django.http import HttpResponse
-from io import BytesIO
-from datetime import datetime, timedelta
-import json
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.chart import BarChart, Reference, LineChart
-from sklearn.linear_model import LinearRegression
+from .models import Dataset, EquipmentAlert, MaintenanceSchedule, EquipmentParameter, EquipmentRanking, IngestJob
+from .batch import extract_members, ingest_batch
+from .ingest import IngestError, ingest_csv
+from .cache import bump_generation, cached_endpoint
+from .columnar import read_columns
+from .downsampling import METHODS as DOWNSAMPLING_METHODS, downsample
+from .history import READING_FIELDS, compare_statistics, load_readings
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor, keyset_page
+from .exports import write_workbook
+from .reports import get_report
+from .jobs import cancel_job, submit_upload, job_status
+from .rollups import GRANULARITY_TRUNC, get_rollup_trends
+from django.conf import settings
+from django.http import FileResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime
+import logging
+import tempfile
+
+logger = logging.getLogger(__name__)
 
 # NO AUTH - All endpoints open
 
@@ -28,87 +33,11 @@ def upload_csv(request):
         return Response({"error": "No file uploaded"}, status=400)
 
     try:
-        df = pd.read_csv(file)
-        
-        required_columns = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
-        missing = [col for col in required_columns if col not in df.columns]
-        if missing:
-            return Response({"error": f"Missing columns: {', '.join(missing)}"}, status=400)
-
-        summary = {
-            "total_records": len(df),
-            "avg_flowrate": float(df["Flowrate"].mean()),
-            "avg_pressure": float(df["Pressure"].mean()),
-            "avg_temperature": float(df["Temperature"].mean()),
-            "type_distribution": df["Type"].value_counts().to_dict()
-        }
-
-        from django.utils import timezone
-        dataset = Dataset.objects.create(
-            total_records=summary["total_records"],
-            avg_flowrate=summary["avg_flowrate"],
-            avg_pressure=summary["avg_pressure"],
-            avg_temperature=summary["avg_temperature"],
-            file_name=file.name
-        )
-
-        for _, row in df.iterrows():
-            flowrate = float(row['Flowrate'])
-            pressure = float(row['Pressure'])
-            temperature = float(row['Temperature'])
-            
-            flowrate_score = 100 if 100 <= flowrate <= 130 else 80 if 80 <= flowrate <= 150 else 60
-            pressure_score = 100 if 4 <= pressure <= 8 else 80 if 3 <= pressure <= 9 else 60
-            temp_score = 100 if 100 <= temperature <= 135 else 80 if 90 <= temperature <= 150 else 60
-            health_score = (flowrate_score + pressure_score + temp_score) / 3
-            
-            EquipmentParameter.objects.create(
-                dataset=dataset,
-                equipment_name=row['Equipment Name'],
-                equipment_type=row['Type'],
-                flowrate=flowrate,
-                pressure=pressure,
-                temperature=temperature,
-                health_score=health_score,
-                efficiency_index=health_score
-            )
-            
-            if flowrate > 150 or flowrate < 50:
-                EquipmentAlert.objects.create(
-                    equipment_name=row['Equipment Name'],
-                    alert_type='CRITICAL',
-                    parameter='Flowrate',
-                    value=flowrate,
-                    threshold=150 if flowrate > 150 else 50,
-                    message=f"Flowrate {'critically high' if flowrate > 150 else 'critically low'}: {flowrate:.2f} L/min",
-                    recommendation="Immediate inspection required"
-                )
-            
-            if pressure > 8.5 or pressure < 3.5:
-                EquipmentAlert.objects.create(
-                    equipment_name=row['Equipment Name'],
-                    alert_type='CRITICAL',
-                    parameter='Pressure',
-                    value=pressure,
-                    threshold=8.5 if pressure > 8.5 else 3.5,
-                    message=f"Pressure {'critically high' if pressure > 8.5 else 'critically low'}: {pressure:.2f} bar",
-                    recommendation="Check pressure regulators immediately"
-                )
-
-        EquipmentRanking.objects.all().delete()
-        params = EquipmentParameter.objects.filter(dataset=dataset).order_by('-health_score')
-        for rank, param in enumerate(params, start=1):
-            EquipmentRanking.objects.create(
-                equipment_name=param.equipment_name,
-                equipment_type=param.equipment_type,
-                overall_score=param.health_score,
-                efficiency_rank=rank,
-                reliability_rank=rank,
-                performance_rank=rank
-            )
-
+        dataset, summary = ingest_csv(file, file.name)
         return Response(summary)
-        
+
+    except IngestError as e:
+        return Response({"error": str(e)}, status=400)
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -118,226 +47,392 @@ def upload_csv(request):
         }, status=500)
 
 
+@api_view(['POST'])
+def upload_batch(request):
+    uploads = request.FILES.getlist('files') + request.FILES.getlist('file')
+
+    if not uploads:
+        return Response({"error": "No files uploaded"}, status=400)
+
+    try:
+        members = extract_members(uploads)
+    except IngestError as e:
+        return Response({"error": str(e)}, status=400)
+
+    if not members:
+        return Response({"error": "No CSV files found in upload"}, status=400)
+
+    result = ingest_batch(members)
+    return Response(result, status=200 if result['succeeded'] else 400)
+
+
+@api_view(['POST'])
+def upload_csv_async(request):
+    file = request.FILES.get('file')
+
+    if not file:
+        return Response({"error": "No file uploaded"}, status=400)
+
+    job = submit_upload(file)
+    job.refresh_from_db()
+    return Response(job_status(job), status=202)
+
+
+@api_view(['GET'])
+def get_upload_job(request, job_id):
+    try:
+        job = IngestJob.objects.get(id=job_id)
+    except IngestJob.DoesNotExist:
+        return Response({'error': 'Job not found'}, status=404)
+
+    return Response(job_status(job))
+
+
+@api_view(['POST'])
+def cancel_upload_job(request, job_id):
+    try:
+        job = IngestJob.objects.get(id=job_id)
+    except IngestJob.DoesNotExist:
+        return Response({'error': 'Job not found'}, status=404)
+
+    if job.status not in ('PENDING', 'RUNNING'):
+        return Response({'error': f'Job is already {job.status.lower()}', **job_status(job)}, status=409)
+
+    return Response(job_status(cancel_job(job)), status=202)
+
+
+# Longest window per granularity, keeping a response to at most a few thousand buckets
+TRENDS_MAX_DAYS = {'HOUR': 366, 'DAY': 3660, 'WEEK': 3660}
+
+# The window starts at the UTC hour (or day, or week) bucket of ``days`` ago, so it moves at most hourly
+TRENDS_WINDOW_SECONDS = 3600
+
+
+@cached_endpoint('trends', time_bucket=TRENDS_WINDOW_SECONDS)
 @api_view(['GET'])
 def get_trends(request):
-    days = int(request.GET.get('days', 30))
-    datasets = Dataset.objects.filter(
-        uploaded_at__gte=datetime.now() - timedelta(days=days)
-    ).order_by('uploaded_at')
-    
-    trends = {
-        'dates': [],
-        'flowrate': [],
-        'pressure': [],
-        'temperature': []
-    }
-    
-    for ds in datasets:
-        trends['dates'].append(ds.uploaded_at.strftime('%Y-%m-%d'))
-        trends['flowrate'].append(float(ds.avg_flowrate))
-        trends['pressure'].append(float(ds.avg_pressure))
-        trends['temperature'].append(float(ds.avg_temperature))
-    
+    granularity = request.GET.get('granularity', 'day').upper()
+    if granularity not in GRANULARITY_TRUNC:
+        return Response({'error': 'granularity must be one of: hour, day, week'}, status=400)
+
+    try:
+        days = int(request.GET.get('days', 30))
+    except ValueError:
+        return Response({'error': 'days must be an integer'}, status=400)
+    if not 1 <= days <= TRENDS_MAX_DAYS[granularity]:
+        return Response(
+            {'error': f'days must be between 1 and {TRENDS_MAX_DAYS[granularity]} for {granularity.lower()} trends'},
+            status=400
+        )
+
+    trends = get_rollup_trends(granularity, days, request.GET.get('type'))
     return Response(trends)
 
 
+@cached_endpoint('report')
 @api_view(['GET'])
 def generate_pdf(request):
-    dataset = Dataset.objects.order_by('-uploaded_at').first()
+    datasets = Dataset.objects.order_by('-uploaded_at')
+    dataset_id = request.GET.get('dataset')
+    dataset = datasets.filter(id=dataset_id).first() if dataset_id else datasets.first()
 
     if not dataset:
         return Response({"error": "No data available"}, status=400)
 
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    story = []
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#667eea'),
-        spaceAfter=30,
-        alignment=1
-    )
-    
-    story.append(Paragraph("Chemical Equipment Analysis Report", title_style))
-    story.append(Paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
-    story.append(Spacer(1, 0.3*inch))
-    
-    summary_data = [
-        ['Metric', 'Value'],
-        ['Total Records', str(dataset.total_records)],
-        ['Average Flowrate', f'{dataset.avg_flowrate:.2f} L/min'],
-        ['Average Pressure', f'{dataset.avg_pressure:.2f} bar'],
-        ['Average Temperature', f'{dataset.avg_temperature:.2f}°C'],
-    ]
-    
-    summary_table = Table(summary_data, colWidths=[3*inch, 3*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    story.append(summary_table)
-    doc.build(story)
-    
-    buffer.seek(0)
-    response = HttpResponse(buffer, content_type='application/pdf')
-    response['Content-Disposition'] = 'attachment; filename="equipment_report.pdf"'
+    # Existing clients expect the PDF itself, so only ?async=1 callers get a 202 while it renders
+    asynchronous = request.GET.get('async') == '1'
+    path = get_report(dataset, timeout=settings.EQUIPMENT_REPORT_WAIT_SECONDS if asynchronous else None)
+    if path is None:
+        response = Response({
+            'status': 'PENDING',
+            'dataset_id': dataset.id,
+            'message': 'Report is being generated, retry shortly'
+        }, status=202)
+        response['Retry-After'] = '5'
+        return response
 
-    return response
+    return FileResponse(
+        open(path, 'rb'),
+        as_attachment=True,
+        filename='equipment_report.pdf',
+        content_type='application/pdf'
+    )
 
 
+@cached_endpoint('excel')
 @api_view(['GET'])
 def export_to_excel(request):
     try:
-        from .models import Dataset, EquipmentParameter, EquipmentRanking, EquipmentAlert
-        
-        dataset = Dataset.objects.order_by('-uploaded_at').first()
+        datasets = Dataset.objects.order_by('-uploaded_at')
+        dataset_id = request.GET.get('dataset')
+        dataset = datasets.filter(id=dataset_id).first() if dataset_id else datasets.first()
         
         if not dataset:
             return Response({'error': 'No data available'}, status=400)
         
-        wb = Workbook()
-        ws_summary = wb.active
-        ws_summary.title = "Summary"
-        
-        header_fill = PatternFill(start_color="667EEA", end_color="667EEA", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=12)
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        ws_summary['A1'] = "Equipment Analysis Report"
-        ws_summary['A1'].font = Font(bold=True, size=16, color="667EEA")
-        ws_summary.merge_cells('A1:B1')
-        
-        ws_summary['A3'] = "Generated"
-        ws_summary['B3'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        ws_summary['A5'] = "Metric"
-        ws_summary['B5'] = "Value"
-        ws_summary['A5'].fill = header_fill
-        ws_summary['B5'].fill = header_fill
-        ws_summary['A5'].font = header_font
-        ws_summary['B5'].font = header_font
+        # Spooled to a temp file and streamed back, so the workbook never sits in RAM
+        output = tempfile.TemporaryFile()
+        write_workbook(dataset, output)
+        output.seek(0)
         
-        summary_data = [
-            ["Total Records", dataset.total_records],
-            ["Average Flowrate (L/min)", round(dataset.avg_flowrate, 2)],
-            ["Average Pressure (bar)", round(dataset.avg_pressure, 2)],
-            ["Average Temperature (°C)", round(dataset.avg_temperature, 2)],
-        ]
-        
-        row = 6
-        for metric, value in summary_data:
-            ws_summary[f'A{row}'] = metric
-            ws_summary[f'B{row}'] = value
-            row += 1
-        
-        ws_summary.column_dimensions['A'].width = 30
-        ws_summary.column_dimensions['B'].width = 20
-        
-        buffer = BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-        
-        response = HttpResponse(
-            buffer,
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=f'equipment_analysis_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx',
             content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
         )
-        response['Content-Disposition'] = f'attachment; filename="equipment_analysis_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx"'
-        
-        return response
         
     except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"Excel export error: {error_details}")
-        return Response({
-            'error': f'Failed to generate Excel report: {str(e)}',
-            'details': error_details
-        }, status=500)
+        logger.exception("Excel export failed")
+        return Response({'error': f'Failed to generate Excel report: {str(e)}'}, status=500)
+
+
+# Bounded to stay well inside database parameter limits for one IN (...) clause
+MAX_BULK_RESOLVE_IDS = 10000
+
+HISTORY_DEFAULT_POINTS = 500
+HISTORY_MAX_POINTS = 5000
+HISTORY_MAX_EQUIPMENT = 20
+MAX_COMPARE_EQUIPMENT = 500
+
+ALERT_FIELDS = (
+    'id', 'equipment_name', 'alert_type', 'parameter', 'value', 'threshold', 'message', 'recommendation',
+    'created_at', 'resolved', 'resolved_at', 'predicted_failure_date', 'confidence_score',
+    'occurrence_count', 'last_seen_at',
+)
+
+
+def _parse_moment(value):
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid date: {value}")
+        moment = datetime.combine(day, datetime.min.time())
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
 
 
+def _parse_ids(value):
+    ids = value.split(',')
+    if len(ids) > MAX_PAGE_SIZE or not all(pk.strip().isdigit() for pk in ids):
+        raise ValueError(f"ids must be at most {MAX_PAGE_SIZE} comma-separated alert ids")
+    return [int(pk) for pk in ids]
+
+
+@cached_endpoint('alerts')
 @api_view(['GET'])
 def get_alerts(request):
     resolved = request.GET.get('resolved', 'false').lower() == 'true'
-    alerts = EquipmentAlert.objects.filter(resolved=resolved).order_by('-created_at')[:50]
-    
-    data = []
-    for alert in alerts:
-        data.append({
-            'id': alert.id,
-            'equipment_name': alert.equipment_name,
-            'alert_type': alert.alert_type,
-            'parameter': alert.parameter,
-            'value': alert.value,
-            'threshold': alert.threshold,
-            'message': alert.message,
-            'recommendation': alert.recommendation,
-            'created_at': alert.created_at,
-            'resolved': alert.resolved,
-            'resolved_at': alert.resolved_at,
-            'predicted_failure_date': alert.predicted_failure_date,
-            'confidence_score': alert.confidence_score
-        })
-    
-    return Response(data)
+    alerts = EquipmentAlert.objects.filter(resolved=resolved)
+
+    for param in ('alert_type', 'equipment_name', 'parameter'):
+        if request.GET.get(param):
+            alerts = alerts.filter(**{param: request.GET[param]})
+
+    try:
+        if request.GET.get('since'):
+            alerts = alerts.filter(created_at__gte=_parse_moment(request.GET['since']))
+        if request.GET.get('until'):
+            alerts = alerts.filter(created_at__lt=_parse_moment(request.GET['until']))
+        # Unlike since, also matches older alerts that a later upload repeated or escalated
+        if request.GET.get('seen_since'):
+            alerts = alerts.filter(last_seen_at__gte=_parse_moment(request.GET['seen_since']))
+        if request.GET.get('ids'):
+            alerts = alerts.filter(id__in=_parse_ids(request.GET['ids']))
+        limit = int(request.GET.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=400)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return Response({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}, status=400)
+
+    try:
+        data, next_cursor = keyset_page(
+            alerts.values(*ALERT_FIELDS), 'created_at', request.GET.get('cursor'), limit
+        )
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=400)
+
+    # The body stays a plain list for existing clients; the next page is advertised in headers
+    response = Response(data)
+    if next_cursor:
+        params = request.GET.copy()
+        params['cursor'] = next_cursor
+        response['X-Next-Cursor'] = next_cursor
+        response['Link'] = f'<{request.build_absolute_uri(request.path)}?{params.urlencode()}>; rel="next"'
+    return response
+
+
+def _resolved_fields(request):
+    return {
+        'resolved': True,
+        'resolved_at': timezone.now(),
+        'resolved_by': request.user if request.user.is_authenticated else None,
+    }
 
 
 @api_view(['POST'])
 def resolve_alert(request, alert_id):
-    try:
-        alert = EquipmentAlert.objects.get(id=alert_id)
-        alert.resolved = True
-        alert.resolved_at = datetime.now()
-        alert.save()
-        return Response({'success': True, 'message': 'Alert resolved'})
-    except EquipmentAlert.DoesNotExist:
+    if not EquipmentAlert.objects.filter(id=alert_id).update(**_resolved_fields(request)):
         return Response({'error': 'Alert not found'}, status=404)
+    bump_generation()
+    return Response({'success': True, 'message': 'Alert resolved'})
+
+
+@api_view(['POST'])
+def resolve_alerts(request):
+    """Resolve open alerts by id list and/or filter with a single UPDATE."""
+    ids = request.data.get('ids')
+    alerts = EquipmentAlert.objects.filter(resolved=False)
+    criteria = 0
+
+    if ids is not None:
+        if not isinstance(ids, list) or not all(isinstance(pk, int) for pk in ids):
+            return Response({'error': 'ids must be a list of alert ids'}, status=400)
+        if len(ids) > MAX_BULK_RESOLVE_IDS:
+            return Response({'error': f'At most {MAX_BULK_RESOLVE_IDS} ids per request'}, status=400)
+        alerts = alerts.filter(id__in=ids)
+        criteria += 1
+
+    for param in ('alert_type', 'equipment_name', 'parameter'):
+        if request.data.get(param):
+            alerts = alerts.filter(**{param: request.data[param]})
+            criteria += 1
+
+    if request.data.get('older_than'):
+        try:
+            alerts = alerts.filter(created_at__lt=_parse_moment(str(request.data['older_than'])))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        criteria += 1
+
+    if not criteria:
+        return Response(
+            {'error': 'Provide ids or at least one of alert_type, equipment_name, parameter, older_than'},
+            status=400
+        )
+
+    resolved = alerts.update(**_resolved_fields(request))
+    if resolved:
+        bump_generation()
+
+    result = {'success': True, 'resolved': resolved}
+    if ids is not None:
+        result['requested'] = len(ids)
+        result['skipped'] = len(ids) - resolved
+    return Response(result)
 
 
 @api_view(['POST'])
 def compare_equipment(request):
-    equipment_names = request.data.get('equipment_names', [])
-    
+    """Compare equipment in the latest dataset, or across every dataset in a since/until range.
+
+    The range mode returns per-parameter mean, min, max, p95, stdev and
+    latest value for each equipment, computed in one grouped pass.
+    """
+    equipment_names = list(dict.fromkeys(request.data.get('equipment_names', [])))
+
     if len(equipment_names) < 2:
         return Response({'error': 'Select at least 2 equipment'}, status=400)
-    
+    if len(equipment_names) > MAX_COMPARE_EQUIPMENT:
+        return Response({'error': f'At most {MAX_COMPARE_EQUIPMENT} equipment per comparison'}, status=400)
+
+    if request.data.get('since') or request.data.get('until'):
+        readings = EquipmentParameter.objects.filter(equipment_name__in=equipment_names)
+        try:
+            if request.data.get('since'):
+                readings = readings.filter(recorded_at__gte=_parse_moment(str(request.data['since'])))
+            if request.data.get('until'):
+                readings = readings.filter(recorded_at__lt=_parse_moment(str(request.data['until'])))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
+        comparison = compare_statistics(load_readings(readings))
+        found = {entry['name'] for entry in comparison}
+        return Response({
+            'equipment': comparison,
+            'missing': [name for name in equipment_names if name not in found],
+        })
+
     latest_dataset = Dataset.objects.order_by('-uploaded_at').first()
     
     if not latest_dataset:
         return Response({'error': 'No data available'}, status=400)
     
+    frame = read_columns(
+        latest_dataset.id,
+        ['equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature', 'health_score'],
+        filters=[('equipment_name', 'in', equipment_names)]
+    )
+    if frame is not None:
+        frame.columns = ['name', 'type', 'flowrate', 'pressure', 'temperature', 'health_score']
+        # A name listed twice in one upload is compared on its last reading
+        return Response(frame.drop_duplicates('name', keep='last').to_dict('records'))
+
     equipment_data = EquipmentParameter.objects.filter(
         dataset=latest_dataset,
         equipment_name__in=equipment_names
-    )
+    ).order_by('id')
     
-    comparison = []
+    comparison = {}
     for eq in equipment_data:
-        comparison.append({
+        comparison[eq.equipment_name] = {
             'name': eq.equipment_name,
             'type': eq.equipment_type,
             'flowrate': eq.flowrate,
             'pressure': eq.pressure,
             'temperature': eq.temperature,
             'health_score': eq.health_score
-        })
+        }
     
-    return Response(comparison)
+    return Response(list(comparison.values()))
+
+
+@cached_endpoint('history')
+@api_view(['GET'])
+def get_equipment_history(request):
+    """Readings of the given equipment across all datasets, downsampled per parameter to ``points`` samples."""
+    names = [name for value in request.GET.getlist('names') for name in value.split(',') if name.strip()]
+    names = list(dict.fromkeys(name.strip() for name in names))
+    if not names:
+        return Response({'error': 'names is required'}, status=400)
+    if len(names) > HISTORY_MAX_EQUIPMENT:
+        return Response({'error': f'At most {HISTORY_MAX_EQUIPMENT} equipment per request'}, status=400)
+
+    method = request.GET.get('method', 'lttb').lower()
+    if method not in DOWNSAMPLING_METHODS:
+        return Response({'error': 'method must be one of: lttb, minmax'}, status=400)
+    try:
+        points = int(request.GET.get('points', HISTORY_DEFAULT_POINTS))
+    except ValueError:
+        return Response({'error': 'points must be an integer'}, status=400)
+    if not 3 <= points <= HISTORY_MAX_POINTS:
+        return Response({'error': f'points must be between 3 and {HISTORY_MAX_POINTS}'}, status=400)
+
+    readings = EquipmentParameter.objects.filter(equipment_name__in=names)
+    try:
+        if request.GET.get('since'):
+            readings = readings.filter(recorded_at__gte=_parse_moment(request.GET['since']))
+        if request.GET.get('until'):
+            readings = readings.filter(recorded_at__lt=_parse_moment(request.GET['until']))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=400)
+
+    frame = load_readings(readings)
+
+    history = {name: {'total': 0, 'series': {field: {'t': [], 'v': []} for field in READING_FIELDS}} for name in names}
+    for name, rows in frame.groupby('equipment_name', sort=False):
+        times = pd.DatetimeIndex(rows['recorded_at'])
+        seconds = (times - times[0]).total_seconds().to_numpy()
+        series = history[name]['series']
+        for field in READING_FIELDS:
+            values = rows[field].to_numpy()
+            kept = downsample(seconds, values, points, method)
+            series[field] = {'t': [moment.isoformat() for moment in times[kept]], 'v': values[kept].tolist()}
+        history[name]['total'] = len(rows)
+
+    return Response({'points': points, 'method': method, 'equipment': history})
 
 
 @api_view(['GET'])
@@ -389,19 +484,22 @@ def update_maintenance_status(request, schedule_id):
             schedule.completed_at = datetime.now()
         
         schedule.save()
+        bump_generation()
         return Response({'success': True})
     except MaintenanceSchedule.DoesNotExist:
         return Response({'error': 'Schedule not found'}, status=404)
 
 
+@cached_endpoint('rankings')
 @api_view(['GET'])
 def get_equipment_rankings(request):
-    rankings = EquipmentRanking.objects.all()[:20]
+    # Same order as the stored ranks (and ranking_score_idx), so ties come back stably
+    rankings = EquipmentRanking.objects.order_by('-overall_score', 'id')[:20]
     
     data = []
-    for i, ranking in enumerate(rankings, start=1):
+    for ranking in rankings:
         data.append({
-            'rank': i,
+            'rank': ranking.efficiency_rank,
             'equipment_name': ranking.equipment_name,
             'equipment_type': ranking.equipment_type,
             'overall_score': ranking.overall_score,
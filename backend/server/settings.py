@@ -30,6 +30,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'equipment.instrumentation.InstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -134,6 +135,75 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'equipment.instrumentation.InstrumentedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Equipment CSV ingest
+EQUIPMENT_INGEST_CHUNK_SIZE = int(os.environ.get('EQUIPMENT_INGEST_CHUNK_SIZE', 50000))
+# Background ingest jobs run on a local thread pool; 0 runs them inline
+EQUIPMENT_INGEST_WORKERS = int(os.environ.get('EQUIPMENT_INGEST_WORKERS', 2))
+EQUIPMENT_INGEST_UPLOAD_DIR = Path(os.environ.get('EQUIPMENT_INGEST_UPLOAD_DIR', BASE_DIR / 'ingest_uploads'))
+# A RUNNING job whose worker has not reported for this long is marked failed
+EQUIPMENT_INGEST_STALE_SECONDS = float(os.environ.get('EQUIPMENT_INGEST_STALE_SECONDS', 300))
+
+# Response cache for the read endpoints: 'locmem' (per-process LRU) or 'file'
+RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'locmem')
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 3600))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'equipment-responses',
+        'TIMEOUT': RESPONSE_CACHE_TIMEOUT,
+        'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 500))},
+    },
 }
 
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
+if RESPONSE_CACHE_BACKEND == 'file':
+    CACHES['responses'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('RESPONSE_CACHE_DIR', str(BASE_DIR / 'response_cache')),
+        'TIMEOUT': RESPONSE_CACHE_TIMEOUT,
+    }
+
+# PDF reports are rendered on a background pool and kept on disk per dataset
+EQUIPMENT_REPORT_DIR = Path(os.environ.get('EQUIPMENT_REPORT_DIR', BASE_DIR / 'report_cache'))
+EQUIPMENT_REPORT_WORKERS = int(os.environ.get('EQUIPMENT_REPORT_WORKERS', 1))
+EQUIPMENT_REPORT_WAIT_SECONDS = float(os.environ.get('EQUIPMENT_REPORT_WAIT_SECONDS', 5))
+
+# Per-request latency and SQL instrumentation, exposed at /api/metrics/ when enabled
+EQUIPMENT_INSTRUMENTATION = os.environ.get('EQUIPMENT_INSTRUMENTATION', 'False') == 'True'
+EQUIPMENT_METRICS_ALLOWED_IPS = os.environ.get('EQUIPMENT_METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+EQUIPMENT_SLOW_REQUEST_MS = float(os.environ.get('EQUIPMENT_SLOW_REQUEST_MS', 250))
+EQUIPMENT_SLOW_REQUEST_LOG = Path(os.environ.get('EQUIPMENT_SLOW_REQUEST_LOG', BASE_DIR / 'instrumentation' / 'slow_requests.jsonl'))
+# The log is rotated at this size (0 disables rotation), keeping this many older copies
+EQUIPMENT_SLOW_REQUEST_LOG_MAX_BYTES = int(os.environ.get('EQUIPMENT_SLOW_REQUEST_LOG_MAX_BYTES', 10 * 1024 * 1024))
+EQUIPMENT_SLOW_REQUEST_LOG_BACKUPS = int(os.environ.get('EQUIPMENT_SLOW_REQUEST_LOG_BACKUPS', 3))
+
+# Optional Parquet copy of each upload (needs pyarrow), read by comparisons and exports
+EQUIPMENT_COLUMNAR_STORE = os.environ.get('EQUIPMENT_COLUMNAR_STORE', 'False') == 'True'
+EQUIPMENT_COLUMNAR_DIR = Path(os.environ.get('EQUIPMENT_COLUMNAR_DIR', BASE_DIR / 'columnar_store'))
+EQUIPMENT_COLUMNAR_COMPRESSION = os.environ.get('EQUIPMENT_COLUMNAR_COMPRESSION', 'zstd')
+
+# Batch uploads: CSVs are parsed in a process pool (0 parses inline) and saved
+# EQUIPMENT_BATCH_TRANSACTION_SIZE files per transaction
+EQUIPMENT_BATCH_WORKERS = int(os.environ.get('EQUIPMENT_BATCH_WORKERS', min(4, os.cpu_count() or 1)))
+EQUIPMENT_BATCH_TRANSACTION_SIZE = int(os.environ.get('EQUIPMENT_BATCH_TRANSACTION_SIZE', 25))
+EQUIPMENT_BATCH_MAX_BYTES = int(os.environ.get('EQUIPMENT_BATCH_MAX_BYTES', 1024 ** 3))
+DATA_UPLOAD_MAX_NUMBER_FILES = int(os.environ.get('DATA_UPLOAD_MAX_NUMBER_FILES', 1000))
+
+# New alerts opened per upload before further faults are folded into one storm alert per parameter
+EQUIPMENT_ALERT_STORM_LIMIT = int(os.environ.get('EQUIPMENT_ALERT_STORM_LIMIT', 1000))
+
+# Predictive alerts from per-equipment linear trends (manage.py forecast_failures)
+EQUIPMENT_FORECAST_HORIZON_DAYS = float(os.environ.get('EQUIPMENT_FORECAST_HORIZON_DAYS', 30))
+EQUIPMENT_FORECAST_LOOKBACK_DAYS = float(os.environ.get('EQUIPMENT_FORECAST_LOOKBACK_DAYS', 90))
+EQUIPMENT_FORECAST_MIN_CONFIDENCE = float(os.environ.get('EQUIPMENT_FORECAST_MIN_CONFIDENCE', 0.5))
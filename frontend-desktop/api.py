@@ -0,0 +1,84 @@
+import os
+import threading
+import uuid
+
+import requests
+from requests.adapters import HTTPAdapter
+
+API_URL = "http://127.0.0.1:8000/api"
+AUTH = ("vinayak", "test@1234")
+
+# Bytes read from disk per multipart chunk while streaming an upload
+CHUNK_SIZE = 256 * 1024
+
+_local = threading.local()
+
+
+class Cancelled(Exception):
+    pass
+
+
+def session():
+    """This thread's persistent Session, so repeated calls reuse one keep-alive connection."""
+    if not hasattr(_local, 'session'):
+        http = requests.Session()
+        http.auth = AUTH
+        http.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        http.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        _local.session = http
+    return _local.session
+
+
+class MultipartFile:
+    """A single-file multipart/form-data body streamed from disk.
+
+    requests sends any object with ``read`` and ``__len__`` with a
+    Content-Length, pulling it in small blocks instead of loading the file
+    into memory. ``on_read(sent, total)`` runs after every block and may
+    raise ``Cancelled`` to abort the request.
+    """
+
+    def __init__(self, path, field='file', on_read=None):
+        boundary = uuid.uuid4().hex
+        self.path = path
+        self.content_type = f'multipart/form-data; boundary={boundary}'
+        self.on_read = on_read
+        self._head = (
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{field}"; filename="{os.path.basename(path)}"\r\n'
+            'Content-Type: text/csv\r\n\r\n'
+        ).encode()
+        self._tail = f'\r\n--{boundary}--\r\n'.encode()
+        self._length = len(self._head) + os.path.getsize(path) + len(self._tail)
+        self._segments = self._read_segments()
+        self._buffer = b''
+        self._sent = 0
+
+    def __len__(self):
+        return self._length
+
+    def _read_segments(self):
+        yield self._head
+        with open(self.path, 'rb') as f:
+            while True:
+                block = f.read(CHUNK_SIZE)
+                if not block:
+                    break
+                yield block
+        yield self._tail
+
+    def read(self, size=-1):
+        while size is None or size < 0 or len(self._buffer) < size:
+            segment = next(self._segments, None)
+            if segment is None:
+                break
+            self._buffer += segment
+
+        if size is None or size < 0:
+            chunk, self._buffer = self._buffer, b''
+        else:
+            chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        self._sent += len(chunk)
+        if self.on_read:
+            self.on_read(self._sent, self._length)
+        return chunk
@@ -1,18 +1,49 @@
+import os
 import sys
-import requests
-import pandas as pd
+import threading
 import csv
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
     QPushButton, QFileDialog, QLabel, QFrame, QGridLayout,
-    QTableWidget, QTableWidgetItem, QLineEdit, QComboBox,
-    QMessageBox, QHeaderView
+    QTableView, QTableWidget, QTableWidgetItem, QLineEdit, QComboBox,
+    QMessageBox, QHeaderView, QProgressBar
 )
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtCore import Qt, QThreadPool, QTimer
+from PyQt5.QtGui import QFont
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
+
+from charts import KINDS, DistributionChart, TrendChart
+from live import MAX_ALERTS, LiveMonitor, last_seen
+from table_model import EquipmentSortFilterProxy, EquipmentTableModel
+from workers import ParseTask, UploadTask
+
+UPLOAD_STAGES = {'upload': "Uploading", 'process': "Processing"}
+
+# Quiet period after the last keystroke before the table is searched
+SEARCH_DEBOUNCE_MS = 150
+
+ALERT_HEADERS = ["Last Seen", "Equipment", "Type", "Parameter", "Count", "Message"]
+RANKING_HEADERS = ["Rank", "Equipment", "Type", "Score"]
+
+LIVE_TABLE_STYLE = """
+    QTableWidget {
+        background: white;
+        color: #1e293b;
+        border-radius: 10px;
+        border: none;
+        gridline-color: #e2e8f0;
+    }
+    QHeaderView::section {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+            stop:0 #667eea, stop:1 #764ba2);
+        color: white;
+        padding: 8px;
+        border: none;
+        font-weight: bold;
+        font-size: 12px;
+    }
+"""
 
 
 class StatCard(QFrame):
@@ -81,7 +112,8 @@ class StatCard(QFrame):
         self.setLayout(layout)
     
     def update_value(self, value):
-        self.value_widget.setText(value)
+        if value != self.value_widget.text():
+            self.value_widget.setText(value)
 
 
 class App(QWidget):
@@ -89,7 +121,6 @@ class App(QWidget):
         super().__init__()
         self.setWindowTitle("Chemical Equipment Visualizer - Advanced")
         self.setMinimumSize(1100, 800)
-        self.raw_data = []
         
         # Set modern color scheme
         self.setStyleSheet("""
@@ -186,6 +217,47 @@ class App(QWidget):
             }
         """)
         upload_layout.addWidget(self.button)
+
+        self.upload_progress = QProgressBar()
+        self.upload_progress.setVisible(False)
+        self.upload_progress.setStyleSheet("""
+            QProgressBar {
+                background: #e2e8f0;
+                border: none;
+                border-radius: 8px;
+                color: #1e293b;
+                font-size: 12px;
+                font-weight: bold;
+                text-align: center;
+                min-width: 220px;
+            }
+            QProgressBar::chunk {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 #667eea, stop:1 #764ba2);
+                border-radius: 8px;
+            }
+        """)
+        upload_layout.addWidget(self.upload_progress)
+
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self.cancel_upload)
+        self.cancel_btn.setVisible(False)
+        self.cancel_btn.setCursor(Qt.PointingHandCursor)
+        self.cancel_btn.setStyleSheet("""
+            QPushButton {
+                background: #ef4444;
+                color: white;
+                border: none;
+                border-radius: 10px;
+                padding: 15px 25px;
+                font-size: 13px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background: #dc2626;
+            }
+        """)
+        upload_layout.addWidget(self.cancel_btn)
         
         # Export buttons
         self.export_csv_btn = QPushButton("📊 Export CSV")
@@ -212,6 +284,27 @@ class App(QWidget):
             }
         """)
         upload_layout.addWidget(self.export_csv_btn)
+
+        self.live_btn = QPushButton("📡 Live")
+        self.live_btn.setCheckable(True)
+        self.live_btn.toggled.connect(self.toggle_live)
+        self.live_btn.setCursor(Qt.PointingHandCursor)
+        self.live_btn.setStyleSheet("""
+            QPushButton {
+                background: #94a3b8;
+                color: white;
+                border: none;
+                border-radius: 10px;
+                padding: 15px 25px;
+                font-size: 13px;
+                font-weight: bold;
+            }
+            QPushButton:checked {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+                    stop:0 #f093fb, stop:1 #f5576c);
+            }
+        """)
+        upload_layout.addWidget(self.live_btn)
         
         self.file_name_label = QLabel("")
         self.file_name_label.setAlignment(Qt.AlignCenter)
@@ -305,6 +398,7 @@ class App(QWidget):
         
         self.figure = Figure(facecolor='white')
         self.canvas = FigureCanvas(self.figure)
+        self.chart = DistributionChart(self.canvas)
         chart_layout.addWidget(self.canvas)
         
         chart_frame.setLayout(chart_layout)
@@ -333,7 +427,11 @@ class App(QWidget):
         
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search equipment name or type...")
-        self.search_input.textChanged.connect(self.filter_table)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.filter_table)
+        self.search_input.textChanged.connect(lambda _: self.search_timer.start())
         self.search_input.setStyleSheet("""
             QLineEdit {
                 padding: 10px 15px;
@@ -370,22 +468,30 @@ class App(QWidget):
         details_layout.addWidget(filter_frame)
         
         # Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["Equipment Name", "Type", "Flowrate", "Pressure", "Temperature", "Status"])
+        # Rows are drawn straight from the model's columnar buffer, only as they scroll into view
+        self.table_model = EquipmentTableModel(self)
+        self.table_proxy = EquipmentSortFilterProxy(self)
+        self.table_proxy.setSourceModel(self.table_model)
+        self.table = QTableView()
+        self.table.setModel(self.table_proxy)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setWordWrap(False)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(36)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background: white;
+                color: #1e293b;
                 border-radius: 10px;
                 border: none;
                 gridline-color: #e2e8f0;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 10px;
-                color: #1e293b;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background: rgba(102, 126, 234, 0.2);
             }
             QHeaderView::section {
@@ -402,14 +508,68 @@ class App(QWidget):
         
         details_tab.setLayout(details_layout)
         
+        # Tab 3: Live Monitor
+        live_tab = QWidget()
+        live_layout = QVBoxLayout()
+
+        self.live_status = QLabel("Live monitoring off")
+        self.live_status.setStyleSheet("color: #64748b; font-size: 12px; font-weight: bold; padding: 5px;")
+        live_layout.addWidget(self.live_status)
+
+        self.trend_figure = Figure(facecolor='white')
+        self.trend_canvas = FigureCanvas(self.trend_figure)
+        self.trend_chart = TrendChart(self.trend_canvas)
+        live_layout.addWidget(self.trend_canvas, 2)
+
+        live_tables = QHBoxLayout()
+        self.alerts_table = self.make_live_table(ALERT_HEADERS)
+        self.rankings_table = self.make_live_table(RANKING_HEADERS)
+        live_tables.addWidget(self.alerts_table, 3)
+        live_tables.addWidget(self.rankings_table, 2)
+        live_layout.addLayout(live_tables, 1)
+
+        live_tab.setLayout(live_layout)
+
         self.tabs.addTab(dashboard_tab, "📊 Dashboard")
         self.tabs.addTab(details_tab, "🔍 Equipment Details")
+        self.tabs.addTab(live_tab, "📡 Live Monitor")
         
         main_layout.addWidget(self.tabs)
         
         self.setLayout(main_layout)
         self.current_data = None
 
+        # Parsing, uploading and live polls run here, off the GUI thread. Threads
+        # never expire, so each keeps its HTTP session and connection alive.
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(3)
+        self.pool.setExpiryTimeout(-1)
+        self.cancel_event = None
+        self.upload_tasks = []
+
+        self.live = LiveMonitor(self.pool, self)
+        self.live.status_changed.connect(self.live_status.setText)
+        self.live.trends_changed.connect(self.on_live_trends)
+        self.live.alerts_changed.connect(self.on_live_alerts)
+        self.live.alerts_resolved.connect(self.on_live_alerts_resolved)
+        self.live.rankings_changed.connect(self.on_live_rankings)
+
+    def make_live_table(self, headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.setSelectionBehavior(QTableWidget.SelectRows)
+        table.setWordWrap(False)
+        table.verticalHeader().setVisible(False)
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        table.setStyleSheet(LIVE_TABLE_STYLE)
+        return table
+
+    def closeEvent(self, event):
+        self.live.stop()
+        super().closeEvent(event)
+
     def upload_file(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Open CSV", "", "CSV Files (*.csv)"
@@ -418,146 +578,185 @@ class App(QWidget):
         if not file_path:
             return
 
-        import os
-        self.file_name_label.setText(f"✓ {os.path.basename(file_path)}")
-
-        try:
-            # Read CSV for table
-            with open(file_path, 'r') as f:
-                reader = csv.DictReader(f)
-                self.raw_data = list(reader)
-            
-            # Upload to server
-            files = {"file": open(file_path, "rb")}
-            response = requests.post(
-                "http://127.0.0.1:8000/api/upload/",
-                files=files,
-                auth=("vinayak", "test@1234")
-            )
-
-            data = response.json()
-            self.current_data = data
-
-            # Update stat cards
-            self.stat_cards['records'].update_value(str(data['total_records']))
-            self.stat_cards['flowrate'].update_value(f"{data['avg_flowrate']:.2f}")
-            self.stat_cards['pressure'].update_value(f"{data['avg_pressure']:.2f}")
-            self.stat_cards['temperature'].update_value(f"{data['avg_temperature']:.2f}")
-
-            # Update chart
-            self.update_chart(data)
-            
-            # Populate table
-            self.populate_table()
-            
-            # Enable export
-            self.export_csv_btn.setEnabled(True)
-            
-            QMessageBox.information(self, "Success", "Data uploaded and analyzed successfully!")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to upload file:\n{str(e)}")
-            self.file_name_label.setText(f"❌ Error: {str(e)}")
-            self.file_name_label.setStyleSheet("color: #ef4444; font-size: 12px; padding: 5px;")
+        self.file_name_label.setText(f"⏳ {os.path.basename(file_path)}")
+
+        # The table is filled from a local parse while the server ingests its own copy
+        self.cancel_event = threading.Event()
+        parse = ParseTask(file_path, self.cancel_event)
+        parse.signals.finished.connect(self.on_parse_finished)
+        parse.signals.failed.connect(self.on_upload_failed)
+
+        upload = UploadTask(file_path, self.cancel_event)
+        upload.signals.progress.connect(self.on_upload_progress)
+        upload.signals.finished.connect(self.on_upload_finished)
+        upload.signals.failed.connect(self.on_upload_failed)
+        upload.signals.cancelled.connect(self.on_upload_cancelled)
+
+        self.upload_tasks = [parse, upload]
+        self.set_uploading(True)
+        for task in self.upload_tasks:
+            self.pool.start(task)
+
+    def cancel_upload(self):
+        if self.cancel_event:
+            self.cancel_event.set()
+            self.cancel_btn.setEnabled(False)
+            self.file_name_label.setText("⏳ Cancelling...")
+
+    def set_uploading(self, uploading):
+        self.button.setEnabled(not uploading)
+        self.cancel_btn.setEnabled(uploading)
+        self.cancel_btn.setVisible(uploading)
+        self.upload_progress.setVisible(uploading)
+        self.upload_progress.setRange(0, 1000)
+        self.upload_progress.setValue(0)
+
+    def on_upload_progress(self, stage, fraction, detail):
+        if fraction < 0:
+            # Unknown total: busy indicator
+            self.upload_progress.setRange(0, 0)
+        else:
+            self.upload_progress.setRange(0, 1000)
+            self.upload_progress.setValue(int(fraction * 1000))
+        self.upload_progress.setFormat(f"{UPLOAD_STAGES[stage]} %p%")
+        self.file_name_label.setText(f"⏳ {detail}")
+
+    def on_parse_finished(self, result):
+        self.populate_table(*result)
+
+    def on_upload_finished(self, job):
+        self.set_uploading(False)
+        self.file_name_label.setText(f"✓ {job['file_name']}")
+        self.show_summary(job['result'])
+        QMessageBox.information(self, "Success", "Data uploaded and analyzed successfully!")
+
+    def on_upload_failed(self, error):
+        if self.cancel_event.is_set():
+            # The other task of this upload already failed or was cancelled
+            return
+        self.cancel_event.set()
+        self.set_uploading(False)
+        self.show_upload_error(error)
+
+    def on_upload_cancelled(self):
+        if self.button.isEnabled():
+            return
+        # Also stops the local parse when the job was cancelled from elsewhere
+        self.cancel_event.set()
+        self.set_uploading(False)
+        self.file_name_label.setText("✖ Upload cancelled")
+
+    def toggle_live(self, enabled):
+        if enabled:
+            self.live.start()
+        else:
+            self.live.stop()
+
+    def on_live_trends(self, trends):
+        self.trend_chart.set_data(trends)
+
+        # Window totals; buckets weighted by their reading counts
+        counts = [count or 0 for count in trends['count']]
+        self.stat_cards['records'].update_value(str(sum(counts)))
+        for field in ('flowrate', 'pressure', 'temperature'):
+            weighted = [(value, count) for value, count in zip(trends[field], counts) if value is not None and count]
+            total = sum(count for _, count in weighted)
+            if total:
+                self.stat_cards[field].update_value(f"{sum(value * count for value, count in weighted) / total:.2f}")
+
+    def on_live_alerts(self, alerts):
+        # Alerts already shown are updated in place (repeats and escalations);
+        # new ones are inserted above them, newest first as served
+        table = self.alerts_table
+        shown = {table.item(row, 0).data(Qt.UserRole): row for row in range(table.rowCount())}
+        table.setUpdatesEnabled(False)
+        new = []
+        for alert in alerts:
+            if alert['id'] in shown:
+                self.set_alert_row(shown[alert['id']], alert)
+            else:
+                new.append(alert)
+        for offset, alert in enumerate(new[:MAX_ALERTS]):
+            table.insertRow(offset)
+            self.set_alert_row(offset, alert)
+        if table.rowCount() > MAX_ALERTS:
+            table.setRowCount(MAX_ALERTS)
+        table.setUpdatesEnabled(True)
+
+    def on_live_alerts_resolved(self, ids):
+        table = self.alerts_table
+        resolved = set(ids)
+        # Bottom up, so removing a row does not shift the ones still to check
+        for row in reversed(range(table.rowCount())):
+            if table.item(row, 0).data(Qt.UserRole) in resolved:
+                table.removeRow(row)
+
+    def set_alert_row(self, row, alert):
+        table = self.alerts_table
+        cells = [
+            last_seen(alert)[:19].replace('T', ' '), alert['equipment_name'], alert['alert_type'],
+            alert['parameter'], alert['occurrence_count'], alert['message'],
+        ]
+        for column, text in enumerate(cells):
+            item = table.item(row, column)
+            if item is None:
+                table.setItem(row, column, QTableWidgetItem(str(text)))
+            elif item.text() != str(text):
+                item.setText(str(text))
+        table.item(row, 0).setData(Qt.UserRole, alert['id'])
+
+    def on_live_rankings(self, rankings):
+        # Only the cells whose text changed are touched
+        table = self.rankings_table
+        table.setRowCount(len(rankings))
+        for row, ranking in enumerate(rankings):
+            cells = [
+                ranking['rank'], ranking['equipment_name'], ranking['equipment_type'],
+                f"{ranking['overall_score']:.1f}",
+            ]
+            for column, text in enumerate(cells):
+                item = table.item(row, column)
+                if item is None:
+                    table.setItem(row, column, QTableWidgetItem(str(text)))
+                elif item.text() != str(text):
+                    item.setText(str(text))
+
+    def show_summary(self, data):
+        self.current_data = data
+
+        # Update stat cards
+        self.stat_cards['records'].update_value(str(data['total_records']))
+        self.stat_cards['flowrate'].update_value(f"{data['avg_flowrate']:.2f}")
+        self.stat_cards['pressure'].update_value(f"{data['avg_pressure']:.2f}")
+        self.stat_cards['temperature'].update_value(f"{data['avg_temperature']:.2f}")
+
+        # Update chart
+        self.update_chart(data)
+        
+        # Enable export
+        self.export_csv_btn.setEnabled(True)
+
+    def show_upload_error(self, error):
+        QMessageBox.critical(self, "Error", f"Failed to upload file:\n{str(error)}")
+        self.file_name_label.setText(f"❌ Error: {str(error)}")
+        self.file_name_label.setStyleSheet("color: #ef4444; font-size: 12px; padding: 5px;")
 
     def update_chart(self, data):
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        
-        colors = ['#667eea', '#764ba2', '#f093fb', '#4facfe', '#43e97b', '#fa709a', '#fee140', '#30cfd0']
-        
-        labels = list(data["type_distribution"].keys())
-        values = list(data["type_distribution"].values())
-        
-        chart_idx = self.chart_type.currentIndex()
-        
-        if chart_idx == 0:  # Bar
-            bars = ax.bar(labels, values, color=colors[:len(labels)], edgecolor='white', linewidth=2, alpha=0.9)
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height, f'{int(height)}',
-                       ha='center', va='bottom', fontweight='bold', color='#1e293b', fontsize=10)
-        elif chart_idx == 1:  # Line
-            ax.plot(labels, values, marker='o', linewidth=3, markersize=10, color='#667eea')
-            ax.fill_between(range(len(labels)), values, alpha=0.3, color='#667eea')
-            for i, v in enumerate(values):
-                ax.text(i, v, f'{int(v)}', ha='center', va='bottom', fontweight='bold')
-        else:  # Pie
-            ax.pie(values, labels=labels, colors=colors[:len(labels)], autopct='%1.1f%%',
-                  startangle=90, textprops={'fontweight': 'bold', 'color': 'white'})
-        
-        ax.set_xlabel('Equipment Type', fontsize=12, fontweight='bold', color='#1e293b')
-        ax.set_ylabel('Count', fontsize=12, fontweight='bold', color='#1e293b')
-        ax.set_title('Equipment Distribution', fontsize=14, fontweight='bold', color='#1e293b', pad=20)
-        
-        if chart_idx != 2:
-            ax.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
-            ax.set_axisbelow(True)
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-        
-        self.figure.tight_layout()
-        self.canvas.draw()
+        self.chart.set_data(data["type_distribution"])
     
     def update_chart_type(self):
-        if self.current_data:
-            self.update_chart(self.current_data)
-    
-    def populate_table(self):
-        self.table.setRowCount(len(self.raw_data))
-        
-        for row, item in enumerate(self.raw_data):
-            self.table.setItem(row, 0, QTableWidgetItem(item.get('Equipment Name', '')))
-            self.table.setItem(row, 1, QTableWidgetItem(item.get('Type', '')))
-            
-            flowrate = float(item.get('Flowrate', 0))
-            pressure = float(item.get('Pressure', 0))
-            temperature = float(item.get('Temperature', 0))
-            
-            self.table.setItem(row, 2, QTableWidgetItem(f"{flowrate:.2f}"))
-            self.table.setItem(row, 3, QTableWidgetItem(f"{pressure:.2f}"))
-            self.table.setItem(row, 4, QTableWidgetItem(f"{temperature:.2f}"))
-            
-            # Status
-            status = self.get_status(flowrate, pressure, temperature)
-            status_item = QTableWidgetItem(status)
-            
-            if status == "NORMAL":
-                status_item.setBackground(QColor(16, 185, 129, 50))
-                status_item.setForeground(QColor(5, 150, 105))
-            elif status == "HIGH":
-                status_item.setBackground(QColor(250, 112, 154, 50))
-                status_item.setForeground(QColor(225, 89, 129))
-            else:
-                status_item.setBackground(QColor(254, 225, 64, 50))
-                status_item.setForeground(QColor(229, 202, 39))
-            
-            status_item.setFont(QFont("Segoe UI", 9, QFont.Bold))
-            self.table.setItem(row, 5, status_item)
+        self.chart.show(KINDS[self.chart_type.currentIndex()])
     
-    def get_status(self, flowrate, pressure, temperature):
-        if flowrate < 80 or pressure < 4 or temperature < 100:
-            return "LOW"
-        if flowrate > 150 or pressure > 8 or temperature > 135:
-            return "HIGH"
-        return "NORMAL"
+    def populate_table(self, frame, index):
+        self.table_model.set_frame(frame, index)
     
     def filter_table(self):
-        search_text = self.search_input.text().lower()
-        
-        for row in range(self.table.rowCount()):
-            should_show = False
-            for col in range(2):  # Search in name and type columns
-                item = self.table.item(row, col)
-                if item and search_text in item.text().lower():
-                    should_show = True
-                    break
-            self.table.setRowHidden(row, not should_show)
+        self.table_proxy.set_search(self.search_input.text())
     
     def sort_table(self):
         col_map = {"Name": 0, "Type": 1, "Flowrate": 2, "Pressure": 3, "Temperature": 4}
         col = col_map.get(self.sort_combo.currentText(), 0)
-        self.table.sortItems(col, Qt.DescendingOrder if col > 1 else Qt.AscendingOrder)
+        self.table_proxy.sort(col, Qt.DescendingOrder if col > 1 else Qt.AscendingOrder)
     
     def export_csv(self):
         if not self.current_data:
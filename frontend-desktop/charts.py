@@ -0,0 +1,324 @@
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+
+COLORS = ['#667eea', '#764ba2', '#f093fb', '#4facfe', '#43e97b', '#fa709a', '#fee140', '#30cfd0']
+
+KINDS = ('bar', 'line', 'pie')
+
+TEXT_COLOR = '#1e293b'
+
+
+def decimate(y, max_points):
+    """Indices of the minimum and maximum of each of ``max_points // 2`` equal buckets of ``y``.
+
+    Keeps every spike and both ends while bounding the points drawn; short
+    series are returned whole. NaN samples are never picked.
+    """
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+
+    size = -(-n // max(max_points // 2, 1))
+    buckets = -(-n // size)
+    pad = buckets * size - n
+    lows = np.concatenate([np.where(np.isnan(y), np.inf, y), np.full(pad, np.inf)]).reshape(buckets, size)
+    highs = np.concatenate([np.where(np.isnan(y), -np.inf, y), np.full(pad, -np.inf)]).reshape(buckets, size)
+    starts = np.arange(buckets) * size
+    kept = np.concatenate([[0, n - 1], starts + lows.argmin(axis=1), starts + highs.argmax(axis=1)])
+    return np.unique(np.minimum(kept, n - 1))
+
+
+class DecimatedLine:
+    """A line that hands matplotlib about two points per horizontal pixel.
+
+    The full series (``x`` sorted ascending) is kept and the visible range
+    is re-decimated whenever the data or the x limits change, so drawing
+    cost stays flat however long the series grows.
+    """
+
+    def __init__(self, ax, **kwargs):
+        self.ax = ax
+        self.line, = ax.plot([], [], **kwargs)
+        self.x = self.y = np.zeros(0)
+        ax.callbacks.connect('xlim_changed', lambda ax: self._decimate())
+
+    def set_data(self, x, y):
+        self.x, self.y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+        # Decimate the whole series first so autoscaling still sees its full extent
+        self._decimate(visible_only=False)
+
+    def _decimate(self, visible_only=True):
+        start, end = 0, len(self.x)
+        if visible_only and end:
+            low, high = sorted(self.ax.get_xlim())
+            start = max(int(np.searchsorted(self.x, low)) - 1, 0)
+            end = min(int(np.searchsorted(self.x, high, side='right')) + 1, len(self.x))
+        width = max(int(self.ax.bbox.width), 100)
+        kept = start + decimate(self.y[start:end], 2 * width)
+        self.line.set_data(self.x[kept], self.y[kept])
+
+
+class DistributionChart:
+    """Equipment type distribution drawn as a bar, line or pie chart.
+
+    Each kind lives on its own axes, built once per set of labels and then
+    only shown or hidden, so switching kinds is a redraw rather than a
+    rebuild. The value-bearing artists are animated: a new distribution
+    with the same labels updates them in place and blits them over the
+    background cached at the last full draw, without re-laying out the
+    figure. The background follows matplotlib's blitting pattern and is
+    refreshed on every full draw (resize, kind switch, axis rescale).
+
+    Each kind's last rendering is also kept, so switching back to a kind
+    already drawn at this size and with these values is a single blit.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.figure = canvas.figure
+        self.kind = KINDS[0]
+        self.labels = None
+        self.values = None
+        self.axes = {}
+        self.artists = {}
+        self.shown_values = {}
+        self.background = None
+        # kind -> (canvas size, values, background, finished rendering)
+        self.snapshots = {}
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def set_data(self, distribution):
+        labels = list(distribution.keys())
+        values = np.array(list(distribution.values()), dtype=float)
+
+        if labels != self.labels:
+            self.labels, self.values = labels, values
+            self.figure.clear()
+            self.axes, self.artists, self.shown_values, self.snapshots = {}, {}, {}, {}
+            self.show(self.kind)
+            return
+
+        if np.array_equal(values, self.values):
+            return
+        self.values = values
+        if self._update(self.kind):
+            self.canvas.draw_idle()
+        else:
+            self._blit()
+
+    def show(self, kind):
+        self.kind = kind
+        if self.labels is None:
+            return
+        if kind not in self.axes:
+            self._build(kind)
+        elif self.shown_values[kind] is not self.values:
+            self._update(kind)
+        for other, ax in self.axes.items():
+            ax.set_visible(other == kind)
+
+        snapshot = self.snapshots.get(kind)
+        if snapshot and snapshot[0] == self.canvas.get_width_height() and snapshot[1] is self.values:
+            self.background = snapshot[2]
+            self.canvas.restore_region(snapshot[3])
+            self.canvas.blit(self.figure.bbox)
+        else:
+            self.canvas.draw_idle()
+
+    def _build(self, kind):
+        ax = self.figure.add_subplot(111)
+        self.axes[kind] = ax
+        self.artists[kind] = {}
+        self._draw_values(kind)
+
+        ax.set_xlabel('Equipment Type', fontsize=12, fontweight='bold', color=TEXT_COLOR)
+        ax.set_ylabel('Count', fontsize=12, fontweight='bold', color=TEXT_COLOR)
+        ax.set_title('Equipment Distribution', fontsize=14, fontweight='bold', color=TEXT_COLOR, pad=20)
+        if kind != 'pie':
+            ax.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
+            ax.set_axisbelow(True)
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+
+        # Laid out once per kind and label set; value updates never re-run this
+        self.figure.tight_layout()
+
+    def _draw_values(self, kind):
+        """Create the animated artists of ``kind`` for the current values."""
+        ax, artists = self.axes[kind], self.artists[kind]
+        labels, values = self.labels, self.values
+        positions = np.arange(len(labels))
+
+        if kind == 'bar':
+            artists['bars'] = ax.bar(
+                positions, values, color=COLORS[:len(labels)], edgecolor='white', linewidth=2, alpha=0.9,
+                tick_label=labels, animated=True
+            )
+            artists['texts'] = [
+                ax.text(bar.get_x() + bar.get_width() / 2., bar.get_height(), f'{int(bar.get_height())}',
+                        ha='center', va='bottom', fontweight='bold', color=TEXT_COLOR, fontsize=10, animated=True)
+                for bar in artists['bars']
+            ]
+        elif kind == 'line':
+            artists['line'] = DecimatedLine(ax, marker='o', linewidth=3, markersize=10, color='#667eea', animated=True)
+            artists['line'].set_data(positions, values)
+            ax.set_xticks(positions, labels)
+            artists['fill'] = ax.fill_between(positions, values, alpha=0.3, color='#667eea', animated=True)
+            artists['texts'] = [
+                ax.text(i, v, f'{int(v)}', ha='center', va='bottom', fontweight='bold', animated=True)
+                for i, v in enumerate(values)
+            ]
+        else:
+            wedges, texts, autotexts = ax.pie(
+                values, labels=labels, colors=COLORS[:len(labels)], autopct='%1.1f%%', startangle=90,
+                wedgeprops={'animated': True}, textprops={'fontweight': 'bold', 'color': 'white', 'animated': True}
+            )
+            artists['pie'] = [*wedges, *texts, *autotexts]
+        self.shown_values[kind] = values
+
+    def _update(self, kind):
+        """Move ``kind``'s artists to the current values; True when the axes had to rescale."""
+        ax, artists, values = self.axes[kind], self.artists[kind], self.values
+
+        if kind == 'pie':
+            # A pie's limits are fixed, so redrawing its wedges never changes the layout
+            for artist in artists['pie']:
+                artist.remove()
+            self._draw_values(kind)
+            return False
+
+        if kind == 'bar':
+            for bar, text, value in zip(artists['bars'], artists['texts'], values):
+                bar.set_height(value)
+                text.set_y(value)
+                text.set_text(f'{int(value)}')
+        else:
+            positions = np.arange(len(values))
+            artists['line'].set_data(positions, values)
+            artists['fill'].remove()
+            artists['fill'] = ax.fill_between(positions, values, alpha=0.3, color='#667eea', animated=True)
+            for text, value in zip(artists['texts'], values):
+                text.set_y(value)
+                text.set_text(f'{int(value)}')
+        self.shown_values[kind] = values
+
+        # Rescale only when the values outgrow the axes or shrink well inside them
+        top = ax.get_ylim()[1]
+        if values.max(initial=0) > top or values.max(initial=0) < top / 2:
+            ax.relim()
+            ax.autoscale_view()
+            return True
+        return False
+
+    def _animated_artists(self):
+        artists = self.artists.get(self.kind, {})
+        if self.kind == 'bar':
+            return [*artists['bars'], *artists['texts']]
+        if self.kind == 'line':
+            return [artists['fill'], artists['line'].line, *artists['texts']]
+        return artists.get('pie', [])
+
+    def _draw_animated(self):
+        for artist in self._animated_artists():
+            self.figure.draw_artist(artist)
+
+    def _remember(self):
+        if self.labels is not None:
+            self.snapshots[self.kind] = (
+                self.canvas.get_width_height(), self.values, self.background,
+                self.canvas.copy_from_bbox(self.figure.bbox)
+            )
+
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+        self._remember()
+
+    def _blit(self):
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_animated()
+        self.canvas.blit(self.figure.bbox)
+        self._remember()
+
+
+class TrendChart:
+    """Hourly parameter averages on a time axis, refreshed in place for live monitoring.
+
+    The lines are animated ``DecimatedLine``s blitted over the background
+    cached at the last full draw. A refresh that stays inside the current
+    axes limits is a blit; the figure is only redrawn when the series
+    outgrows them.
+    """
+
+    SERIES = (('flowrate', 'Flowrate', '#667eea'), ('pressure', 'Pressure', '#fa709a'),
+              ('temperature', 'Temperature', '#43e97b'))
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.figure = canvas.figure
+        self.axes = {}
+        self.lines = {}
+        for i, (field, label, color) in enumerate(self.SERIES):
+            ax = self.figure.add_subplot(len(self.SERIES), 1, i + 1, sharex=self.axes.get('flowrate'))
+            ax.set_ylabel(label, fontsize=10, fontweight='bold', color=TEXT_COLOR)
+            ax.grid(alpha=0.3, linestyle='--', linewidth=0.5)
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            self.axes[field] = ax
+            self.lines[field] = DecimatedLine(ax, linewidth=2, color=color, animated=True)
+        self.axes['flowrate'].set_title('Live Parameter Trends', fontsize=14, fontweight='bold', color=TEXT_COLOR)
+        self.axes['temperature'].xaxis_date()
+        self.figure.autofmt_xdate()
+        self.figure.tight_layout()
+        self.span = None
+        self.background = None
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def set_data(self, trends):
+        x = mdates.date2num(pd.to_datetime(trends['dates']))
+        span = (x[0], x[-1]) if len(x) else None
+        rescale = span != self.span
+        for field, line in self.lines.items():
+            y = np.array(trends[field], dtype=float)
+            line.set_data(x, y)
+            rescale |= not self._fits(line.ax, y)
+
+        if rescale:
+            self.span = span
+            if span:
+                # An hour either side keeps a single bucket off the axis edges
+                self.axes['flowrate'].set_xlim(span[0] - 1 / 24, span[1] + 1 / 24)
+            for line in self.lines.values():
+                y = line.y[~np.isnan(line.y)]
+                if len(y):
+                    # Headroom so the next few updates still fit and blit
+                    margin = (y.max() - y.min()) * 0.1 or abs(y.max()) * 0.1 or 1
+                    line.ax.set_ylim(y.min() - margin, y.max() + margin)
+            self.canvas.draw_idle()
+        elif self.background is None:
+            self.canvas.draw_idle()
+        else:
+            self.canvas.restore_region(self.background)
+            self._draw_animated()
+            self.canvas.blit(self.figure.bbox)
+
+    @staticmethod
+    def _fits(ax, y):
+        y = y[~np.isnan(y)]
+        if not len(y):
+            return True
+        bottom, top = ax.get_ylim()
+        # Also refit once the series shrinks well inside the axes, e.g. after a spike ages out
+        return bottom <= y.min() and y.max() <= top and y.max() - y.min() >= (top - bottom) / 4
+
+    def _draw_animated(self):
+        for line in self.lines.values():
+            self.figure.draw_artist(line.line)
+
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
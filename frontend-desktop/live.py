@@ -0,0 +1,222 @@
+import threading
+import time
+from datetime import datetime
+from functools import partial
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from api import API_URL, Cancelled, session
+from workers import Task
+
+POLL_INTERVAL = 5.0
+MAX_POLL_INTERVAL = 120.0
+# A poll slower than this, or a failed one, doubles the interval
+SLOW_POLL_SECONDS = 2.0
+REQUEST_TIMEOUT = 15
+
+TREND_PARAMS = {'days': 7, 'granularity': 'hour'}
+
+ALERT_PAGE_SIZE = 100
+# Newest alerts kept for display; older ones are dropped so memory stays flat
+MAX_ALERTS = 200
+
+
+def last_seen(alert):
+    # Alerts stored before occurrence tracking have no last_seen_at
+    return alert['last_seen_at'] or alert['created_at']
+
+
+def moment(timestamp):
+    # Compared as datetimes: the API drops the fraction when it is zero
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+
+
+class PollTask(Task):
+    """One round of conditional requests for the live views.
+
+    Trends and rankings are sent with the ETag of the last response, so an
+    unchanged endpoint answers 304 with no body. Alerts are fetched only if
+    raised, repeated or escalated since the latest ``last_seen_at`` already
+    seen, and when they changed the shown ones are checked for resolution.
+    A ``None`` result means the endpoint has not changed.
+    """
+
+    def __init__(self, etags, alerts_since, shown_alert_ids, cancel_event):
+        super().__init__(cancel_event)
+        self.etags = dict(etags)
+        self.alerts_since = alerts_since
+        self.shown_alert_ids = list(shown_alert_ids)
+
+    def _get(self, path, params, key=None):
+        if self.cancel_event.is_set():
+            raise Cancelled()
+        headers = {'If-None-Match': self.etags[key]} if key in self.etags else {}
+        response = session().get(f"{API_URL}{path}", params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304:
+            return None
+        if response.status_code != 200:
+            raise Exception(f"{path} returned HTTP {response.status_code}")
+        if key and response.headers.get('ETag'):
+            self.etags[key] = response.headers['ETag']
+        return response
+
+    def _alerts(self):
+        params = {'limit': ALERT_PAGE_SIZE}
+        if self.alerts_since:
+            params['seen_since'] = self.alerts_since
+        response = self._get('/alerts/', params, 'alerts')
+        if response is None:
+            return None
+
+        alerts = response.json()
+        cursor = response.headers.get('X-Next-Cursor')
+        # The first poll only fills the table with the newest alerts; later ones
+        # read every page, as a change skipped now would never be fetched again
+        while cursor and (self.alerts_since or len(alerts) < MAX_ALERTS):
+            response = self._get('/alerts/', dict(params, cursor=cursor))
+            alerts += response.json()
+            cursor = response.headers.get('X-Next-Cursor')
+        return alerts
+
+    def _resolved(self):
+        """Ids of the shown alerts that have since been resolved."""
+        if not self.shown_alert_ids:
+            return []
+        response = self._get('/alerts/', {
+            'resolved': 'true',
+            'ids': ','.join(map(str, self.shown_alert_ids)),
+            'limit': len(self.shown_alert_ids),
+        })
+        return [alert['id'] for alert in response.json()]
+
+    def work(self):
+        started = time.monotonic()
+        trends = self._get('/trends/', TREND_PARAMS, 'trends')
+        rankings = self._get('/rankings/', {}, 'rankings')
+        alerts = self._alerts()
+        # Resolving bumps the data generation, so an unchanged alerts endpoint means nothing was resolved
+        resolved = self._resolved() if alerts is not None else []
+        return {
+            'trends': trends and trends.json(),
+            'rankings': rankings and rankings.json(),
+            'alerts': alerts,
+            'resolved': resolved,
+            'etags': self.etags,
+            'elapsed': time.monotonic() - started,
+        }
+
+
+class LiveMonitor(QObject):
+    """Polls the trends, alerts and rankings endpoints and signals only what changed.
+
+    At most one poll is in flight. The next one is scheduled when it
+    returns, so a slow server is never queued up behind. The interval
+    doubles after a slow or failed poll, up to ``MAX_POLL_INTERVAL``, and
+    halves back towards ``POLL_INTERVAL`` after each quick one.
+    """
+
+    trends_changed = pyqtSignal(object)
+    rankings_changed = pyqtSignal(object)
+    # New alerts and ones a later upload repeated or escalated, newest first
+    alerts_changed = pyqtSignal(object)
+    # Ids of shown alerts that were resolved
+    alerts_resolved = pyqtSignal(object)
+    status_changed = pyqtSignal(str)
+
+    def __init__(self, pool, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self.interval = POLL_INTERVAL
+        self.etags = {}
+        self.alerts_since = None
+        # (id, last_seen_at) of alerts already emitted at the alerts_since boundary
+        self.seen_alerts = set()
+        # Ids of the alerts on display, newest first, mirroring the table capped at MAX_ALERTS
+        self.shown_alert_ids = []
+        # Number of the poll in flight, or None; results of any other poll are stale
+        self.pending = None
+        self.polls = 0
+        self.cancel_event = None
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.poll)
+
+    @property
+    def running(self):
+        return self.cancel_event is not None
+
+    def start(self):
+        if self.running:
+            return
+        self.cancel_event = threading.Event()
+        self.interval = POLL_INTERVAL
+        self.status_changed.emit("Connecting...")
+        self.poll()
+
+    def stop(self):
+        if not self.running:
+            return
+        self.timer.stop()
+        self.cancel_event.set()
+        self.cancel_event = None
+        self.pending = None
+        self.status_changed.emit("Live monitoring off")
+
+    def poll(self):
+        if not self.running or self.pending is not None:
+            return
+        self.polls += 1
+        self.pending = self.polls
+        task = PollTask(self.etags, self.alerts_since, self.shown_alert_ids, self.cancel_event)
+        # Bound to the poll number, not the task, so no finished task is kept alive by its slots
+        task.signals.finished.connect(partial(self._on_polled, self.pending))
+        task.signals.failed.connect(partial(self._on_failed, self.pending))
+        self.pool.start(task)
+
+    def _schedule(self):
+        self.pending = None
+        self.timer.start(int(self.interval * 1000))
+
+    def _on_polled(self, poll, result):
+        if poll != self.pending:
+            # Finished after live mode was stopped or restarted
+            return
+        self.etags = result['etags']
+
+        if result['trends'] is not None:
+            self.trends_changed.emit(result['trends'])
+        if result['rankings'] is not None:
+            self.rankings_changed.emit(result['rankings'])
+        if result['alerts']:
+            alerts = result['alerts']
+            versions = {alert['id']: (alert['id'], last_seen(alert)) for alert in alerts}
+            changed = [alert for alert in alerts if versions[alert['id']] not in self.seen_alerts]
+            # The seen_since filter is inclusive, so alerts at the newest timestamp come back until a newer one arrives
+            self.alerts_since = max((last_seen(alert) for alert in alerts), key=moment)
+            self.seen_alerts = {version for version in versions.values() if version[1] == self.alerts_since}
+            if changed:
+                shown = set(self.shown_alert_ids)
+                added = [alert['id'] for alert in changed if alert['id'] not in shown]
+                self.shown_alert_ids = (added + self.shown_alert_ids)[:MAX_ALERTS]
+                self.alerts_changed.emit(changed)
+        if result['resolved']:
+            resolved = set(result['resolved'])
+            self.shown_alert_ids = [pk for pk in self.shown_alert_ids if pk not in resolved]
+            self.alerts_resolved.emit(result['resolved'])
+
+        if result['elapsed'] > SLOW_POLL_SECONDS:
+            self.interval = min(self.interval * 2, MAX_POLL_INTERVAL)
+        else:
+            self.interval = max(self.interval / 2, POLL_INTERVAL)
+        self.status_changed.emit(
+            f"Live · updated {time.strftime('%H:%M:%S')} · next in {self.interval:.0f}s"
+        )
+        self._schedule()
+
+    def _on_failed(self, poll, error):
+        if poll != self.pending:
+            return
+        self.interval = min(self.interval * 2, MAX_POLL_INTERVAL)
+        self.status_changed.emit(f"Live · {error} · retrying in {self.interval:.0f}s")
+        self._schedule()
@@ -0,0 +1,256 @@
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import QAbstractProxyModel, QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QColor, QFont
+
+HEADERS = ["Equipment Name", "Type", "Flowrate", "Pressure", "Temperature", "Status"]
+
+# CSV column shown in each table column, up to the computed status
+SOURCE_COLUMNS = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
+NUMERIC_COLUMNS = ['Flowrate', 'Pressure', 'Temperature']
+STATUS_COLUMN = 5
+
+STATUSES = ["NORMAL", "HIGH", "LOW"]
+
+# Built once and shared by every status cell
+STATUS_STYLES = {
+    "NORMAL": (QColor(16, 185, 129, 50), QColor(5, 150, 105)),
+    "HIGH": (QColor(250, 112, 154, 50), QColor(225, 89, 129)),
+    "LOW": (QColor(254, 225, 64, 50), QColor(229, 202, 39)),
+}
+STATUS_FONT = QFont("Segoe UI", 9, QFont.Bold)
+
+
+def table_frame(raw):
+    """Columnar buffer for the details table from a CSV chunk.
+
+    Names and types stay as strings, the parameters become float64 and the
+    status is stored as a small integer code into ``STATUSES``.
+    """
+    frame = pd.DataFrame(index=raw.index)
+    for column in SOURCE_COLUMNS:
+        if column not in raw:
+            frame[column] = 0.0 if column in NUMERIC_COLUMNS else ''
+        elif column in NUMERIC_COLUMNS:
+            frame[column] = pd.to_numeric(raw[column], errors='coerce').astype(float)
+        else:
+            frame[column] = raw[column].astype(str)
+
+    flowrate, pressure, temperature = (frame[column].to_numpy() for column in NUMERIC_COLUMNS)
+    low = (flowrate < 80) | (pressure < 4) | (temperature < 100)
+    high = (flowrate > 150) | (pressure > 8) | (temperature > 135)
+    frame['Status'] = np.select([low, high], [2, 1], 0).astype(np.int8)
+    return frame
+
+
+class TableIndex:
+    """Search and sort structures for a ``table_frame``, built once per file off the GUI thread.
+
+    Distinct lowercase names are packed into one zero-padded fixed-width
+    byte buffer, so a query is a few vectorized byte compares and a match
+    offset maps to its name with one division. The handful of distinct
+    types are tested directly. Text columns sort on integer rank keys and
+    the others on their raw values.
+    """
+
+    def __init__(self, frame):
+        self.name_codes, names = pd.factorize(frame['Equipment Name'].str.lower())
+        self.type_codes, types = pd.factorize(frame['Type'].str.lower())
+        self.types = list(types)
+
+        encoded = [name.encode('utf-8') for name in names]
+        # At least one padding byte per name, so no match runs into the next name; a
+        # multiple of 8 so a row of per-byte flags can be OR-reduced as whole words
+        self.width = (max(map(len, encoded), default=0) // 8 + 1) * 8
+        self.names = np.array(encoded, dtype=f'S{self.width}').view(np.uint8)
+
+        self.sort_keys = [
+            pd.factorize(frame[column], sort=True)[0].astype(np.int32) if column not in NUMERIC_COLUMNS
+            else frame[column].to_numpy()
+            for column in SOURCE_COLUMNS
+        ] + [frame['Status'].to_numpy()]
+        # (query, match offsets) for the prefixes of the query being typed
+        self._prefixes = []
+
+    def __len__(self):
+        return len(self.name_codes)
+
+    def _name_matches(self, query):
+        """Boolean mask of the distinct names containing ``query``, narrowed from the longest cached prefix."""
+        needle = np.frombuffer(query.encode('utf-8'), dtype=np.uint8)
+        found = np.zeros(len(self.names) // self.width, dtype=bool)
+        if len(needle) >= self.width:
+            return found
+
+        self._prefixes = [(prefix, offsets) for prefix, offsets in self._prefixes if query.startswith(prefix)]
+        if self._prefixes:
+            prefix, offsets = self._prefixes[-1]
+            done = len(prefix.encode('utf-8'))
+        elif len(needle) == 1:
+            flags = (self.names == needle[0]).view(np.uint64).reshape(-1, self.width // 8)
+            return np.bitwise_or.reduce(flags, axis=1) != 0
+        else:
+            hits = np.equal(self.names[:-1], needle[0])
+            hits &= self.names[1:] == needle[1]
+            offsets = np.flatnonzero(hits)
+            done = 2
+
+        # The padding guarantees offset + k stays inside the buffer while the prefix matches
+        for k in range(done, len(needle)):
+            offsets = offsets[self.names[offsets + k] == needle[k]]
+        if done < len(needle) or not self._prefixes:
+            self._prefixes.append((query, offsets))
+        found[offsets // self.width] = True
+        return found
+
+    def matches(self, query):
+        """Boolean mask of the rows whose name or type contains ``query``."""
+        query = query.lower()
+        type_matches = np.array([query in name for name in self.types], dtype=bool)
+        return self._name_matches(query)[self.name_codes] | type_matches[self.type_codes]
+
+
+class EquipmentTableModel(QAbstractTableModel):
+    """Read-only table over a ``table_frame`` buffer.
+
+    Cells are formatted on demand in ``data()``, so the view only ever
+    touches the rows on screen and memory stays at the size of the buffer.
+    Searching and sorting happen in ``EquipmentSortFilterProxy``.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.set_frame(table_frame(pd.DataFrame(columns=SOURCE_COLUMNS)))
+
+    def set_frame(self, frame, index=None):
+        self.beginResetModel()
+        self.frame = frame.reset_index(drop=True)
+        self.columns = [self.frame[column].to_numpy() for column in SOURCE_COLUMNS + ['Status']]
+        self.index_data = index if index is not None else TableIndex(self.frame)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.frame)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        value = self.columns[column][index.row()]
+
+        if column == STATUS_COLUMN:
+            status = STATUSES[value]
+            if role == Qt.DisplayRole:
+                return status
+            if role == Qt.BackgroundRole:
+                return STATUS_STYLES[status][0]
+            if role == Qt.ForegroundRole:
+                return STATUS_STYLES[status][1]
+            if role == Qt.FontRole:
+                return STATUS_FONT
+            return None
+
+        if role == Qt.DisplayRole:
+            if column < 2:
+                return value
+            return "" if np.isnan(value) else f"{value:.2f}"
+        if role == Qt.TextAlignmentRole and column >= 2:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+
+class EquipmentSortFilterProxy(QAbstractProxyModel):
+    """Sorted, searched view of an ``EquipmentTableModel``, like QSortFilterProxyModel but vectorized.
+
+    The visible rows are one array of source row numbers: sorting is an
+    argsort of the column's key and searching masks that order with
+    ``TableIndex.matches``. The current sort and search are reapplied when
+    the source model is reset.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.search = ""
+        self.sort_column = -1
+        self.sort_order = Qt.AscendingOrder
+        self.order = np.zeros(0, dtype=np.int64)
+        self.rows = self.order
+        self._source_positions = None
+
+    def setSourceModel(self, model):
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._source_reset)
+        self._rebuild(sort=True)
+        self.endResetModel()
+
+    def _source_reset(self):
+        self._rebuild(sort=True)
+        self.endResetModel()
+
+    def _rebuild(self, sort=False):
+        index = self.sourceModel().index_data
+        if sort:
+            if self.sort_column < 0:
+                self.order = np.arange(len(index))
+            else:
+                self.order = np.argsort(index.sort_keys[self.sort_column], kind='stable')
+                if self.sort_order == Qt.DescendingOrder:
+                    self.order = self.order[::-1]
+        self.rows = self.order[index.matches(self.search)[self.order]] if self.search else self.order
+        self._source_positions = None
+
+    def set_search(self, text):
+        text = text.lower()
+        if text == self.search:
+            return
+        self.beginResetModel()
+        self.search = text
+        self._rebuild()
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.beginResetModel()
+        self.sort_column, self.sort_order = column, order
+        self._rebuild(sort=True)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < len(self.rows) and 0 <= column < len(HEADERS)):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index):
+        return QModelIndex()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        return self.sourceModel().headerData(section, orientation, role)
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        return self.sourceModel().index(int(self.rows[proxy_index.row()]), proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        if self._source_positions is None:
+            self._source_positions = np.full(self.sourceModel().rowCount(), -1, dtype=np.int64)
+            self._source_positions[self.rows] = np.arange(len(self.rows))
+        row = self._source_positions[source_index.row()]
+        return QModelIndex() if row < 0 else self.index(int(row), source_index.column())
@@ -0,0 +1,153 @@
+import os
+import time
+
+import pandas as pd
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from api import API_URL, Cancelled, MultipartFile, session
+from table_model import SOURCE_COLUMNS, TableIndex, table_frame
+
+PARSE_CHUNK_ROWS = 100_000
+
+# Seconds between ingest job status checks
+POLL_INTERVAL = 0.5
+
+# Seconds to wait for the server to confirm a cancelled ingest job has stopped
+CANCEL_TIMEOUT = 30
+
+# Minimum seconds between progress signals, so a fast stream cannot flood the GUI thread
+PROGRESS_INTERVAL = 0.05
+
+
+class UploadFailed(Exception):
+    """The server rejected the upload or its ingest job did not complete."""
+
+
+class TaskSignals(QObject):
+    # stage, fraction done (-1 when unknown), detail text
+    progress = pyqtSignal(str, float, str)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class Task(QRunnable):
+    """Background step of the upload pipeline; results come back to the GUI thread as signals.
+
+    Every task of one upload shares ``cancel_event``; setting it stops them
+    at their next progress report.
+    """
+
+    def __init__(self, cancel_event):
+        super().__init__()
+        self.signals = TaskSignals()
+        self.cancel_event = cancel_event
+        self._last_report = 0.0
+
+    def run(self):
+        try:
+            result = self.work()
+        except Exception as e:
+            # Aborting a streamed request surfaces as a connection error
+            if isinstance(e, Cancelled) or self.cancel_event.is_set():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+    def work(self):
+        raise NotImplementedError
+
+    def report(self, stage, fraction, detail=''):
+        if self.cancel_event.is_set():
+            raise Cancelled()
+        now = time.monotonic()
+        if fraction >= 1 or now - self._last_report >= PROGRESS_INTERVAL:
+            self._last_report = now
+            self.signals.progress.emit(stage, fraction, detail)
+
+
+class ParseTask(Task):
+    """Read the CSV for the details table in chunks into a ``table_frame`` buffer and its ``TableIndex``."""
+
+    def __init__(self, path, cancel_event):
+        super().__init__(cancel_event)
+        self.path = path
+
+    def work(self):
+        total = os.path.getsize(self.path) or 1
+        chunks = []
+        with open(self.path, 'rb') as f:
+            reader = pd.read_csv(
+                f, usecols=lambda column: column in SOURCE_COLUMNS, dtype={'Equipment Name': str, 'Type': str},
+                keep_default_na=False, chunksize=PARSE_CHUNK_ROWS
+            )
+            for chunk in reader:
+                chunks.append(table_frame(chunk))
+                self.report('parse', min(f.tell() / total, 1.0))
+        frame = pd.concat(chunks, ignore_index=True) if chunks else table_frame(pd.DataFrame())
+        return frame, TableIndex(frame)
+
+
+class UploadTask(Task):
+    """Stream the file to the async upload endpoint and follow its ingest job to the end.
+
+    Cancelling while the server processes the file cancels its ingest job,
+    which rolls back everything it saved. If the job finishes before the
+    cancel reaches it, the task finishes normally with the completed job.
+    """
+
+    def __init__(self, path, cancel_event):
+        super().__init__(cancel_event)
+        self.path = path
+
+    def work(self):
+        body = MultipartFile(
+            self.path,
+            on_read=lambda sent, total: self.report('upload', sent / total, f"{sent / 2 ** 20:,.1f} MB sent")
+        )
+        response = session().post(
+            f"{API_URL}/upload/async/",
+            data=body,
+            headers={'Content-Type': body.content_type},
+            timeout=(5, 300)
+        )
+        job = response.json()
+        if response.status_code != 202:
+            raise UploadFailed(job.get('error', f"HTTP {response.status_code}"))
+
+        try:
+            while job['status'] in ('PENDING', 'RUNNING'):
+                progress = job.get('progress')
+                self.report(
+                    'process', -1 if progress is None else progress, f"{job['rows_processed']:,} rows processed"
+                )
+                self.cancel_event.wait(POLL_INTERVAL)
+                if self.cancel_event.is_set():
+                    raise Cancelled()
+                response = session().get(f"{API_URL}/upload/jobs/{job['job_id']}/", timeout=10)
+                job = response.json()
+                if job.get('stale'):
+                    raise UploadFailed("The server stopped processing this upload; nothing was saved")
+        except Cancelled:
+            job = self._cancel_job(job['job_id'])
+            if job.get('status') != 'COMPLETED':
+                raise
+
+        if job['status'] == 'CANCELLED':
+            # Cancelled from another client
+            raise Cancelled()
+        if job['status'] != 'COMPLETED':
+            raise UploadFailed(job.get('error') or f"Processing ended {job['status'].lower()}")
+        return job
+
+    def _cancel_job(self, job_id):
+        """Cancel the ingest job on the server and wait until it has stopped."""
+        response = session().post(f"{API_URL}/upload/jobs/{job_id}/cancel/", timeout=10)
+        job = response.json()
+        deadline = time.monotonic() + CANCEL_TIMEOUT
+        while job.get('status') in ('PENDING', 'RUNNING') and time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            job = session().get(f"{API_URL}/upload/jobs/{job_id}/", timeout=10).json()
+        return job
@@ -809,6 +809,9 @@ function App() {
                       {alert.alert_type === "CRITICAL" ? "🚨" : "⚠️"}
                     </span>
                     <strong>{alert.equipment_name}</strong>
+                    {alert.occurrence_count > 1 && (
+                      <span className="alert-count">×{alert.occurrence_count}</span>
+                    )}
                   </div>
                   <p className="alert-message">{alert.message}</p>
                   {alert.recommendation && (